@@ -68,6 +68,10 @@ setup(
         # eg:
         #   "rst": ["docutils>=0.11"],
         #   ":python_version=='3.8'": ["backports.zoneinfo"],
+        "fast": ["orjson"],
+        "zstd": ["zstandard"],
+        "http2": ["httpx[http2]"],
+        "fuzzy": ["rapidfuzz", "numpy"],
     },
     entry_points={
         "console_scripts": [
@@ -23,14 +23,15 @@ from typing import Optional
 from typing import Type
 from typing import Union
 
-from databasetools.adapters.notion import NotionClient
-from databasetools.adapters.notion import NotionDatabase
+from notion_objects import NotionObject
 from notion_objects import Page
 from pydantic import ValidationError
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
 
 from ..models import PydanticObjectId
+from ..utils.notion_client_extend import NotionClient
+from ..utils.notion_database import NotionDatabase
 from .base_controller import BaseController
 from .base_controller import T
 
@@ -286,7 +287,7 @@ class NotionDatabaseController(BaseController[T]):
         self.n_client = NotionClient(token=token)
         self.database_id = database_id
         self._model: Type[T] = model or Page
-        self._db = NotionDatabase(token=token, database_id=self.database_id, DataClass=self._model)
+        self._db = NotionDatabase(token=token, database_id=self.database_id, DataClass=self._model, client=self.n_client)
 
     @property
     def model(self) -> Type[T]:
@@ -298,13 +299,18 @@ class NotionDatabaseController(BaseController[T]):
 
     def create(self, element: Type[T]) -> T:
         # Implementation specific to Notion
-        return self._db.create(obj=element)
+        if isinstance(element, NotionObject):
+            return self._db.create(obj=element)
+        return self._db.create(properties=element.model_dump(exclude_none=True))
 
     def read(self, element: T) -> T:
         """
-        Read the  from the database based on a query.
+        Read the entry with the same page ID as ``element`` from the database.
         """
-        self._db.read(obj=element)
+        entry_id = getattr(element, "id", None)
+        if not entry_id:
+            raise ValueError("Element has no page ID.")
+        return self._db.read(str(entry_id))
 
     def get(self, query: Dict[str, Any]) -> Optional[T]:
         """
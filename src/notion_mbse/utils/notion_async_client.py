@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""
+@package   notion_async_client
+Details:   asyncio counterpart of NotionClient built on notion_client.AsyncClient.
+Created:   Sunday, October 18th 2026, 10:02:15 am
+-----
+Last Modified: 10/18/2026 10:02:15
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_async_client.py"
+__version__ = "0.1.0"
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+from notion_client import AsyncClient
+
+from .notion_client_extend import NOTION_API_KEY
+from .notion_client_extend import REFETCH_MODES
+from .notion_client_extend import LastEditedToDateTime
+from .notion_client_extend import NotionFileMixin
+from .notion_client_extend import has_truncated_properties
+from .notion_ratelimit import AsyncThrottledClient
+from .notion_registry import client_options
+from .notion_registry import pool_options
+from .notion_utils import logger
+
+
+async def async_paginate(function: Callable[..., Awaitable[Any]], **kwargs: Any) -> AsyncIterator[Any]:
+    """Iterate over the results of a paginated Notion endpoint.
+
+    Async replacement for ``notion_client.helpers.iterate_paginated_api``.
+
+    Args:
+        function (Callable[..., Awaitable[Any]]): Paginated endpoint, e.g. ``client.databases.query``
+        **kwargs: Arguments passed to every call
+
+    Yields:
+        Any: Each result, in order
+    """
+    next_cursor = kwargs.pop("start_cursor", None)
+    while True:
+        response = await function(**kwargs, start_cursor=next_cursor)
+        for result in response.get("results"):
+            yield result
+
+        next_cursor = response.get("next_cursor")
+        if not response.get("has_more") or not next_cursor:
+            return
+
+
+class AsyncNotionClient(NotionFileMixin):
+    """
+    An asyncio client for interacting with Notion pages and databases.
+
+    Mirrors the read and download methods of NotionClient as coroutines. Requests are paced
+    by the token's shared rate limiter and at most ``max_concurrency`` are in flight per
+    client, so many clients (one per token) can run in a single event loop.
+
+    Attributes:
+        token (str): The authentication token for accessing the Notion API.
+        filter (Optional[dict]): Optional filter for database queries.
+        client (AsyncClient): The asynchronous Notion client object.
+        transformer (LastEditedToDateTime): Utility for transforming date-time fields.
+        max_concurrency (int): Upper bound on requests in flight.
+        base_url (Optional[str]): API root, None for ``NOTION_BASE_URL`` or Notion's own API.
+
+    Example Usage:
+    --------------
+    ```python
+    async def main():
+        client = AsyncNotionClient(token="your-notion-api-token")
+        await client.download_database("your-database-id", "./json")
+
+    asyncio.run(main())
+    ```
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        transformer: Optional[LastEditedToDateTime] = None,
+        filter: Optional[dict] = None,
+        client: Optional[AsyncClient] = None,
+        max_concurrency: int = 64,
+        base_url: Optional[str] = None,
+    ):
+        if not token:
+            if NOTION_API_KEY is None:
+                raise ValueError("NOTION_API_KEY is not set")
+            token = NOTION_API_KEY
+        self.token = token
+        self.filter = filter
+        self.base_url = base_url
+        if client is None:
+            client = AsyncThrottledClient(auth=token, client=pool_options().async_http_client(), **client_options(base_url))
+        self.client = client
+        self.transformer = transformer if transformer else LastEditedToDateTime()
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _call(self, function: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        async with self._semaphore:
+            return await function(**kwargs)
+
+    async def _collect(self, function: Callable[..., Awaitable[Any]], **kwargs: Any) -> List[Any]:
+        return [result async for result in async_paginate(lambda **kw: self._call(function, **kw), **kwargs)]
+
+    async def get_metadata(self, page_id: str) -> Dict[str, Any]:
+        """Get page metadata.
+
+        Args:
+            page_id (str): Page ID
+
+        Returns:
+            Dict[str, Any]: Page Metadata
+        """
+        if not page_id:
+            raise ValueError("Page ID is required.")
+        results = await self._call(self.client.pages.retrieve, page_id=page_id)
+        if results:
+            return self.transformer.forward([results])[0]
+        return {}
+
+    async def get_children(self, block_id: str) -> List[dict]:
+        """Get the direct children of a block, following pagination.
+
+        Args:
+            block_id (str): Block ID
+
+        Returns:
+            List[dict]: Raw child blocks in page order
+        """
+        return await self._collect(self.client.blocks.children.list, block_id=block_id)
+
+    async def get_blocks(self, block_id: str) -> List:
+        """Get all page blocks as json, expanding each tree level concurrently.
+
+        Args:
+            block_id (str): Block ID
+
+        Returns:
+            List: List of page blocks
+        """
+        blocks = await self.get_children(block_id)
+        failed = set()
+        level = blocks
+        while level:
+            parents = [block for block in level if block["has_children"]]
+            results = await asyncio.gather(*(self.get_children(block["id"]) for block in parents), return_exceptions=True)
+            level = []
+            for block, result in zip(parents, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error: {result}")
+                    failed.add(block["id"])
+                else:
+                    block["children"] = result
+                    level.extend(result)
+
+        return self._attach_children(blocks, failed)
+
+    async def get_database(self, database_id: str, refetch: str = "truncated") -> List:
+        """Fetch pages in database as json.
+
+        Args:
+            database_id (str): Database ID
+            refetch (str, optional): Which pages to re-fetch: "all", "truncated" or "none". Defaults to "truncated".
+
+        Returns:
+            List: List of pages in the database
+        """
+        if refetch not in REFETCH_MODES:
+            raise ValueError(f"Invalid refetch mode '{refetch}', expected one of {REFETCH_MODES}.")
+        kwargs = {"filter": self.filter} if self.filter else {}
+        pages = await self._collect(self.client.databases.query, database_id=database_id, **kwargs)
+        if refetch == "all":
+            stale = list(range(len(pages)))
+        elif refetch == "truncated":
+            stale = [i for i, pg in enumerate(pages) if has_truncated_properties(pg)]
+        else:
+            stale = []
+
+        fetched = await asyncio.gather(
+            *(self._call(self.client.pages.retrieve, page_id=pages[i]["id"]) for i in stale), return_exceptions=True
+        )
+        for i, page in zip(stale, fetched):
+            if isinstance(page, Exception):  # keep the truncated listing entry
+                logger.error(f"Failed to re-fetch {pages[i]['id']}: {page}")
+            else:
+                pages[i] = page
+        return list(self.transformer.forward(pages))
+
+    async def download_page(self, page_id: str, out_path: Union[str, Path] = "./json", fetch_metadata: bool = True):
+        """Download the notion page."""
+        out_path = Path(out_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        blocks = await self.get_blocks(page_id)
+        if blocks:
+            self.save(blocks, out_path, overwrite=True)
+        else:
+            out_path.write_text("[]")
+
+        if fetch_metadata:
+            metadata = await self.get_metadata(page_id)
+            self.save([metadata], out_path.parent / "database.json", overwrite=True)
+
+    async def download_database(self, database_id: str, out_dir: Union[str, Path] = "./json") -> List[str]:
+        """Download the notion database and, concurrently, every page updated since the last download.
+
+        A page that fails is logged and skipped without cancelling the others. Its previous
+        listing entry is kept, or it is left out if it is new, so the next download retries it.
+
+        Returns:
+            List[str]: IDs of the pages that failed to download
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / "database.json"
+        prev_pages = {pg["id"]: pg for pg in self.load(path)}
+        prev = {page_id: pg["last_edited_time"] for page_id, pg in prev_pages.items()}
+        pages = await self.get_database(database_id)
+
+        changed = [
+            cur for cur in pages if prev.get(cur["id"], datetime(1, 1, 1, tzinfo=cur["last_edited_time"].tzinfo)) < cur["last_edited_time"]
+        ]
+        results = await asyncio.gather(
+            *(self.download_page(cur["id"], out_dir / f"{cur['id']}.json", False) for cur in changed), return_exceptions=True
+        )
+        failed = []
+        for cur, result in zip(changed, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to download {cur['id']}: {result}")
+                failed.append(cur["id"])
+            else:
+                logger.info(f"Downloaded {cur['url']}")
+        listing = [prev_pages.get(cur["id"]) if cur["id"] in failed else cur for cur in pages]
+        listing = [pg for pg in listing if pg is not None]
+        if listing:
+            self.save(listing, path, overwrite=True)
+        return failed
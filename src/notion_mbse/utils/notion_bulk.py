@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+@package   notion_bulk
+Details:   Bounded, rate limited bulk archiving of Notion blocks, pages and database rows.
+Created:   Sunday, October 18th 2026, 7:48:05 pm
+-----
+Last Modified: 10/18/2026 19:48:05
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_bulk.py"
+__version__ = "0.1.0"
+
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from notion_client import Client
+from notion_client.errors import HTTPResponseError
+from notion_client.errors import RequestTimeoutError
+
+from .notion_client_extend import NotionClient
+from .notion_ratelimit import RetryPolicy
+from .notion_ratelimit import ThrottledClient
+from .notion_ratelimit import TokenBucket
+from .notion_ratelimit import get_bucket
+from .notion_utils import logger
+from .notion_utils import normalize_id
+
+
+@dataclass
+class ArchiveResult:
+    """Outcome of archiving one block, page or database row.
+
+    Attributes:
+        id (str): Block or page ID.
+        ok (bool): Whether the object was archived.
+        attempts (int): Requests made for it, retries included.
+        error (Optional[str]): Last error message when it could not be archived.
+    """
+
+    id: str
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+class BulkArchiver:
+    """Archive many blocks or pages through a bounded worker pool.
+
+    IDs are consumed lazily, so a generator of row IDs is never held in memory, and only a
+    few requests per worker are queued at a time. Requests are paced by the token bucket of
+    the client's integration token; a ``ThrottledClient`` already paces every request with
+    its own bucket, so that bucket is not acquired a second time. Errors worth retrying are
+    retried per ID with the retry policy, and every ID gets an ArchiveResult instead of
+    stopping the batch. A 429 penalizes the bucket, holding back every worker rather than
+    only the one that was rate limited. The archiver is the only retry layer: a
+    ``ThrottledClient`` is used through a sibling that does not retry, with the client's
+    retry policy unless another is given.
+
+    Attributes:
+        n_client (NotionClient): Client the archiver was built for.
+        client (Client): Client used for every request, a non-retrying sibling of a ThrottledClient.
+        max_workers (int): Upper bound on requests in flight.
+        retry (RetryPolicy): Retry policy applied per ID.
+        bucket (TokenBucket): Bucket of the integration token, penalized after a 429.
+        paced (bool): Whether the client acquires the bucket itself, so the archiver does not.
+
+    Example Usage:
+    --------------
+    ```python
+    archiver = BulkArchiver(NotionClient(token="your-notion-api-token"))
+    results = archiver.archive(page["id"] for page in pages)
+    failed = [result.id for result in results if not result.ok]
+    ```
+    """
+
+    def __init__(
+        self,
+        n_client: NotionClient,
+        max_workers: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.n_client = n_client
+        self.max_workers = max_workers if max_workers else n_client.max_workers
+        client = n_client.client
+        self.paced = isinstance(client, ThrottledClient)
+        if self.paced:
+            self.retry = retry if retry else client.retry
+            bucket = client.bucket
+            client = client.without_retries()
+        else:
+            self.retry = retry if retry else RetryPolicy()
+            if bucket is None:
+                bucket = get_bucket(n_client.token or "")
+        self.client: Client = client
+        self.bucket = bucket
+
+    def archive(self, ids: Iterable[str]) -> List[ArchiveResult]:
+        """Archive every ID. Pages and database rows are archived like any other block.
+
+        Args:
+            ids (Iterable[str]): Block, page or row IDs; duplicates are archived once
+
+        Returns:
+            List[ArchiveResult]: One result per distinct ID, in input order
+        """
+        results: Dict[str, Optional[ArchiveResult]] = {}
+        backlog = self.max_workers * 2
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, str] = {}
+            for object_id in ids:
+                object_id = normalize_id(object_id)
+                if object_id in results:
+                    continue
+                results[object_id] = None
+                pending[executor.submit(self._archive_one, object_id)] = object_id
+                if len(pending) >= backlog:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+            for future, object_id in pending.items():
+                results[object_id] = future.result()
+
+        archived = sum(result.ok for result in results.values())
+        logger.info(f"Archived {archived} of {len(results)} objects")
+        return list(results.values())
+
+    def _archive_one(self, object_id: str) -> ArchiveResult:
+        attempt = 0
+        while True:
+            if not self.paced:
+                self.bucket.acquire()
+            try:
+                self.client.blocks.delete(block_id=object_id)
+                return ArchiveResult(object_id, True, attempt + 1)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                delay = self.retry.delay(e, attempt)
+                attempt += 1
+                if delay is None:
+                    logger.error(f"Failed to archive {object_id}: {e}")
+                    return ArchiveResult(object_id, False, attempt, str(e))
+                if isinstance(e, HTTPResponseError) and e.status == 429:
+                    self.bucket.penalize(delay)
+                else:
+                    time.sleep(delay)
+            except Exception as e:
+                logger.error(f"Failed to archive {object_id}: {e}")
+                return ArchiveResult(object_id, False, attempt + 1, str(e))
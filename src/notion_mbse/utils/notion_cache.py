@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+@package   notion_cache
+Details:   Persistent response cache for page metadata and block trees.
+Created:   Sunday, October 18th 2026, 11:20:03 am
+-----
+Last Modified: 10/18/2026 11:20:03
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_cache.py"
+__version__ = "0.1.0"
+
+import json
+import sqlite3
+import threading
+from abc import ABC
+from abc import abstractmethod
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .notion_utils import normalize_id
+
+METADATA = "metadata"
+BLOCKS = "blocks"
+
+
+class BaseCache(ABC):
+    """Key-value store for Notion responses.
+
+    Entries are keyed by object id and kind (``"metadata"`` or ``"blocks"``) and carry a
+    version, the object's ``last_edited_time``. A lookup only hits when the caller's version
+    matches, so freshness costs a timestamp comparison instead of a download.
+
+    Attributes:
+        default (Optional[Callable[[Any], Any]]): Fallback JSON encoder for values such as datetimes.
+    """
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None):
+        self.default = default
+
+    @abstractmethod
+    def _read(self, key: Tuple[str, str]) -> Optional[Tuple[str, str]]: ...
+
+    @abstractmethod
+    def _write(self, key: Tuple[str, str], version: str, value: str): ...
+
+    @abstractmethod
+    def _delete(self, object_id: str): ...
+
+    def get(self, object_id: str, kind: str, version: Optional[str] = None) -> Optional[Any]:
+        """Get a cached value.
+
+        Args:
+            object_id (str): Page, database or block ID
+            kind (str): Entry kind, "metadata" or "blocks"
+            version (Optional[str], optional): Required version. Defaults to None, which accepts any version.
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss or a stale entry
+        """
+        entry = self._read((normalize_id(object_id), kind))
+        if entry is None:
+            return None
+        cached_version, value = entry
+        if version is not None and cached_version != version:
+            return None
+        return json.loads(value)
+
+    def put(self, object_id: str, kind: str, version: str, value: Any):
+        """Store a value under its version, replacing any previous entry.
+
+        Args:
+            object_id (str): Page, database or block ID
+            kind (str): Entry kind, "metadata" or "blocks"
+            version (str): Version of the value, usually its last_edited_time
+            value (Any): JSON serializable value
+        """
+        self._write((normalize_id(object_id), kind), version, json.dumps(value, default=self.default))
+
+    def invalidate(self, object_id: str):
+        """Drop every entry of an object."""
+        self._delete(normalize_id(object_id))
+
+    def close(self):
+        """Release resources held by the backend. Does nothing unless the backend overrides it."""
+        return None
+
+
+class MemoryCache(BaseCache):
+    """Process-local cache, mostly useful for tests and single runs."""
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None):
+        super().__init__(default)
+        self._entries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def _read(self, key: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+        return self._entries.get(key)
+
+    def _write(self, key: Tuple[str, str], version: str, value: str):
+        self._entries[key] = (version, value)
+
+    def _delete(self, object_id: str):
+        for key in [key for key in self._entries if key[0] == object_id]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """Cache persisted in a single SQLite file, shared safely between threads.
+
+    Attributes:
+        path (Path): Location of the database file.
+    """
+
+    def __init__(self, path: Union[str, Path], default: Optional[Callable[[Any], Any]] = None):
+        super().__init__(default)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (id TEXT NOT NULL, kind TEXT NOT NULL, version TEXT, value TEXT, PRIMARY KEY (id, kind))"
+            )
+
+    def _read(self, key: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._conn.execute("SELECT version, value FROM entries WHERE id = ? AND kind = ?", key).fetchone()
+        return tuple(row) if row else None
+
+    def _write(self, key: Tuple[str, str], version: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO entries (id, kind, version, value) VALUES (?, ?, ?, ?)", (*key, version, value))
+
+    def _delete(self, object_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE id = ?", (object_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
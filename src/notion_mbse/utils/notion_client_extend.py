@@ -13,16 +13,31 @@ __author__ = "Mathew Cosgrove"
 __file__ = "notion_client.py"
 __version__ = "0.1.0"
 
+import hashlib
 import json
 import os
 from abc import ABC
 from abc import abstractmethod
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
+from datetime import timezone
+from difflib import SequenceMatcher
+from itertools import islice
 from pathlib import Path
 from typing import Any
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import dotenv
@@ -31,6 +46,16 @@ from notion_client.helpers import iterate_paginated_api as paginate
 from notion_objects import NotionObject
 from notion_objects import Page
 
+from .notion_cache import BLOCKS
+from .notion_cache import METADATA
+from .notion_cache import BaseCache
+from .notion_registry import get_client
+from .notion_snapshot import Snapshot
+from .notion_snapshot import SnapshotWriter
+from .notion_snapshot import index_path
+from .notion_snapshot import is_snapshot
+from .notion_stream import JsonStreamWriter
+from .notion_stream import iter_json
 from .notion_utils import logger
 from .notion_utils import normalize_id
 
@@ -38,38 +63,169 @@ dotenv.load_dotenv()
 
 NOTION_API_KEY = os.getenv("NOTION_API_KEY", None)
 
+REFETCH_MODES = ("all", "truncated", "none")
+MANIFEST_FILE = "manifest.json"
+DATABASE_FILE = "database.json"
+DATABASE_LINES_FILE = "database.jsonl"
+QUERY_PAGE_SIZE = 100
+# Blocks that stand for a whole subpage or database.
+CHILD_TYPES = ("child_page", "child_database")
+# blocks.children.append limits: children per list and blocks per request, two levels deep at most
+APPEND_CHILDREN_LIMIT = 100
+APPEND_REQUEST_LIMIT = 1000
+# blocks that cannot be created without their children
+REQUIRED_CHILDREN_TYPES = ("column_list", "column", "table")
+
+
+def has_truncated_properties(page: dict) -> bool:
+    """Check whether a query result carries truncated property values.
+
+    ``databases.query`` returns at most 25 references for relation, people and rich text
+    properties and flags the rest with ``has_more``.
+
+    Args:
+        page (dict): Page payload from a database query.
+
+    Returns:
+        bool: True if any property reports more values than were returned.
+    """
+    return any(isinstance(prop, dict) and prop.get("has_more") for prop in page.get("properties", {}).values())
+
+
+@dataclass
+class SyncReport:
+    """Outcome of an incremental database download.
+
+    Attributes:
+        added (List[str]): IDs of pages new since the last download.
+        changed (List[str]): IDs of pages edited since the last download.
+        unchanged (List[str]): IDs of pages that were skipped.
+        deleted (List[str]): IDs of pages no longer in the database, whose files were removed.
+        failed (List[str]): IDs of pages that could not be downloaded; the manifest marks them for the next download.
+        retried (List[str]): IDs of pages that failed last time and were downloaded now.
+    """
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    retried: List[str] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(ids) for name, ids in self.__dict__.items()}
+
+    def __str__(self):
+        return ", ".join(f"{count} {name}" for name, count in self.counts().items())
+
 
 class BaseTransformer(ABC):
     key: str = ""
 
     @abstractmethod
-    def forward(self, blocks: List[dict]) -> List[dict]: ...
+    def forward(self, blocks: List[dict]) -> List[dict]:
+        """Transform a batch of blocks, in place or into new blocks; return one block per input, in order."""
 
     @abstractmethod
     def reverse(self, o: Any) -> Union[None, str]: ...
 
+    def forward_tree(self, blocks: List[dict]) -> List[dict]:
+        """Transform a block tree, nested ``children`` lists included, as a single batch.
+
+        Every block ends up with a ``children`` list. ``forward`` may update the blocks in
+        place or return new ones, one per block and in order; new blocks are reassembled into
+        a tree of their own.
+
+        Args:
+            blocks (List[dict]): Top-level blocks
+
+        Returns:
+            List[dict]: The transformed top-level blocks
+        """
+        flat: List[dict] = []
+        parents: List[Optional[int]] = []
+        stack: List[Tuple[List[dict], Optional[int]]] = [(blocks, None)]
+        while stack:
+            level, parent = stack.pop()
+            for block in level:
+                stack.append((block.setdefault("children", []), len(flat)))
+                flat.append(block)
+                parents.append(parent)
+        transformed = self.forward(flat)
+        if len(transformed) != len(flat):
+            raise ValueError("forward must return one block per input block.")
+        if all(new is old for new, old in zip(transformed, flat)):  # updated in place
+            return blocks
+
+        roots: List[dict] = []
+        children: List[List[dict]] = [[] for _ in transformed]
+        for new, parent in zip(transformed, parents):
+            (roots if parent is None else children[parent]).append(new)
+        for new, kids in zip(transformed, children):
+            new["children"] = kids
+        return roots
+
 
 class LastEditedToDateTime(BaseTransformer):
     key = "last_edited_time"
     key_type = datetime
+    # Bound on the memo of parsed timestamps, reset when exceeded.
+    max_parsed = 65536
+
+    def __init__(self):
+        self._parsed: Dict[str, datetime] = {}
 
     def forward(self, blocks) -> List:
         """Convert last_edited_time to datetime object.
+
+        Blocks are updated in place instead of copied, and the timestamps of the whole batch
+        are parsed together with ``parse_many``. Blocks already converted are left as is.
+
         Args:
             blocks (List[dict]): List of blocks
 
         Returns:
-            List: List of blocks with last_edited_time as datetime object
+            List: The same blocks with last_edited_time as datetime object
         """
+        if not isinstance(blocks, list):
+            blocks = list(blocks)
         key = self.key
-        return [
-            {
-                **block,
-                key: datetime.fromisoformat(block[key][:-1]),
-                "id": normalize_id(block["id"]),
-            }
-            for block in blocks
-        ]
+        for block, value in zip(blocks, self.parse_many([block[key] for block in blocks])):
+            block[key] = value
+            block["id"] = normalize_id(block["id"])
+        return blocks
+
+    def parse_many(self, values: List[Union[str, datetime]]) -> List[datetime]:
+        """Parse a batch of Notion timestamps.
+
+        Notion timestamps have minute precision, so a batch holds few distinct values; each
+        is parsed once and memoized. Values that are already datetimes pass through.
+
+        Args:
+            values (List[Union[str, datetime]]): Timestamps
+
+        Returns:
+            List[datetime]: Parsed timestamps, in order
+        """
+        parsed = self._parsed
+        missing = {value for value in values if isinstance(value, str) and value not in parsed}
+        if missing:
+            if len(parsed) + len(missing) > self.max_parsed:  # swap rather than clear, other threads may be reading
+                parsed = self._parsed = {}
+                missing = {value for value in values if isinstance(value, str)}
+            parsed.update((value, datetime.fromisoformat(value[:-1])) for value in missing)
+        return [parsed[value] if isinstance(value, str) else value for value in values]
+
+    def parse(self, value: Union[str, datetime]) -> datetime:
+        """Parse a Notion timestamp such as "2024-07-06T15:35:00.000Z".
+
+        Args:
+            value (Union[str, datetime]): ISO 8601 timestamp with a trailing "Z"
+
+        Returns:
+            datetime: Parsed timestamp
+        """
+        return self.parse_many([value])[0]
 
     def reverse(self, o: Any) -> Union[None, str]:
         """Convert datetime object to string.
@@ -82,85 +238,87 @@ class LastEditedToDateTime(BaseTransformer):
             return o.isoformat() + "Z"
 
 
-class NotionClient:
-    """
-    A client for interacting with Notion pages and databases.
-
-    This class provides methods to retrieve metadata, recent pages, projects, page blocks, and databases from the Notion API.
+class NotionFileMixin:
+    """File handling and block tree assembly shared by NotionClient and AsyncNotionClient.
 
-    Attributes:
-        token (str): The authentication token for accessing the Notion API.
-        filter (Optional[dict]): Optional filter for database queries.
-        client (Client): The Notion client object.
-        transformer (LastEditedToDateTime): Utility for transforming date-time fields.
+    None of these methods talk to the API; they only need the class's ``transformer``.
+    """
 
-    Methods:
-        load(path: Union[str, Path]) -> List[dict]:
-            Loads data from a file and transforms it using the transformer.
+    transformer: BaseTransformer
 
-        save(blocks: List[dict], path: Union[str, Path], overwrite: bool = False):
-            Saves the given blocks to a file.
-
-        get_blocks(block_id: int) -> List:
-            Retrieves all page blocks as JSON. Recursively fetches descendants.
+    def load(self, path: Union[str, Path]) -> List[dict]:
+        """
+        Load data from a file and transform it using the transformer.
 
-        get_database(database_id: str) -> List:
-            Fetches pages in a database as JSON.
+        A compressed snapshot (``.jsonl.gz`` or ``.jsonl.zst``) loads as one ``{"id", "children"}``
+        entry per page, where ``children`` holds the page's blocks.
 
-        get_metadata(page_id: str) -> Dict[str, Any]:
-            Retrieves metadata of a specific page.
+        Args:
+            path (Union[str, Path]): The path to the file.
 
-        get_recent_pages() -> List[Dict[str, Any]]:
-            Retrieves a list of recent pages via a search query.
+        Returns:
+            List[dict]: The transformed data as a list of dictionaries.
+        """
+        if isinstance(path, str):
+            path = Path(path)
+        if path.exists() and is_snapshot(path):
+            with Snapshot(path) as snapshot:
+                return [{"id": page["id"], "children": self._from_cache(page["children"])} for page in snapshot]
+        if path.exists():
+            return self.transformer.forward(list(iter_json(path)))
+        return []
 
-        download_url(url: str, out_dir: Union[str, Path] = "./json"):
-            Downloads the Notion page or database from a URL and saves it as JSON.
+    def load_page(self, path: Union[str, Path], page_id: str) -> List[dict]:
+        """
+        Load the blocks of one page from a snapshot, decompressing only that page.
 
-        download_page(page_id: str, out_path: Union[str, Path] = "./json", fetch_metadata: bool = True):
-            Downloads a specific Notion page and its blocks. Metadata is optionally fetched and saved.
+        Args:
+            path (Union[str, Path]): The path to the snapshot.
+            page_id (str): Page ID
 
-        download_database(database_id: str, out_dir: Union[str, Path] = "./json"):
-            Downloads all pages and data from a specified Notion database.
+        Returns:
+            List[dict]: The transformed blocks, or an empty list if the page is not in the snapshot.
+        """
+        with Snapshot(path) as snapshot:
+            page = snapshot.get(normalize_id(page_id))
+        return self._from_cache(page["children"]) if page else []
 
-    Example Usage:
-    --------------
-    ```python
-    client = NotionClient(token="your-notion-api-token")
+    def iter_load(self, path: Union[str, Path]) -> Iterator[dict]:
+        """
+        Iterate over the items of a file, transforming one at a time.
 
-    # Retrieve metadata for a specific page
-    page_metadata = client.get_metadata(page_id="your-page-id")
+        JSON Lines files (``.jsonl``) are streamed; JSON array files are parsed whole first.
 
-    # Fetch recent pages
-    recent_pages = client.get_recent_pages()
-    ```
-    """
+        Args:
+            path (Union[str, Path]): The path to the file.
 
-    def __init__(self, token: Optional[str], transformer: Optional[LastEditedToDateTime] = None, filter: Optional[dict] = None):
-        if not token:
-            if NOTION_API_KEY is None:
-                raise ValueError("NOTION_API_KEY is not set")
-            token = NOTION_API_KEY
-        self.token = token
-        self.filter = filter
-        self.client = Client(auth=token)
-        self.transformer = transformer if transformer else LastEditedToDateTime()
+        Yields:
+            dict: Each transformed item.
+        """
+        path = Path(path)
+        if path.exists():
+            for item in iter_json(path):
+                yield self.transformer.forward([item])[0]
 
-    def load(self, path: Union[str, Path]) -> List[dict]:
+    def save_stream(self, items: Iterable[dict], path: Union[str, Path], overwrite: bool = False) -> int:
         """
-        Load data from a file and transform it using the transformer.
+        Save items to a file as they are produced, keeping one item in memory at a time.
+
+        The file is JSON Lines if its suffix is ``.jsonl``, otherwise a JSON array. orjson is
+        used for serialization when it is installed.
 
         Args:
-            path (Union[str, Path]): The path to the file.
+            items (Iterable[dict]): The items to save, e.g. ``iter_database(database_id)``.
+            path (Union[str, Path]): The path to save the file.
+            overwrite (bool, optional): Whether to overwrite the file if it already exists. Defaults to False.
 
         Returns:
-            List[dict]: The transformed data as a list of dictionaries.
+            int: Number of items written.
         """
-        if isinstance(path, str):
-            path = Path(path)
-        if path.exists():
-            with Path.open(path) as f:
-                return self.transformer.forward(json.load(f))
-        return []
+        with JsonStreamWriter(path, default=self.transformer.reverse, overwrite=overwrite) as writer:
+            for item in items:
+                writer.write(item)
+        return writer.count
 
     def save(self, blocks: List[dict], path: Union[str, Path], overwrite: bool = False):
         """
@@ -191,55 +349,238 @@ class NotionClient:
         with Path.open(path, "w") as f:
             json.dump(blocks, f, default=self.transformer.reverse, indent=4)
 
-    def get_metadata(self, page_id: str) -> Dict[str, Any]:
+    def _from_cache(self, blocks: List[dict]) -> List[dict]:
+        """Re-apply the transformer to a cached block tree."""
+        return self.transformer.forward_tree(blocks)
+
+    def _attach_children(self, blocks: List[dict], failed: set) -> List[dict]:
+        """Drop blocks whose children failed to load, then transform the tree in one batch."""
+        return self.transformer.forward_tree(_drop_failed(blocks, failed))
+
+
+class NotionClient(NotionFileMixin):
+    """
+    A client for interacting with Notion pages and databases.
+
+    This class provides methods to retrieve metadata, recent pages, projects, page blocks, and databases from the Notion API.
+
+    Attributes:
+        token (str): The authentication token for accessing the Notion API.
+        filter (Optional[dict]): Optional filter for database queries.
+        client (Client): The Notion client object. Defaults to the token's shared ThrottledClient from the registry.
+        transformer (LastEditedToDateTime): Utility for transforming date-time fields.
+        max_workers (int): Upper bound on concurrent requests issued by batch operations.
+        cache (Optional[BaseCache]): Optional response cache for page metadata and block trees.
+        base_url (Optional[str]): API root of the shared client, None for ``NOTION_BASE_URL`` or Notion's own API.
+
+    Methods:
+        load(path: Union[str, Path]) -> List[dict]:
+            Loads data from a file and transforms it using the transformer. Reads JSON, JSON Lines and snapshots.
+
+        load_page(path: Union[str, Path], page_id: str) -> List[dict]:
+            Loads one page from a compressed snapshot without decompressing the others.
+
+        save(blocks: List[dict], path: Union[str, Path], overwrite: bool = False):
+            Saves the given blocks to a file.
+
+        save_stream(items: Iterable[dict], path: Union[str, Path], overwrite: bool = False) -> int:
+            Saves items as they are produced, as JSON Lines or an incrementally written JSON array.
+
+        get_children(block_id: str) -> List[dict]:
+            Retrieves the direct children of a block.
+
+        get_blocks(block_id: int, last_edited_time: Optional[Union[str, datetime]] = None) -> List:
+            Retrieves all page blocks as JSON. Fetches descendants breadth first and concurrently.
+            With a cache, unchanged pages are served from it.
+
+        append_blocks(block_id: str, blocks: List[dict]) -> List[dict]:
+            Appends a block tree of any size and depth, chunked to the API limits, subtrees concurrently.
+
+        iter_database(database_id: str, refetch: str = "truncated", since: Optional[Union[str, datetime]] = None) -> Iterator[dict]:
+            Streams pages in a database as they arrive from pagination.
+
+        get_database(database_id: str, refetch: str = "truncated", since: Optional[Union[str, datetime]] = None) -> List:
+            Fetches pages in a database as JSON. Only pages with truncated properties are re-fetched.
+            ``since`` restricts the query to pages edited on or after a timestamp.
+
+        get_metadata(page_id: str, use_cache: bool = False) -> Dict[str, Any]:
+            Retrieves metadata of a specific page.
+
+        iter_recent_pages(query: Optional[str] = None, since: Optional[Union[str, datetime]] = None, as_objects: bool = False) -> Iterator:
+            Streams recently edited pages via a search query, paginating lazily and stopping at ``since``.
+
+        get_recent_pages() -> List[Dict[str, Any]]:
+            Retrieves a list of recent pages via a search query.
+
+        iter_recent_blocks(query: Optional[str] = None, since: Optional[Union[str, datetime]] = None) -> Iterator[Dict[str, Any]]:
+            Streams the blocks of recently edited pages.
+
+        get_recent_blocks(query: Optional[str] = None, since: Optional[Union[str, datetime]] = None, crawl: bool = False) -> List[Dict[str, Any]]:
+            Searches recent pages; with ``since`` or ``crawl``, collects their blocks instead.
+
+        download_url(url: str, out_dir: Union[str, Path] = "./json"):
+            Downloads the Notion page or database from a URL and saves it as JSON.
+
+        download_page(page_id: str, out_path: Union[str, Path] = "./json", fetch_metadata: bool = True) -> Path:
+            Downloads a specific Notion page and its blocks. Metadata is optionally fetched and saved.
+
+        download_database(database_id: str, out_dir: Union[str, Path] = "./json", prune: bool = True, force: bool = False, delta: bool = False) -> SyncReport:
+            Incrementally downloads a Notion database: fetches new and edited pages concurrently,
+            prunes deleted ones and writes a manifest. ``delta`` queries only pages edited since the last sync.
+            The database listing is streamed to disk. ``snapshot`` stores pages in a compressed snapshot.
+
+    Example Usage:
+    --------------
+    ```python
+    client = NotionClient(token="your-notion-api-token")
+
+    # Retrieve metadata for a specific page
+    page_metadata = client.get_metadata(page_id="your-page-id")
+
+    # Fetch recent pages
+    recent_pages = client.get_recent_pages()
+    ```
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        transformer: Optional[LastEditedToDateTime] = None,
+        filter: Optional[dict] = None,
+        client: Optional[Client] = None,
+        max_workers: int = 8,
+        cache: Optional[BaseCache] = None,
+        base_url: Optional[str] = None,
+    ):
+        if not token:
+            if NOTION_API_KEY is None:
+                raise ValueError("NOTION_API_KEY is not set")
+            token = NOTION_API_KEY
+        self.token = token
+        self.filter = filter
+        self.base_url = base_url
+        self.client = client if client else get_client(token, base_url)
+        self.max_workers = max_workers
+        self.transformer = transformer if transformer else LastEditedToDateTime()
+        self.cache = cache
+        if self.cache is not None and self.cache.default is None:
+            self.cache.default = self.transformer.reverse
+
+    def get_metadata(self, page_id: str, use_cache: bool = False) -> Dict[str, Any]:
         """Get page metadata.
 
+        Fetched metadata is written through to the cache, if one is configured.
+
         Args:
             page_id (str): Page ID
+            use_cache (bool, optional): Return cached metadata without a request when available. Defaults to False.
 
         Returns:
             Dict[str, Any]: Page Metadata
         """
         if not page_id:
             raise ValueError("Page ID is required.")
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(page_id, METADATA)
+            if cached:
+                return self.transformer.forward([cached])[0]
         results = self.client.pages.retrieve(page_id=page_id)
         if results:
-            return self.transformer.forward([results])[0]
+            metadata = self.transformer.forward([results])[0]
+            if self.cache is not None:
+                self.cache.put(page_id, METADATA, self.cache_version(metadata["last_edited_time"]), metadata)
+            return metadata
         return {}
 
+    def cache_version(self, last_edited_time: Union[str, datetime]) -> str:
+        """Normalize a last_edited_time, raw or transformed, into a cache version."""
+        if isinstance(last_edited_time, str):
+            last_edited_time = self.transformer.parse(last_edited_time)
+        return self.transformer.reverse(last_edited_time)
+
+    def iter_recent_pages(
+        self,
+        query: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        as_objects: bool = False,
+    ) -> Iterator[Union[Dict[str, Any], NotionObject]]:
+        """Iterate over pages by descending last_edited_time via Search Query.
+
+        Search results are paginated lazily, so stopping the iteration stops the requests.
+
+        Args:
+            query (Optional[str], optional): Text to search page titles for. Defaults to None.
+            since (Optional[Union[str, datetime]], optional): Stop at the first page edited before this time. Defaults to None.
+            as_objects (bool, optional): Yield notion_objects Page objects, built one at a time. Defaults to False.
+
+        Yields:
+            Union[Dict[str, Any], NotionObject]: Recent pages, most recently edited first
+        """
+        for page in self._search_recent(query, since):
+            yield Page(page) if as_objects else page
+
     def get_recent_pages(
-        self, query: Optional[str] = None, as_objects: Optional[bool] = False
+        self,
+        query: Optional[str] = None,
+        as_objects: Optional[bool] = False,
+        since: Optional[Union[str, datetime]] = None,
     ) -> Union[List[Dict[str, Any]], List[NotionObject]]:
         """Get Recent Pages via Search Query.
 
+        Collects ``iter_recent_pages`` over every page of search results.
+
         Returns:
             List[Dict[str, Any]]: List of Recent Pages
         """
-        payload = {
-            "filter": {
-                "value": "page",
-                "property": "object",
-            },
-            "sort": {
-                "direction": "descending",
-                "timestamp": "last_edited_time",
-            },
-        }
-        if query:
-            payload["query"] = query
+        return list(self.iter_recent_pages(query, since=since, as_objects=as_objects))
 
-        results = self.client.search(**payload).get("results")
-        if as_objects:
-            return [Page.new(**page) for page in results]
-        else:
-            return results
+    def iter_recent_blocks(self, query: Optional[str] = None, since: Optional[Union[str, datetime]] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over recent blocks by getting recent pages then fetching their blocks.
+
+        Pages are searched lazily and each page's blocks are fetched only when the iteration
+        reaches it. Blocks are yielded depth first, each with its ``children``.
+
+        Args:
+            query (Optional[str], optional): Text to search page titles for. Defaults to None.
+            since (Optional[Union[str, datetime]], optional): Only yield blocks of pages, and blocks, edited on or
+                after this time. Defaults to None.
 
-    def get_recent_blocks(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        Yields:
+            Dict[str, Any]: Recent blocks
+        """
+        cutoff = self._cutoff(since)
+        for page in self._search_recent(query, since):
+            for block in _walk(self.get_blocks(page["id"], last_edited_time=page["last_edited_time"])):
+                if cutoff is None or block["last_edited_time"] >= cutoff:
+                    yield block
+
+    def get_recent_blocks(
+        self, query: Optional[str] = None, since: Optional[Union[str, datetime]] = None, crawl: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get Recent Blocks by getting recent pages then fetching blocks.
 
+        Without ``since`` or ``crawl`` this is a single search request returning the first
+        page of recently edited pages, as it always was. Otherwise the blocks of every page
+        found are downloaded through ``iter_recent_blocks``; without ``since`` that is every
+        page in the workspace.
+
+        Args:
+            query (Optional[str], optional): Text to search page titles for. Defaults to None.
+            since (Optional[Union[str, datetime]], optional): Collect the blocks edited on or after this time. Defaults to None.
+            crawl (bool, optional): Collect the blocks of every page found even without ``since``. Defaults to False.
+
         Returns:
             List[Dict[str, Any]]: List of Recent Blocks
         """
+        if since is None and not crawl:
+            return next(self._search_pages(query)).get("results")
+        return list(self.iter_recent_blocks(query, since=since))
+
+    def _cutoff(self, since: Optional[Union[str, datetime]]) -> Optional[datetime]:
+        return self.transformer.parse(self.cache_version(since)) if since is not None else None
+
+    def _search_pages(self, query: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Page through search responses for pages, newest first, one response at a time."""
         payload = {
             "filter": {
                 "value": "page",
@@ -249,47 +590,349 @@ class NotionClient:
                 "direction": "descending",
                 "timestamp": "last_edited_time",
             },
+            "page_size": QUERY_PAGE_SIZE,
         }
         if query:
             payload["query"] = query
 
-        return self.client.search(**payload).get("results")
+        response = self.client.search(**payload)
+        yield response
+        while response.get("has_more"):
+            response = self.client.search(**payload, start_cursor=response["next_cursor"])
+            yield response
+
+    def _search_recent(self, query: Optional[str], since: Optional[Union[str, datetime]]) -> Iterator[Dict[str, Any]]:
+        """Page through search results for pages, newest first, until ``since`` is passed."""
+        cutoff = self._cutoff(since)
+        for response in self._search_pages(query):
+            for page in response["results"]:
+                if cutoff is not None and self.transformer.parse(page["last_edited_time"]) < cutoff:
+                    return
+                yield page
 
-    def get_blocks(self, block_id: int) -> List:
+    def get_children(self, block_id: str) -> List[dict]:
+        """Get the direct children of a block, following pagination.
+
+        Args:
+            block_id (str): Block ID
+
+        Returns:
+            List[dict]: Raw child blocks in page order
+        """
+        return list(paginate(self.client.blocks.children.list, block_id=block_id))
+
+    def append_blocks(self, block_id: str, blocks: List[dict], after: Optional[str] = None) -> List[dict]:
+        """Append a block tree of any size and depth under a block or page.
+
+        Blocks are sent in chunks of at most 100, in order. A block's children ride along in
+        the same request when they are leaves (the API accepts two levels). Column lists,
+        columns and tables cannot be created empty, so they always carry their children, two
+        levels deep, and the first 100 rows of a table. Deeper subtrees and further table rows
+        are appended in follow-up passes under the ids the API returns, and independent
+        subtrees are uploaded concurrently, bounded by ``max_workers``.
+
+        Children may be given under ``block[block["type"]]["children"]`` or ``block["children"]``.
+        Read-only fields of downloaded blocks (id, timestamps, parent, ...) are dropped.
+
+        Args:
+            block_id (str): Parent block or page ID
+            blocks (List[dict]): Blocks to append
+            after (Optional[str], optional): Insert after this child instead of at the end. Defaults to None.
+
+        Returns:
+            List[dict]: The created top-level blocks, as returned by the API
+        """
+        created: List[dict] = []
+        level = [(block_id, blocks, created)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                futures = [
+                    executor.submit(self._append_level, parent_id, children, after if results is created else None)
+                    for parent_id, children, results in level
+                ]
+                next_level = []
+                for (_, _, results), future in zip(level, futures):
+                    appended, deferred = future.result()
+                    results.extend(appended)
+                    next_level.extend((parent_id, children, []) for parent_id, children in deferred)
+                level = next_level
+        return created
+
+    def _append_level(
+        self, block_id: str, blocks: List[dict], after: Optional[str] = None
+    ) -> Tuple[List[dict], List[Tuple[str, List[dict]]]]:
+        """Append one list of siblings in order; return the results and the subtrees left to append."""
+        payloads = []
+        pending = []
+        for block in blocks:
+            payload, left = _nested_payload(block, 2)
+            payloads.append(payload)
+            pending.append(left)
+
+        results: List[dict] = []
+        deferred: List[Tuple[str, List[dict]]] = []
+        start = 0
+        while start < len(payloads):
+            end = start
+            size = 0
+            while end < len(payloads) and end - start < APPEND_CHILDREN_LIMIT:
+                weight = _payload_size(payloads[end])
+                if size and size + weight > APPEND_REQUEST_LIMIT:
+                    break
+                size += weight
+                end += 1
+            kwargs = {"after": after} if after else {}
+            response = self.client.blocks.children.append(block_id=block_id, children=payloads[start:end], **kwargs)
+            for result, left in zip(response["results"], pending[start:end]):
+                if left:
+                    deferred.extend(self._locate_deferred(result["id"], left))
+            results.extend(response["results"])
+            after = response["results"][-1]["id"] if after else None
+            start = end
+        return results, deferred
+
+    def _locate_deferred(self, block_id: str, left: Tuple[List[dict], list]) -> List[Tuple[str, List[dict]]]:
+        """Map what ``_nested_payload`` left out of a created block to the ids of the blocks it goes under."""
+        rest, nested = left
+        deferred = []
+        if any(nested):  # the API only returns the top-level blocks, look up the nested ones
+            for child, child_left in zip(self.get_children(block_id), nested):
+                if child_left:
+                    deferred.extend(self._locate_deferred(child["id"], child_left))
+        if rest:
+            deferred.append((block_id, rest))
+        return deferred
+
+    def sync_blocks(
+        self, block_id: str, blocks: List[dict], existing: Optional[List[dict]] = None, archive_child_pages: bool = False
+    ) -> Dict[str, int]:
+        """Make the children of a block or page match ``blocks`` with as few requests as possible.
+
+        Each sibling list is diffed against the existing one by content hash, so unchanged
+        blocks cost nothing. Changed blocks of the same type at the same position are updated
+        in place, the rest are deleted or inserted after their neighbours, and the children
+        of matched blocks are diffed the same way when their subtrees differ.
+
+        Notion can only insert after an existing block. Blocks inserted before the first kept
+        block of a list go after it, and that one block is then re-created behind them.
+
+        ``child_page`` and ``child_database`` blocks missing from ``blocks`` are left in place
+        unless ``archive_child_pages`` is set, since archiving them archives the whole subpage
+        or database.
+
+        Args:
+            block_id (str): Parent block or page ID
+            blocks (List[dict]): Desired blocks, in the format accepted by ``append_blocks``
+            existing (Optional[List[dict]], optional): Current tree from ``get_blocks``. Defaults to None, which fetches it.
+            archive_child_pages (bool, optional): Archive subpages and databases missing from ``blocks``. Defaults to False.
+
+        Returns:
+            Dict[str, int]: Number of "unchanged", "updated", "deleted", "appended" and "preserved" blocks
+        """
+        if existing is None:
+            existing = self._fetch_blocks(block_id)
+        counts = Counter({"unchanged": 0, "updated": 0, "deleted": 0, "appended": 0, "preserved": 0})
+        self._sync_level(block_id, existing, blocks, counts, archive_child_pages)
+        logger.info(f"Synced blocks of {block_id}: {dict(counts)}")
+        return dict(counts)
+
+    def _sync_level(self, block_id: str, old: List[dict], new: List[dict], counts: Counter, archive_child_pages: bool):
+        plan = []
+        matcher = SequenceMatcher(None, [_content_hash(b) for b in old], [_content_hash(b) for b in new], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                plan.extend(("keep", cur, want) for cur, want in zip(old[i1:i2], new[j1:j2]))
+                continue
+            for k in range(max(i2 - i1, j2 - j1)):
+                cur = old[i1 + k] if i1 + k < i2 else None
+                want = new[j1 + k] if j1 + k < j2 else None
+                if cur is not None and want is not None and cur["type"] == want["type"]:
+                    plan.append(("update", cur, want))
+                    continue
+                if cur is not None:
+                    plan.append(("delete", cur, None) if archive_child_pages or cur["type"] not in CHILD_TYPES else ("preserve", cur, None))
+                if want is not None:
+                    plan.append(("insert", None, want))
+
+        kinds = [kind for kind, _, _ in plan]
+        first_kept = next((i for i, kind in enumerate(kinds) if kind in ("keep", "update", "preserve")), len(kinds))
+        if "insert" in kinds[:first_kept] and first_kept < len(kinds):  # nothing to insert after
+            kind, cur, want = plan[first_kept]
+            if cur["type"] in CHILD_TYPES:  # cannot be re-created, the new blocks follow it instead
+                logger.warning(f"Cannot insert blocks before {cur['type']} {cur['id']}, inserting them after it")
+                plan = [plan[first_kept], *plan[:first_kept], *plan[first_kept + 1 :]]
+            else:  # insert after the first kept block, then move it behind them by re-creating it
+                plan = [("pivot", cur, None), *plan[:first_kept], ("insert", None, want), *plan[first_kept + 1 :]]
+
+        anchor = None
+        inserts: List[dict] = []
+        deletes: List[str] = []
+        pairs = []
+
+        def flush():
+            if inserts:
+                self.append_blocks(block_id, inserts, after=anchor)
+                counts["appended"] += len(inserts)
+                inserts.clear()
+
+        for kind, cur, want in plan:
+            if kind == "insert":
+                inserts.append(want)
+            elif kind == "delete":
+                deletes.append(cur["id"])
+            elif kind == "pivot":
+                anchor = cur["id"]
+                deletes.append(cur["id"])
+            elif kind == "preserve":
+                flush()
+                counts["preserved"] += 1
+                anchor = cur["id"]
+            else:
+                flush()
+                if kind == "update":
+                    self.client.blocks.update(block_id=cur["id"], **{want["type"]: _block_payload(want)[want["type"]]})
+                counts["updated" if kind == "update" else "unchanged"] += 1
+                anchor = cur["id"]
+                pairs.append((cur, want))
+        flush()
+        for object_id in deletes:
+            self.client.blocks.delete(block_id=object_id)
+        counts["deleted"] += len(deletes)
+
+        for cur, want in pairs:
+            old_children = cur.get("children", [])
+            new_children = _block_children(want)
+            if _tree_hash(old_children) != _tree_hash(new_children):
+                self._sync_level(cur["id"], old_children, new_children, counts, archive_child_pages)
+
+    def get_blocks(self, block_id: int, last_edited_time: Optional[Union[str, datetime]] = None) -> List:
         """Get all page blocks as json. Recursively fetches descendants.
 
+        The tree is expanded breadth first: every ``has_children`` block of a level is
+        listed concurrently, bounded by ``max_workers``. Child order is preserved and each
+        block gets a ``children`` list.
+
+        With a cache, the tree is only downloaded when the block's ``last_edited_time`` differs
+        from the cached one. The timestamp is looked up with one ``blocks.retrieve``, which
+        works for pages and for any other block with children, unless the caller already
+        knows it. Cached trees stop at ``child_page`` and ``child_database`` blocks, whose
+        subtrees are fetched through ``get_blocks`` under their own version, so an edit to a
+        subpage is seen even when the parent page is unchanged.
+
         Args:
             block_id (int): Block ID
+            last_edited_time (Optional[Union[str, datetime]], optional): Known last_edited_time of the page or block. Defaults to None.
 
         Returns:
             List: List of page blocks
         """
-        blocks = []
-        results = paginate(self.client.blocks.children.list, block_id=block_id)
-        for child in results:
-            try:
-                child["children"] = list(self.get_blocks(child["id"])) if child["has_children"] else []
-                blocks.append(child)
-            except Exception as e:
-                logger.error(f"Error: {e}")
+        if self.cache is None:
+            return self._fetch_blocks(block_id)
+
+        if last_edited_time is None:
+            last_edited_time = self.client.blocks.retrieve(block_id=block_id)["last_edited_time"]
+        version = self.cache_version(last_edited_time)
+        cached = self.cache.get(block_id, BLOCKS, version)
+        if cached is not None:
+            blocks = self._from_cache(cached)
+        else:
+            blocks = self._fetch_blocks(block_id, expand_pages=False)
+            self.cache.put(block_id, BLOCKS, version, blocks)
+        return self._expand_pages(blocks)
+
+    def _expand_pages(self, blocks: List[dict]) -> List[dict]:
+        """Fill in the subpages and inline databases of a cached tree, each through its own cache entry."""
+        pages = [block for block in _walk(blocks) if block["type"] in CHILD_TYPES and block["has_children"]]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for block, children in zip(pages, executor.map(lambda page: self.get_blocks(page["id"]), pages)):
+                block["children"] = children
+        return blocks
+
+    def _fetch_blocks(self, block_id: str, expand_pages: bool = True) -> List[dict]:
+        """Download a block tree, expanding each level concurrently, optionally stopping at subpages."""
+        blocks = self.get_children(block_id)
+        failed = set()
+        level = blocks
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                parents = [block for block in level if block["has_children"] and (expand_pages or block["type"] not in CHILD_TYPES)]
+                futures = [executor.submit(self.get_children, block["id"]) for block in parents]
+                level = []
+                for block, future in zip(parents, futures):
+                    try:
+                        block["children"] = future.result()
+                        level.extend(block["children"])
+                    except Exception as e:
+                        logger.error(f"Error: {e}")
+                        failed.add(block["id"])
+
+        return self._attach_children(blocks, failed)
+
+    def iter_database(self, database_id: str, refetch: str = "truncated", since: Optional[Union[str, datetime]] = None) -> Iterator[dict]:
+        """Iterate over the pages in a database as they arrive from pagination.
+
+        Pages are built straight from the ``databases.query`` payloads. Only pages whose
+        properties were truncated by the query are re-fetched with ``pages.retrieve``, one
+        batch per result page, bounded by ``max_workers``.
 
-        return list(self.transformer.forward(blocks))
+        Args:
+            database_id (str): Database ID
+            refetch (str, optional): Which pages to re-fetch: "all", "truncated" or "none". Defaults to "truncated".
+            since (Optional[Union[str, datetime]], optional): Only return pages edited on or after this time,
+                filtered server side. Defaults to None.
 
-    def get_database(self, database_id: str) -> List:
-        """Fetch pages in database as json."""
-        if self.filter:
+        Yields:
+            dict: Each page in the database
+        """
+        if refetch not in REFETCH_MODES:
+            raise ValueError(f"Invalid refetch mode '{refetch}', expected one of {REFETCH_MODES}.")
+        query_filter = self.filter
+        if since is not None:
+            delta = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.cache_version(since)}}
+            query_filter = {"and": [self.filter, delta]} if self.filter else delta
+        if query_filter:
             results = paginate(
                 self.client.databases.query,
                 database_id=database_id,
-                filter=self.filter,
+                filter=query_filter,
             )
         else:
             results = paginate(
                 self.client.databases.query,
                 database_id=database_id,
             )
-        pages = [self.client.pages.retrieve(page_id=pg["id"]) for pg in results]
-        return list(self.transformer.forward(pages))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                pages = list(islice(results, QUERY_PAGE_SIZE))
+                if not pages:
+                    return
+                if refetch == "all":
+                    stale = list(range(len(pages)))
+                elif refetch == "truncated":
+                    stale = [i for i, pg in enumerate(pages) if has_truncated_properties(pg)]
+                else:
+                    stale = []
+                fetched = executor.map(lambda page_id: self.client.pages.retrieve(page_id=page_id), [pages[i]["id"] for i in stale])
+                for i, page in zip(stale, fetched):
+                    pages[i] = page
+                yield from self.transformer.forward(pages)
+
+    def get_database(self, database_id: str, refetch: str = "truncated", since: Optional[Union[str, datetime]] = None) -> List:
+        """Fetch pages in database as json.
+
+        Collects ``iter_database``; prefer that for large databases.
+
+        Args:
+            database_id (str): Database ID
+            refetch (str, optional): Which pages to re-fetch: "all", "truncated" or "none". Defaults to "truncated".
+            since (Optional[Union[str, datetime]], optional): Only return pages edited on or after this time,
+                filtered server side. Defaults to None.
+
+        Returns:
+            List: List of pages in the database
+        """
+        return list(self.iter_database(database_id, refetch=refetch, since=since))
 
     def download_url(self, url: str, out_dir: Union[str, Path] = "./json"):
         """Download the notion page or database."""
@@ -301,30 +944,250 @@ class NotionClient:
         else:
             self.download_database(slug, out_dir)
 
-    def download_page(self, page_id: str, out_path: Union[str, Path] = "./json", fetch_metadata: bool = True):
-        """Download the notion page."""
+    def download_page(
+        self,
+        page_id: str,
+        out_path: Union[str, Path] = "./json",
+        fetch_metadata: bool = True,
+        last_edited_time: Optional[Union[str, datetime]] = None,
+    ) -> Path:
+        """Download the notion page, replacing any previous download.
+
+        An ``out_path`` ending in ``.gz`` or ``.zst`` is written as a single page snapshot.
+        """
         out_path = Path(out_path)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        blocks = self.get_blocks(page_id)
-        self.save(blocks, out_path)
+        blocks = self.get_blocks(page_id, last_edited_time=last_edited_time)
+        if is_snapshot(out_path):
+            with SnapshotWriter(out_path, default=self.transformer.reverse, overwrite=True) as writer:
+                writer.write(normalize_id(page_id), {"id": normalize_id(page_id), "children": blocks})
+        elif blocks:
+            self.save(blocks, out_path, overwrite=True)
+        else:
+            out_path.write_text("[]")
 
         if fetch_metadata:
             metadata = self.get_metadata(page_id)
-            self.save([metadata], out_path.parent / "database.json")
+            self.save([metadata], out_path.parent / "database.json", overwrite=True)
+        return out_path
 
-    def download_database(self, database_id: str, out_dir: Union[str, Path] = "./json"):
-        """Download the notion database and associated pages."""
+    def load_manifest(self, out_dir: Union[str, Path]) -> Dict[str, Any]:
+        """Load the manifest written by the last download_database into ``out_dir``.
+
+        Falls back to the database listing timestamps of downloads made before manifests existed.
+
+        Args:
+            out_dir (Union[str, Path]): Download directory
+
+        Returns:
+            Dict[str, Any]: Manifest with "pages", mapping page ID to its "last_edited_time" and file "hash"
+                ("failed" if its last download failed), and the "high_water_mark" of the last sync, if any
+        """
         out_dir = Path(out_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        path = out_dir / "database.json"
-        prev = {pg["id"]: pg["last_edited_time"] for pg in self.load(path)}
-        pages = self.get_database(database_id)  # download database
-        self.save(pages, path)
+        path = out_dir / MANIFEST_FILE
+        if path.exists():
+            with Path.open(path) as f:
+                return json.load(f)
+        pages = {}
+        for name in (DATABASE_FILE, DATABASE_LINES_FILE):
+            for pg in self.iter_load(out_dir / name):
+                pages[pg["id"]] = {"last_edited_time": self.cache_version(pg["last_edited_time"])}
+        return {"pages": pages, "high_water_mark": None}
+
+    def download_database(
+        self,
+        database_id: str,
+        out_dir: Union[str, Path] = "./json",
+        prune: bool = True,
+        force: bool = False,
+        delta: bool = False,
+        lines: bool = False,
+        snapshot: Optional[str] = None,
+    ) -> SyncReport:
+        """Download the notion database and associated pages.
+
+        Only pages that are new or edited since the last download, or whose file is missing
+        or altered on disk, are fetched, concurrently up to ``max_workers``. Files of pages
+        deleted from the database are pruned. A ``manifest.json`` records each page's
+        last_edited_time and file hash, plus the high-water mark of the sync, for the next run.
+        Pages that fail are marked in the manifest, and the next run retries them.
+
+        The database listing is streamed: each page is written to ``database.json`` (or
+        ``database.jsonl`` with ``lines``) and queued for download as it arrives from
+        pagination, so memory does not grow with the number of rows. At most ``2 * max_workers``
+        downloads are queued at a time, and each finished page is written out, to its file or
+        to the snapshot, as soon as it completes. If the sync fails, the files of the previous
+        download (listing and snapshot) are left as they were.
+
+        With ``delta``, the database query itself is filtered server side to pages edited on or
+        after the stored high-water mark, so the request count scales with the edits rather
+        than the database size. A delta query cannot see deletions; run a full sync from time
+        to time to prune them.
+
+        With ``snapshot``, pages are stored in one compressed JSON Lines snapshot in ``out_dir``
+        instead of one JSON file each. Frames of unchanged pages are copied over from the
+        previous snapshot without being decompressed. Read it back with ``load`` or ``load_page``.
+
+        Args:
+            database_id (str): Database ID
+            out_dir (Union[str, Path], optional): Download directory. Defaults to "./json".
+            prune (bool, optional): Remove files of deleted pages. Defaults to True.
+            force (bool, optional): Download every page regardless of the manifest. Defaults to False.
+            delta (bool, optional): Query only pages edited since the last sync. Defaults to False.
+            lines (bool, optional): Write the database listing as JSON Lines. Defaults to False.
+            snapshot (Optional[str], optional): File name of a snapshot to store the pages in,
+                e.g. "snapshot.jsonl.gz" or "snapshot.jsonl.zst". Defaults to None.
 
-        for cur in pages:  # download individual pages in database IF updated
-            if prev.get(cur["id"], datetime(1, 1, 1, tzinfo=cur["last_edited_time"].tzinfo)) < cur["last_edited_time"]:
-                self.download_page(cur["id"], out_dir / f"{cur['id']}.json", False)
-                logger.info(f"Downloaded {cur['url']}")
+        Returns:
+            SyncReport: Added, changed, unchanged, deleted, failed and retried page IDs
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        last = self.load_manifest(out_dir)
+        prev = last["pages"]
+        since = last.get("high_water_mark") if delta and not force else None
+        database_path = out_dir / (DATABASE_LINES_FILE if lines else DATABASE_FILE)
+        partial_path = database_path.with_name(f"{database_path.name}.part")
+
+        report = SyncReport()
+        manifest = {}
+        versions = {}
+
+        snapshot_path = out_dir / snapshot if snapshot else None
+        old = Snapshot(snapshot_path) if snapshot_path and index_path(snapshot_path).exists() else None
+        packer = (
+            SnapshotWriter(f"{snapshot_path}.part{snapshot_path.suffix}", self.transformer.reverse, overwrite=True)
+            if snapshot_path
+            else None
+        )
+
+        def stored_hash(page_id: str) -> Optional[str]:
+            if packer:
+                frame = old.frame(page_id) if old else None
+                return hashlib.sha256(frame).hexdigest() if frame is not None else None
+            path = out_dir / f"{page_id}.json"
+            return file_hash(path) if path.exists() else None
+
+        def keep(page_id: str):
+            if packer and old and page_id in old:
+                packer.write_frame(page_id, old.frame(page_id))
+
+        def download(page_id: str, url: str, last_edited_time: datetime) -> Union[bytes, Path]:
+            if packer:
+                result = packer.encode({"id": page_id, "children": self.get_blocks(page_id, last_edited_time=last_edited_time)})
+            else:
+                result = self.download_page(page_id, out_dir / f"{page_id}.json", False, last_edited_time)
+            logger.info(f"Downloaded {url}")
+            return result
+
+        def finish(page_id: str, ids: List[str], future: Future):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Failed to download {page_id}: {e}")
+                report.failed.append(page_id)
+                manifest[page_id] = {**prev.get(page_id, {"last_edited_time": None, "hash": None}), "failed": True}
+                keep(page_id)
+                return
+            if packer:
+                packer.write_frame(page_id, result)
+                digest = hashlib.sha256(result).hexdigest()
+            else:
+                digest = file_hash(result)
+            manifest[page_id] = {"last_edited_time": versions[page_id], "hash": digest}
+            ids.append(page_id)
+
+        try:
+            backlog = self.max_workers * 2
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending: Dict[Future, Tuple[str, List[str]]] = {}
+                with JsonStreamWriter(partial_path, default=self.transformer.reverse, lines=lines, overwrite=True) as writer:
+                    for cur in self.iter_database(database_id, since=since):  # download database
+                        writer.write(cur)
+                        version = versions[cur["id"]] = self.cache_version(cur["last_edited_time"])
+                        entry = prev.get(cur["id"])
+                        if entry is None:
+                            ids = report.added
+                        elif entry.get("failed"):
+                            ids = report.retried
+                        elif (
+                            force
+                            or entry["last_edited_time"] != version
+                            or entry.get("hash") is None
+                            or entry["hash"] != stored_hash(cur["id"])
+                        ):
+                            ids = report.changed
+                        else:
+                            report.unchanged.append(cur["id"])
+                            manifest[cur["id"]] = entry
+                            keep(cur["id"])
+                            continue
+                        pending[executor.submit(download, cur["id"], cur["url"], cur["last_edited_time"])] = (cur["id"], ids)
+                        if len(pending) >= backlog:  # bound queued downloads and their results
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                finish(*pending.pop(future), future)
+
+                    if since:  # carry over the rows outside the delta
+                        for old_row in self.iter_load(database_path):
+                            if old_row["id"] not in versions:
+                                writer.write(old_row)
+
+                for future in as_completed(pending):
+                    finish(*pending[future], future)
+            order = {page_id: i for i, page_id in enumerate(versions)}
+            for ids in (report.added, report.changed, report.retried, report.failed):  # back to listing order
+                ids.sort(key=order.__getitem__)
+            partial_path.replace(database_path)
+
+            for page_id in sorted(prev.keys() - versions.keys()):
+                if since:  # not part of the delta, so unchanged
+                    report.unchanged.append(page_id)
+                    manifest[page_id] = prev[page_id]
+                    keep(page_id)
+                    continue
+                report.deleted.append(page_id)
+                if not prune:
+                    manifest[page_id] = prev[page_id]
+                    keep(page_id)
+                elif not packer:
+                    (out_dir / f"{page_id}.json").unlink(missing_ok=True)
+
+            if packer:
+                packer.close()
+                if old:
+                    old.close()
+                index_path(packer.path).replace(index_path(snapshot_path))
+                packer.path.replace(snapshot_path)
+        except Exception:  # leave the previous download as it was
+            partial_path.unlink(missing_ok=True)
+            if packer:
+                packer.close()
+                packer.path.unlink(missing_ok=True)
+                index_path(packer.path).unlink(missing_ok=True)
+            raise
+        finally:
+            if old:
+                old.close()
+
+        high_water_mark = max((entry["last_edited_time"] for entry in manifest.values() if not entry.get("failed")), default=since)
+        if report.failed and high_water_mark:  # keep failed pages inside the next delta
+            high_water_mark = min(high_water_mark, *(versions[page_id] for page_id in report.failed))
+        if since and high_water_mark and any(entry.get("failed") for entry in manifest.values()):  # and earlier failures
+            high_water_mark = min(high_water_mark, since)
+        with Path.open(out_dir / MANIFEST_FILE, "w") as f:
+            json.dump(
+                {
+                    "database_id": database_id,
+                    "synced_at": datetime.now(timezone.utc).isoformat(),
+                    "high_water_mark": high_water_mark,
+                    "pages": manifest,
+                },
+                f,
+                indent=4,
+            )
+        logger.info(f"Synced database {database_id}: {report}")
+        return report
 
     def covert_init(self, token: str, strip_meta_chars: Optional[str] = None, extension: str = "md", filter: Optional[dict] = None):
         ...
@@ -353,3 +1216,91 @@ class NotionClient:
     def move_db_to_page(self, db_id: str, page_id: str):
         """Move a database to a page."""
         self.client.databases.update(database_id=db_id, parent={"page_id": page_id})
+
+
+def _block_children(block: dict) -> List[dict]:
+    return block.get(block["type"], {}).get("children") or block.get("children") or []
+
+
+def _nested_payload(block: dict, levels: int) -> Tuple[dict, Optional[Tuple[List[dict], list]]]:
+    """Payload of a block with up to ``levels`` levels of its subtree nested in it.
+
+    Returns the payload and what was left out, if anything: the children to append under
+    the block afterwards, and the same pair for each nested child.
+    """
+    children = _block_children(block)
+    required = block["type"] in REQUIRED_CHILDREN_TYPES
+    leaves = len(children) <= APPEND_CHILDREN_LIMIT and not any(_block_children(child) for child in children)
+    if not children or not levels or not (required or leaves):
+        return _block_payload(block), ((children, []) if children else None)
+    nested = [_nested_payload(child, levels - 1) for child in children[:APPEND_CHILDREN_LIMIT]]
+    rest = children[APPEND_CHILDREN_LIMIT:]  # only table rows come in such numbers
+    lefts = [left for _, left in nested]
+    payload = _block_payload(block, [child for child, _ in nested])
+    return payload, ((rest, lefts) if rest or any(lefts) else None)
+
+
+def _payload_size(payload: dict) -> int:
+    """Number of blocks in a payload, nested ones included."""
+    return 1 + sum(_payload_size(child) for child in payload[payload["type"]].get("children", []))
+
+
+def _block_payload(block: dict, children: Optional[List[dict]] = None) -> dict:
+    """Writable part of a block, with ``children`` nested where the API expects them."""
+    content = {key: value for key, value in block[block["type"]].items() if key != "children"}
+    if children:
+        content["children"] = children
+    return {"object": "block", "type": block["type"], block["type"]: content}
+
+
+DEFAULT_ANNOTATIONS = {"bold": False, "italic": False, "strikethrough": False, "underline": False, "code": False, "color": "default"}
+
+
+def _normalize(value: Any) -> Any:
+    """Drop read-only and default fields so downloaded and generated blocks compare equal."""
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: _normalize(item)
+        for key, item in value.items()
+        if key not in ("plain_text", "href")
+        and not (key == "annotations" and item == DEFAULT_ANNOTATIONS)
+        and not (key == "color" and item == "default")
+        and not (key == "link" and item is None)
+    }
+
+
+def _content_hash(block: dict) -> str:
+    """Hash of a block's own content, children excluded."""
+    return hashlib.sha256(json.dumps(_normalize(_block_payload(block)), sort_keys=True).encode()).hexdigest()
+
+
+def _tree_hash(blocks: List[dict]) -> str:
+    digest = hashlib.sha256()
+    for block in blocks:
+        digest.update(_content_hash(block).encode())
+        digest.update(_tree_hash(_block_children(block)).encode())
+    return digest.hexdigest()
+
+
+def _walk(blocks: List[dict]) -> Iterator[dict]:
+    for block in blocks:
+        yield block
+        yield from _walk(block.get("children", []))
+
+
+def _drop_failed(blocks: List[dict], failed: set) -> List[dict]:
+    kept = []
+    for block in blocks:
+        if block["id"] in failed:
+            continue
+        block["children"] = _drop_failed(block.get("children", []), failed) if block["has_children"] else []
+        kept.append(block)
+    return kept
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 hex digest of a file's content."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
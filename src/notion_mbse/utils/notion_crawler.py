@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+@package   notion_crawler
+Details:   Concurrent, queue-driven crawler for Notion page trees and workspaces.
+Created:   Sunday, October 18th 2026, 5:02:19 pm
+-----
+Last Modified: 10/18/2026 17:02:19
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_crawler.py"
+__version__ = "0.1.0"
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from notion_client.helpers import iterate_paginated_api as paginate
+
+from .notion_client_extend import NotionClient
+from .notion_stream import JsonStreamWriter
+from .notion_utils import find_title_prop
+from .notion_utils import get_title_content
+from .notion_utils import logger
+from .notion_utils import normalize_id
+
+PAGE = "page"
+DATABASE = "database"
+# Blocks that may hold child pages (toggles, columns, ...). They are walked but not listed.
+CONTAINER = "block"
+
+
+@dataclass
+class CrawlEntry:
+    """One page or database found by the crawler.
+
+    Attributes:
+        id (str): Page or database ID.
+        parent (Optional[str]): ID of the page or database it was found in, None for a root.
+        type (str): "page" or "database".
+        title (Optional[str]): Plain text title.
+        last_edited_time (Optional[str]): Notion timestamp of the last edit.
+        depth (int): Distance from the root, counted in pages and databases.
+    """
+
+    id: str
+    parent: Optional[str]
+    type: str
+    title: Optional[str]
+    last_edited_time: Optional[str]
+    depth: int = 0
+
+
+# A unit of work: (kind, id, parent entry id, depth of the object the children belong to)
+Task = Tuple[str, str, Optional[str], int]
+
+
+class WorkspaceCrawler:
+    """Walk pages and databases breadth first with a work queue and a bounded worker pool.
+
+    Each page costs its block listing and each database its row query; titles and
+    timestamps come from the ``child_page``/``child_database`` blocks and the query rows, so
+    no object is retrieved on its own except the roots. IDs already seen are skipped, and
+    errors are collected in ``errors`` instead of stopping the crawl. Throughput is bounded
+    by the client's rate limiter rather than by recursion.
+
+    Attributes:
+        n_client (NotionClient): Client used for every request.
+        max_workers (int): Upper bound on requests in flight.
+        max_depth (Optional[int]): Deepest level to list; children of that level are not fetched.
+        errors (Dict[str, str]): Error message per ID that could not be listed.
+
+    Example Usage:
+    --------------
+    ```python
+    crawler = WorkspaceCrawler(NotionClient(token="your-notion-api-token"), max_depth=3)
+    entries = crawler.crawl("your-root-page-id")
+    crawler.save_manifest(entries, "./json/workspace.jsonl")
+    ```
+    """
+
+    def __init__(self, n_client: NotionClient, max_workers: Optional[int] = None, max_depth: Optional[int] = None):
+        self.n_client = n_client
+        self.max_workers = max_workers if max_workers else n_client.max_workers
+        self.max_depth = max_depth
+        self.errors: Dict[str, str] = {}
+
+    def crawl(self, root_ids: Union[str, Iterable[str]], root_type: str = PAGE) -> List[CrawlEntry]:
+        """Crawl everything reachable from the roots.
+
+        Args:
+            root_ids (Union[str, Iterable[str]]): Root page or database IDs
+            root_type (str, optional): "page" or "database". Defaults to "page".
+
+        Returns:
+            List[CrawlEntry]: Flat manifest, roots first, in discovery order
+        """
+        if root_type not in (PAGE, DATABASE):
+            raise ValueError(f"Invalid root type '{root_type}', expected '{PAGE}' or '{DATABASE}'.")
+        if isinstance(root_ids, str):
+            root_ids = [root_ids]
+
+        self.errors = {}
+        entries: List[CrawlEntry] = []
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, Task] = {}
+            for root_id in dict.fromkeys(normalize_id(root_id) for root_id in root_ids):
+                task = (root_type, root_id, None, 0)
+                pending[executor.submit(self._root, task)] = task
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    try:
+                        found, follow = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to crawl {task[0]} {task[1]}: {e}")
+                        self.errors[task[1]] = str(e)
+                        continue
+                    for entry in found:
+                        if entry.id in seen:
+                            continue
+                        seen.add(entry.id)
+                        entries.append(entry)
+                        if self.max_depth is None or entry.depth < self.max_depth:
+                            follow.append((entry.type, entry.id, entry.id, entry.depth))
+                    for child in follow:
+                        pending[executor.submit(self._list, child)] = child
+
+        logger.info(f"Crawled {len(entries)} objects, {len(self.errors)} errors")
+        return entries
+
+    def _root(self, task: Task) -> Tuple[List[CrawlEntry], List[Task]]:
+        kind, object_id, _, _ = task
+        if kind == DATABASE:
+            info = self.n_client.client.databases.retrieve(database_id=object_id)
+            title = "".join(text["plain_text"] for text in info["title"])
+        else:
+            info = self.n_client.client.pages.retrieve(page_id=object_id)
+            title = _page_title(info)
+        root = CrawlEntry(object_id, None, kind, title, self.n_client.cache_version(info["last_edited_time"]), 0)
+        return [root], []
+
+    def _list(self, task: Task) -> Tuple[List[CrawlEntry], List[Task]]:
+        """List the children of one page, container block or database."""
+        kind, object_id, parent, depth = task
+        found: List[CrawlEntry] = []
+        follow: List[Task] = []
+        if kind == DATABASE:
+            # Queried directly rather than through iter_database, which applies the client's filter.
+            for row in paginate(self.n_client.client.databases.query, database_id=object_id):
+                version = self.n_client.cache_version(row["last_edited_time"])
+                found.append(CrawlEntry(normalize_id(row["id"]), parent, PAGE, _page_title(row), version, depth + 1))
+            return found, follow
+
+        for block in self.n_client.get_children(object_id):
+            block_id = normalize_id(block["id"])
+            version = self.n_client.cache_version(block["last_edited_time"])
+            if block["type"] == "child_page":
+                found.append(CrawlEntry(block_id, parent, PAGE, block["child_page"]["title"], version, depth + 1))
+            elif block["type"] == "child_database":
+                found.append(CrawlEntry(block_id, parent, DATABASE, block["child_database"]["title"], version, depth + 1))
+            elif block.get("has_children"):
+                follow.append((CONTAINER, block_id, parent, depth))
+        return found, follow
+
+    def save_manifest(self, entries: Iterable[CrawlEntry], path: Union[str, Path], overwrite: bool = True) -> int:
+        """Write entries as JSON Lines (``.jsonl``) or a JSON array.
+
+        Args:
+            entries (Iterable[CrawlEntry]): Crawl results
+            path (Union[str, Path]): Output file
+            overwrite (bool, optional): Replace an existing file. Defaults to True.
+
+        Returns:
+            int: Number of entries written
+        """
+        with JsonStreamWriter(path, overwrite=overwrite) as writer:
+            for entry in entries:
+                writer.write(asdict(entry))
+        return writer.count
+
+
+def _page_title(page: dict) -> Optional[str]:
+    title_prop = find_title_prop(page["properties"])
+    return get_title_content(page["properties"][title_prop]) if title_prop else None
@@ -13,17 +13,19 @@ __author__ = "Mathew Cosgrove"
 __file__ = "notion_database.py"
 __version__ = "0.1.0"
 
-import json
 import os
-from datetime import datetime
+from itertools import chain
 from pathlib import Path
 from typing import Any
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Type
 from typing import Union
 
-from fuzzywuzzy import fuzz
+from notion_client.helpers import iterate_paginated_api as paginate
 from notion_objects import Database
 from notion_objects import NotionObject
 from notion_objects import Page
@@ -33,8 +35,27 @@ from notion_objects import Page
 # G = nx.DiGraph()
 from .notion_base import BaseNotionDatabase
 from .notion_base import BaseNotionPage
+from .notion_bulk import ArchiveResult
+from .notion_bulk import BulkArchiver
+from .notion_cache import METADATA
+from .notion_cache import BaseCache
+from .notion_client_extend import QUERY_PAGE_SIZE
 from .notion_client_extend import NotionClient
+from .notion_loader import BulkLoader
+from .notion_loader import LoadReport
+from .notion_loader import UpsertReport
+from .notion_loader import build_index
+from .notion_loader import infer_property_type
+from .notion_loader import key_value
+from .notion_matcher import match_properties
+from .notion_schema import SCHEMA_TTL
+from .notion_schema import DatabaseSchema
+from .notion_schema import SchemaMigration
+from .notion_stream import iter_json
+from .notion_utils import find_title_prop
+from .notion_utils import get_title_content
 from .notion_utils import logger
+from .notion_utils import normalize_id
 
 NOTION_API_KEY = os.getenv("NOTION_API_KEY", None)
 
@@ -92,7 +113,8 @@ class NotionDatabase(BaseNotionDatabase):
         n_client (NotionClient): The Notion client object.
         database (Database): The Notion database object.
         properties (Dict[str, Any]): The properties of the database.
-        pages (List[BaseNotionPage]): The list of pages in the database.
+        schema_ttl (Optional[float]): Seconds the schema is cached before it is retrieved again, None for no expiry.
+        pages (List[BaseNotionPage]): The pages in the database, filled by get_pages or ``prefetch``.
         parent (Optional[BaseNotionPage]): The parent page of the database.
         custom_data_class (bool): Flag to indicate if a custom data class is used.
 
@@ -104,8 +126,14 @@ class NotionDatabase(BaseNotionDatabase):
         get_parent_id() -> str: Get the parent page ID.
         get_property_map(source_properties: List[str], threshold: int = 80) -> Dict[str, str]: Get the property mappings.
         load_from_json(json_path: Union[str, Path], database_id: str, DataClass: Optional[NotionObject] = None, create_properties: bool = False, force: bool = False): Load data from JSON file.
-        load_database(database_id: str): Load the database.
-        get_properties() -> Dict[str, Any]: Get the database properties.
+        load_database(database_id: str, prefetch: bool = False): Load the database.
+        iter_pages() -> Iterator[BaseNotionPage]: Iterate over the pages in the database lazily.
+        query(filter=None, sorts=None, page_size=100, filter_properties=None, limit=None) -> Iterator[NotionObject]: Stream typed rows.
+        get_properties(force: bool = False) -> Dict[str, Any]: Get the database properties.
+        get_schema(force: bool = False) -> DatabaseSchema: Get the cached, typed database schema.
+        invalidate_schema(): Drop the cached schema.
+        plan_migration(target, renames=None, remove=False) -> SchemaMigration: Diff the schema against a target schema.
+        migrate(target, renames=None, remove=False, dry_run=False) -> SchemaMigration: Apply that diff in one update.
         add_property(prop_name: str, prop_type: Optional[str] = "rich_text", prop_info: Optional[Dict[str, Any]] = None): Add a property to the database.
         remove_property(prop_name: str): Remove a property from the database.
         get_children(force: bool = False) -> List[BaseNotionPage]: Get the children of the database.
@@ -113,6 +141,10 @@ class NotionDatabase(BaseNotionDatabase):
         create(properties: Optional[Dict[str, Any]] = None, obj: Optional[NotionObject] = None) -> NotionObject: Create a database entry.
         check_if_exists(title: str) -> bool: Check if a database entry exists.
 
+    Construction does no I/O: the database is retrieved on first use of ``database_info``,
+    ``properties``, ``title`` or ``parent``, and rows are only listed by ``get_pages``,
+    ``iter_pages`` or ``prefetch=True``.
+
     Example Usage:
 
         ```python
@@ -128,13 +160,23 @@ class NotionDatabase(BaseNotionDatabase):
         ```
     """
 
-    def __init__(self, token: Optional[str] = None, database_id: Optional[str] = None, DataClass: Optional[NotionObject] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        database_id: Optional[str] = None,
+        DataClass: Optional[NotionObject] = None,
+        cache: Optional[BaseCache] = None,
+        client: Optional[NotionClient] = None,
+        prefetch: bool = False,
+        schema_ttl: Optional[float] = SCHEMA_TTL,
+        base_url: Optional[str] = None,
+    ):
         if NOTION_API_KEY:
             token = NOTION_API_KEY
         if token is None:
             raise ValueError("No token provided.")
         self.token = token
-        self.n_client = NotionClient(token=token)
+        self.n_client = client if client else NotionClient(token=token, cache=cache, base_url=base_url)
         self.database_id = database_id
 
         if DataClass is None:
@@ -148,18 +190,61 @@ class NotionDatabase(BaseNotionDatabase):
             raise ValueError("DataClass must be a subclass of NotionObject.")
 
         self.database: Optional[Database[self.DataClass]] = None
-        self.properties: Dict[str, Any] = {}
+        self._database_info: Optional[Dict[str, Any]] = None
+        self._properties: Dict[str, Any] = {}
+        self._schema: Optional[DatabaseSchema] = None
+        self.schema_ttl = schema_ttl
         self.pages: List[BaseNotionPage] = []
-        self.parent: Optional[BaseNotionPage] = None
+        self._pages_loaded = False
+        self._indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._parent: Optional[BaseNotionPage] = None
 
         if self.database_id is not None:
-            self.load_database(database_id)
+            self.database = Database(self.DataClass, database_id=database_id, client=self.n_client.client)
+            if prefetch:
+                self.load_database(database_id, prefetch=True)
+
+    @property
+    def database_info(self) -> Dict[str, Any]:
+        if self._database_info is None and self.database_id is not None:
+            self.load_database(self.database_id)
+        return self._database_info
+
+    @database_info.setter
+    def database_info(self, database_info: Dict[str, Any]):
+        self._database_info = database_info
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        if self._database_info is None and self.database_id is not None:
+            self.load_database(self.database_id)
+        elif self.database_id is not None:
+            self.get_schema()
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties: Dict[str, Any]):
+        self._properties = properties
+
+    @property
+    def title(self) -> Optional[List[Dict[str, Any]]]:
+        return self.database_info["title"] if self.database_info else None
+
+    @property
+    def parent(self) -> Optional[BaseNotionPage]:
+        if self._parent is None and self._database_info is None and self.database_id is not None:
+            self.load_database(self.database_id)
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional[BaseNotionPage]):
+        self._parent = parent
 
     def set_parent(self, parent: BaseNotionPage):
         self.parent = parent
 
     def set_parent_by_id(self, parent_id: str):
-        self.parent = BaseNotionPage(token=self.token, page_id=parent_id, load=False)
+        self.parent = BaseNotionPage(page_id=parent_id, title=None, url=None)
 
     def get_parent(self) -> BaseNotionPage:
         return self.parent
@@ -168,22 +253,20 @@ class NotionDatabase(BaseNotionDatabase):
         return self.parent.page_id
 
     def get_property_map(self, source_properties: List[str], threshold: int = 80) -> Dict[str, str]:
-        mappings = {}
-        db_prop_names = [prop["name"] for prop in self.get_properties().values()]
-
-        for src_property in source_properties:
-            best_match = None
-            best_score = 0
-            for prop in db_prop_names:
-                score = fuzz.ratio(src_property.lower(), prop.lower())
-                if score > best_score:
-                    best_score = score
-                    best_match = prop
-            if best_score > threshold:  # Threshold for fuzzy match
-                mappings[src_property] = best_match
-                db_prop_names.remove(best_match)
-
-        return mappings
+        """Map source columns to database properties by fuzzy name match.
+
+        Scores are computed in one batch and assigned optimally, so the result does not depend
+        on the column order; mappings are cached per schema hash.
+
+        Args:
+            source_properties (List[str]): Source column names
+            threshold (int, optional): A match needs a score above this, out of 100. Defaults to 80.
+
+        Returns:
+            Dict[str, str]: Database property name by source column
+        """
+        schema = self.get_schema()
+        return match_properties(source_properties, schema.names(), threshold=threshold, key=schema.fingerprint)
 
     def load_from_json(
         self,
@@ -192,94 +275,200 @@ class NotionDatabase(BaseNotionDatabase):
         DataClass: Optional[NotionObject] = None,
         create_properties: bool = False,
         force: bool = False,
-    ):
-        self.database_id = database_id
-        self.DataClass = DataClass
-        self.load_database(database_id)
-
-        with Path.open(json_path) as f:
-            records: List[Dict[str, Any]] = json.load(f)
-
-        # filename = Path(json_path).stem
-        # print(filename)
-        record = records[0]
-        properties = record.keys()
-        # generate_model_class_code(filename, properties, file_path=None)
-
-        db_prop_names = [prop["name"].lower() for prop in self.get_properties().values()]
-        print(f"Database properties: {db_prop_names}")
-        properties_map = self.get_property_map(properties, threshold=80)
-        print(f"Property mappings: {properties_map}")
-        for prop in properties:
-            if prop in properties_map and properties_map[prop] in db_prop_names:
-                print(f"Mapping '{prop}' to '{properties_map[prop]}'")
+        checkpoint: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+    ) -> LoadReport:
+        """Create a database page for every record in a JSON or JSON Lines file.
+
+        Records are streamed from the file (JSON Lines one line at a time) and the property
+        map is computed once, from the keys of the first record. Pages are created
+        concurrently by a BulkLoader; with a checkpoint file an interrupted load resumes with
+        the records that were not created yet.
+
+        Args:
+            json_path (Union[str, Path]): Records file, a JSON array or JSON Lines
+            database_id (str): Target database ID
+            DataClass (Optional[NotionObject], optional): Data class of the database. Defaults to None.
+            create_properties (bool, optional): Add properties for unmapped keys. Defaults to False.
+            force (bool, optional): Start over, ignoring an existing checkpoint. Defaults to False.
+            checkpoint (Optional[Union[str, Path]], optional): Checkpoint file. Defaults to None.
+            max_workers (Optional[int], optional): Requests in flight. Defaults to the client's max_workers.
+
+        Returns:
+            LoadReport: Created page IDs and skipped and failed record numbers
+        """
+        if DataClass is not None:
+            self.DataClass = DataClass
+        if (
+            DataClass is not None
+            or self._schema is None
+            or self.database_id is None
+            or normalize_id(database_id) != normalize_id(self.database_id)
+        ):
+            self.load_database(database_id)
+
+        records = iter_json(json_path)
+        record = next(records, None)
+        if record is None:
+            return LoadReport()
+
+        properties_map = self.get_property_map(list(record), threshold=80)
+        logger.info(f"Property mappings: {properties_map}")
+        missing = {}
+        for prop in record:
+            if prop in properties_map:
                 continue
-            else:
-                logger.warning(f"Property '{prop}' not found in database properties.")
-                if create_properties:
-                    prop_type = "rich_text"
-                    if isinstance(record[prop], str):
-                        prop_type = "rich_text"
-                    elif isinstance(record[prop], int):
-                        prop_type = "number"
-                    elif isinstance(record[prop], bool):
-                        prop_type = "checkbox"
-                    elif isinstance(record[prop], datetime):
-                        prop_type = "date"
-                    elif isinstance(record[prop], list):
-                        prop_type = "multi_select"
-                    logger.info(f"Creating property '{prop}' with type '{prop_type}'")
-                    self.add_property(prop, prop_type)
-
-        for record in records:
-            update_record = {}
-            for prop, value in record.items():
-                if prop in properties_map:
-                    update_record[properties_map[prop]] = value
-                    print(f"Mapping '{prop}' to '{properties_map[prop]}'")
-                else:
-                    print(f"Property '{prop}' not found in database properties.")
-
-            if update_record:
-                print(f"Creating record: {update_record}")
-                self.create(update_record)
-
-    def load_database(self, database_id: str):
+            logger.warning(f"Property '{prop}' not found in database properties.")
+            if create_properties:
+                missing[prop] = infer_property_type(record[prop])
+        if missing:
+            self.migrate(missing)
+            properties_map.update({prop: prop for prop in missing})
+
+        loader = BulkLoader(self.n_client, database_id, self.properties, properties_map, max_workers=max_workers)
+        report = loader.load(chain([record], records), checkpoint=checkpoint, restart=force)
+        self._pages_loaded = False
+        return report
+
+    def load_database(self, database_id: str, prefetch: bool = False):
         """Load the database.
 
+        Retrieves the database itself; rows are only listed with ``prefetch``.
+
         Args:
             database_id (str): Database ID
+            prefetch (bool, optional): Also load every page into ``pages``. Defaults to False.
         """
         self.database_id = database_id
 
+        self._retrieve()
+        self.database: Database[self.DataClass] = Database(self.DataClass, database_id=database_id, client=self.n_client.client)
+
+        if prefetch:
+            self.get_pages(force=True)
+
+    def iter_pages(self) -> Iterator[BaseNotionPage]:
+        """Iterate over the pages in the database, querying one result page at a time.
+
+        Yields:
+            BaseNotionPage: Handle with the page ID, title and URL of each row
+        """
+        for obj in self._iter_rows():
+            yield self._page_handle(obj)
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        if self.database is None:
+            raise ValueError("Database is not loaded.")
+        cache = self.n_client.cache
+        for page in self.database:
+            if cache is not None:
+                # Row payloads double as page metadata, so later freshness checks need no request.
+                cache.put(page.id, METADATA, self.n_client.cache_version(page._obj["last_edited_time"]), page._obj)
+            yield page._obj
+
+    def _page_handle(self, obj: Dict[str, Any]) -> BaseNotionPage:
+        title_prop = find_title_prop(obj["properties"])
+        title = get_title_content(obj["properties"][title_prop]) if title_prop else None
+        return BaseNotionPage(page_id=obj["id"], title=title, url=obj.get("url"))
+
+    def _retrieve(self):
         try:
-            self.database_info: Dict[str, Any] = self.n_client.client.databases.retrieve(database_id=database_id)
-            self.title = self.database_info["title"]
-            parent_type = self.database_info["parent"]["type"]
-            if parent_type == "page_id":
-                self.parent = BaseNotionPage(token=self.token, page_id=self.database_info["parent"][parent_type], load=False)
+            database_info = self.n_client.client.databases.retrieve(database_id=self.database_id)
         except Exception as e:
-            raise ValueError(f"Database with ID '{database_id}' not found.") from e
+            raise ValueError(f"Database with ID '{self.database_id}' not found.") from e
+        self._set_database_info(database_info)
+
+    def _set_database_info(self, database_info: Dict[str, Any]):
+        """Take a database payload, from retrieve or update, as the current info and schema."""
+        self.database_info = database_info
+        parent_type = database_info["parent"]["type"]
+        if parent_type == "page_id":
+            self.parent = BaseNotionPage(page_id=database_info["parent"][parent_type], title=None, url=None)
+        self.properties = database_info["properties"]
+        self._schema = DatabaseSchema.from_database(database_info)
+        cache = self.n_client.cache
+        if cache is not None:
+            cache.put(self.database_id, METADATA, self.n_client.cache_version(database_info["last_edited_time"]), database_info)
+
+    def get_schema(self, force: bool = False) -> DatabaseSchema:
+        """Get the database schema, retrieving it only when it is missing or older than ``schema_ttl``.
 
-        self.database: Database[self.DataClass] = Database(self.DataClass, database_id=database_id, client=self.n_client.client)
+        Args:
+            force (bool, optional): Retrieve it regardless. Defaults to False.
 
-        if self.database is None:
-            raise ValueError(f"Fail to load Database on valid ID '{database_id}'.")
+        Returns:
+            DatabaseSchema: Typed property descriptors
+        """
+        if self.database_id is None:
+            raise ValueError("Database ID is not provided.")
+        if force or self._schema is None or self._schema.expired(self.schema_ttl):
+            self._retrieve()
+        return self._schema
 
-        self.properties = self.database_info["properties"]
+    def invalidate_schema(self):
+        """Drop the cached schema, e.g. after the database was edited elsewhere."""
+        self._schema = None
 
-        for page in self.database:
-            self.pages.append(BaseNotionPage(token=self.token, page_id=page.id, load=False))
+    def plan_migration(
+        self,
+        target: Union[Type[NotionObject], Dict[str, Any]],
+        renames: Optional[Dict[str, str]] = None,
+        remove: bool = False,
+    ) -> SchemaMigration:
+        """Compare the database schema with a target schema without changing anything.
+
+        Args:
+            target (Union[Type[NotionObject], Dict[str, Any]]): A notion_objects class (e.g. from
+                ``create_db_page_from_schema``), a JSON schema, or Notion types by property name
+            renames (Optional[Dict[str, str]], optional): New name by current name. Defaults to None.
+            remove (bool, optional): Delete properties missing from the target. Defaults to False.
+
+        Returns:
+            SchemaMigration: Properties to add, rename and remove, and type conflicts
+        """
+        return SchemaMigration.diff(self.get_schema(), target, renames=renames, remove=remove)
+
+    def migrate(
+        self,
+        target: Union[Type[NotionObject], Dict[str, Any]],
+        renames: Optional[Dict[str, str]] = None,
+        remove: bool = False,
+        dry_run: bool = False,
+    ) -> SchemaMigration:
+        """Bring the database schema to a target schema with a single ``databases.update``.
+
+        Args:
+            target (Union[Type[NotionObject], Dict[str, Any]]): Target schema, see ``plan_migration``
+            renames (Optional[Dict[str, str]], optional): New name by current name. Defaults to None.
+            remove (bool, optional): Delete properties missing from the target. Defaults to False.
+            dry_run (bool, optional): Only report the changes. Defaults to False.
 
-    def get_properties(self) -> Dict[str, Any]:
-        """Get the database properties.
+        Returns:
+            SchemaMigration: The changes, with ``applied`` set when they were sent
+        """
+        migration = self.plan_migration(target, renames=renames, remove=remove)
+        if dry_run or migration.empty:
+            logger.info(str(migration))
+            return migration
+        self.invalidate_schema()
+        for name in [*migration.rename, *migration.remove]:
+            self._indexes.pop(name, None)
+        database_info = self.n_client.client.databases.update(self.database_id, properties=migration.payload())
+        self._set_database_info(database_info)
+        migration.applied = True
+        logger.info(str(migration))
+        return migration
+
+    def get_properties(self, force: bool = False) -> Dict[str, Any]:
+        """Get the database properties, from the cached schema.
+
+        Args:
+            force (bool, optional): Retrieve the database again. Defaults to False.
 
         Returns:
             Dict[str, Any]: Database Properties
         """
-        self.database_info: Dict[str, Any] = self.n_client.client.databases.retrieve(database_id=self.database_id)
-        self.properties = self.database_info["properties"]
-        return self.properties
+        return self.get_schema(force=force).raw
 
     # "Tasks": {
     #     "id": "%3AVpi",
@@ -300,11 +489,16 @@ class NotionDatabase(BaseNotionDatabase):
             "type": prop_type,
             prop_type: prop_info,
         }
-        self.n_client.client.databases.update(self.database_id, properties={prop_name: properties_update})
+        self.invalidate_schema()
+        database_info = self.n_client.client.databases.update(self.database_id, properties={prop_name: properties_update})
+        self._set_database_info(database_info)
 
     def remove_property(self, prop_name: str):
+        self.invalidate_schema()
+        self._indexes.pop(prop_name, None)
         try:
-            self.n_client.client.databases.update(self.database_id, properties={prop_name: None})
+            database_info = self.n_client.client.databases.update(self.database_id, properties={prop_name: None})
+            self._set_database_info(database_info)
         except Exception:
             logger.error(f"Failed to remove property '{prop_name}' from database '{self.database_id}'.")
 
@@ -312,10 +506,22 @@ class NotionDatabase(BaseNotionDatabase):
         return self.get_pages(force=force)
 
     def get_pages(self, force: bool = False) -> List[BaseNotionPage]:
-        """Get Pages."""
-        if force or not self.pages:
-            for page in self.database:
-                self.pages.append(BaseNotionPage(token=self.n_client.token, page_id=page.id, load=False))
+        """Get Pages, listing the database on first call.
+
+        The listing also builds the title index used by ``check_if_exists``.
+        """
+        if force or not self._pages_loaded:
+            title_prop = find_title_prop(self.properties)
+            index: Dict[str, Dict[str, Any]] = {}
+            self.pages = []
+            for obj in self._iter_rows():
+                self.pages.append(self._page_handle(obj))
+                value = key_value(obj, title_prop) if title_prop else None
+                if value is not None:
+                    index.setdefault(value, obj)
+            if title_prop:
+                self._indexes[title_prop] = index
+            self._pages_loaded = True
         return self.pages
 
     # def new(self, parent: Optional[BaseNotionPage] = None, **kwargs) -> NotionObject:
@@ -326,10 +532,60 @@ class NotionDatabase(BaseNotionDatabase):
     #         parent = self.parent
     #     return self.database.new(parent=parent.page_id, **kwargs)
     def check_if_exists(self, title: str) -> bool:
-        """Check if Database Entry Exists."""
-        for page in self.pages:
-            if page.title == title:
-                return True
+        """Check if Database Entry Exists, by title."""
+        return title in self.get_index()
+
+    def get_index(self, key: Optional[str] = None, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Get the rows indexed by a key property, built with one paginated query on first call.
+
+        Args:
+            key (Optional[str], optional): Key property, e.g. a unique_id. Defaults to the title property.
+            force (bool, optional): Rebuild the index. Defaults to False.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Row payload by key value
+        """
+        if key is None:
+            key = find_title_prop(self.properties)
+        if key not in self.properties:
+            raise ValueError(f"Property '{key}' not found in database properties.")
+        if force or key not in self._indexes:
+            self._indexes[key] = build_index(self.n_client, self.database_id, key)
+        return self._indexes[key]
+
+    def upsert(
+        self,
+        records: Iterable[Dict[str, Any]],
+        key: Optional[str] = None,
+        property_map: Optional[Dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> UpsertReport:
+        """Create or update a page per record, matched by a natural key.
+
+        Records whose key is not in the database are created, pages whose properties differ
+        get only the changed properties, and the rest cost no request, so importing the same
+        records again is cheap and creates no duplicates.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Records
+            key (Optional[str], optional): Key property. Defaults to the title property.
+            property_map (Optional[Dict[str, str]], optional): Property name by record key. Defaults to None,
+                for records keyed by property name.
+            max_workers (Optional[int], optional): Requests in flight. Defaults to the client's max_workers.
+
+        Returns:
+            UpsertReport: Keys created, updated, unchanged and failed
+        """
+        if key is None:
+            key = find_title_prop(self.properties)
+        index = self.get_index(key)
+        if property_map is None:
+            property_map = {name: name for name in self.properties}
+        loader = BulkLoader(self.n_client, self.database_id, self.properties, property_map, max_workers=max_workers)
+        report = loader.upsert(records, index, key)
+        if report.created:
+            self._pages_loaded = False
+        return report
 
     def create(self, properties: Optional[Dict[str, Any]] = None, obj: Optional[NotionObject] = None) -> NotionObject:
         """Create Database Entry."""
@@ -352,7 +608,11 @@ class NotionDatabase(BaseNotionDatabase):
         #     return db_entry
 
         db_entry = self.database.create(entry)
-        self.pages.append(BaseNotionPage(token=self.token, page_id=db_entry.id, load=False))
+        self.pages.append(self._page_handle(db_entry._obj))
+        for key, index in self._indexes.items():
+            value = key_value(db_entry._obj, key)
+            if value is not None:
+                index.setdefault(value, db_entry._obj)
         return db_entry
 
     def read(self, entry_id: str) -> NotionObject:
@@ -371,26 +631,69 @@ class NotionDatabase(BaseNotionDatabase):
         self.n_client.client.blocks.delete(block_id=entry.id)
         self.pages.remove(entry)
 
-    def delete_all(self):
-        """Remove Pages."""
-        for page in self.pages:
-            self.n_client.client.blocks.delete(block_id=page.page_id)
-            self.pages.remove(page)
+    def delete_all(self) -> List[ArchiveResult]:
+        """Remove Pages.
+
+        Rows are archived concurrently; rows that could not be archived stay in ``pages``.
+
+        Returns:
+            List[ArchiveResult]: One result per row
+        """
+        results = BulkArchiver(self.n_client).archive(page.page_id for page in self.get_pages())
+        archived = {result.id for result in results if result.ok}
+        self.pages = [page for page in self.pages if normalize_id(page.page_id) not in archived]
+        self._indexes = {}
+        return results
 
     def __repr__(self):
-        return f"NotionDatabase(title={self.database.title}, database_id={self.database.database_id})"
-
-    def __iter__(self):
-        return iter(self.database)
-
-    def query(self, filter: Optional[dict] = None) -> List[NotionObject]:
-        results = self.database.query(filter=filter)
-        pages: List[BaseNotionPage] = []
-        for result in results:
-            if isinstance(result, dict):
-                pages.append(BaseNotionPage(token=self.token, page_id=result["id"], load=False))
-            else:
-                print(f"result not dict: {type(result)}")
+        return f"NotionDatabase(database_id={self.database_id})"
+
+    def __iter__(self) -> Iterator[NotionObject]:
+        return self.query()
+
+    def query(
+        self,
+        filter: Optional[dict] = None,
+        sorts: Optional[List[dict]] = None,
+        page_size: int = QUERY_PAGE_SIZE,
+        filter_properties: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[NotionObject]:
+        """Query the database, fetching one result page at a time as the rows are consumed.
+
+        Filtering and sorting happen server side. With ``filter_properties`` only the named
+        properties are returned, which keeps wide rows small; the rows are then partial and
+        are not written to the metadata cache.
+
+        Args:
+            filter (Optional[dict], optional): Notion filter object. Defaults to None.
+            sorts (Optional[List[dict]], optional): Notion sort objects. Defaults to None.
+            page_size (int, optional): Rows per request, at most 100. Defaults to 100.
+            filter_properties (Optional[List[str]], optional): Names or IDs of the properties to return. Defaults to None, for all.
+            limit (Optional[int], optional): Stop after this many rows. Defaults to None.
+
+        Yields:
+            NotionObject: Each row as a ``DataClass`` object
+        """
+        if self.database_id is None:
+            raise ValueError("Database ID is not provided.")
+        kwargs: Dict[str, Any] = {"page_size": min(page_size, QUERY_PAGE_SIZE, limit or QUERY_PAGE_SIZE)}
+        if filter:
+            kwargs["filter"] = filter
+        if sorts:
+            kwargs["sorts"] = sorts
+        if filter_properties:
+            schema = self.get_schema()
+            kwargs["filter_properties"] = [schema[name].id if name in schema else name for name in filter_properties]
+
+        cache = None if filter_properties else self.n_client.cache
+        rows = paginate(self.n_client.client.databases.query, database_id=self.database_id, **kwargs)
+        for count, row in enumerate(rows, start=1):
+            if cache is not None:
+                cache.put(row["id"], METADATA, self.n_client.cache_version(row["last_edited_time"]), row)
+            yield self.DataClass(row)
+            if limit is not None and count >= limit:
+                return
 
     def download_database(self, database_id: str, out_dir: Union[str, Path] = "./json"):
         """Download the notion database and associated pages."""
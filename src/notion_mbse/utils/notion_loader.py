@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+"""
+@package   notion_loader
+Details:   Streaming, concurrent and resumable bulk insert of records into a Notion database.
+Created:   Sunday, October 18th 2026, 8:31:12 pm
+-----
+Last Modified: 10/18/2026 20:31:12
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_loader.py"
+__version__ = "0.1.0"
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from notion_client.helpers import iterate_paginated_api as paginate
+from notion_objects.properties import URL
+from notion_objects.properties import Checkbox
+from notion_objects.properties import Date
+from notion_objects.properties import Email
+from notion_objects.properties import MultiSelect
+from notion_objects.properties import Number
+from notion_objects.properties import People
+from notion_objects.properties import Phone
+from notion_objects.properties import Property
+from notion_objects.properties import Relation
+from notion_objects.properties import Select
+from notion_objects.properties import Status
+from notion_objects.properties import Text
+from notion_objects.properties import TitleText
+
+from .notion_client_extend import NotionClient
+from .notion_ratelimit import ThrottledClient
+from .notion_ratelimit import TokenBucket
+from .notion_ratelimit import get_bucket
+from .notion_stream import dumps
+from .notion_stream import loads
+from .notion_utils import logger
+from .notion_utils import normalize_id
+
+# Writable property types and the notion_objects descriptor that builds their payload.
+PROPERTY_SETTERS: Dict[str, Type[Property]] = {
+    "title": TitleText,
+    "rich_text": Text,
+    "number": Number,
+    "select": Select,
+    "multi_select": MultiSelect,
+    "status": Status,
+    "date": Date,
+    "checkbox": Checkbox,
+    "url": URL,
+    "email": Email,
+    "phone_number": Phone,
+    "relation": Relation,
+    "people": People,
+}
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a bulk load.
+
+    Attributes:
+        created (List[str]): IDs of the pages created by this run.
+        skipped (List[int]): Record numbers already loaded by a previous run, or with no mapped property.
+        failed (List[int]): Record numbers that could not be loaded; a resumed run retries them.
+    """
+
+    created: List[str] = field(default_factory=list)
+    skipped: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(items) for name, items in self.__dict__.items()}
+
+    def __str__(self):
+        return ", ".join(f"{count} {name}" for name, count in self.counts().items())
+
+
+@dataclass
+class UpsertReport:
+    """Outcome of an upsert, by natural key.
+
+    Attributes:
+        created (List[str]): Keys of the records that got a new page.
+        updated (List[str]): Keys of the pages that had changed properties.
+        unchanged (List[str]): Keys of the pages that already matched their record.
+        failed (List[str]): Keys of the records that could not be written, or ``record <n>`` when the key is missing.
+    """
+
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(items) for name, items in self.__dict__.items()}
+
+    def __str__(self):
+        return ", ".join(f"{count} {name}" for name, count in self.counts().items())
+
+
+def key_value(page: Dict[str, Any], key: str) -> Optional[str]:
+    """Get the natural key of a page from one of its properties, as a string.
+
+    Args:
+        page (Dict[str, Any]): Page payload
+        key (str): Property name, e.g. the title or a unique_id property
+
+    Returns:
+        Optional[str]: The key, None when the property is empty
+    """
+    prop = page["properties"][key]
+    if prop["type"] == "unique_id":
+        value = prop["unique_id"]
+        if value["number"] is None:
+            return None
+        return f"{value['prefix']}-{value['number']}" if value["prefix"] else str(value["number"])
+    if prop["type"] not in PROPERTY_SETTERS:
+        raise ValueError(f"Property '{key}' of type '{prop['type']}' cannot be used as a key.")
+    value = PROPERTY_SETTERS[prop["type"]]().get(key, page)
+    return str(value) if value not in (None, "") else None
+
+
+def build_index(n_client: NotionClient, database_id: str, key: str) -> Dict[str, Dict[str, Any]]:
+    """Index the rows of a database by natural key with one paginated query.
+
+    Args:
+        n_client (NotionClient): Client
+        database_id (str): Database ID
+        key (str): Key property name
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Row payload by key; the first row wins when keys repeat
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    duplicates = 0
+    for page in paginate(n_client.client.databases.query, database_id=database_id):
+        value = key_value(page, key)
+        if value is None:
+            continue
+        if value in index:
+            duplicates += 1
+            continue
+        index[value] = page
+    if duplicates:
+        logger.warning(f"{duplicates} rows of {database_id} repeat a '{key}' value and are not indexed.")
+    return index
+
+
+def read_checkpoint(path: Union[str, Path]) -> Dict[int, str]:
+    """Read the record numbers and page IDs stored in a checkpoint file.
+
+    A line cut short by a crash is ignored, so its record is loaded again.
+
+    Args:
+        path (Union[str, Path]): Checkpoint file
+
+    Returns:
+        Dict[int, str]: Page ID by record number
+    """
+    path = Path(path)
+    done: Dict[int, str] = {}
+    if not path.exists():
+        return done
+    with Path.open(path, "rb") as f:
+        for line in f:
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue
+            done[entry["record"]] = entry["id"]
+    return done
+
+
+class BulkLoader:
+    """Create database pages from plain records through a bounded worker pool.
+
+    Records are consumed lazily and mapped with a property map computed once by the
+    caller. Workers convert each record to property payloads with the notion_objects
+    property descriptors and create its page; requests are paced by the token bucket of the
+    client's integration token, which a ``ThrottledClient`` already applies itself.
+
+    With a checkpoint file every created record is appended to it as soon as its page
+    exists, so an interrupted load continues with the records that are not in it yet.
+    Records are identified by their position, so a resumed load must read the same input.
+
+    Attributes:
+        n_client (NotionClient): Client used for every request.
+        database_id (str): Target database.
+        schema (Dict[str, Any]): Database properties, by name.
+        property_map (Dict[str, str]): Database property name by record key.
+        max_workers (int): Upper bound on requests in flight.
+        bucket (Optional[TokenBucket]): Bucket acquired before each request, None when the client paces itself.
+
+    Example Usage:
+    --------------
+    ```python
+    loader = BulkLoader(n_client, database_id, database.properties, {"name": "Name", "size": "Size"})
+    report = loader.load(iter_json("records.jsonl"), checkpoint="records.checkpoint.jsonl")
+    ```
+    """
+
+    def __init__(
+        self,
+        n_client: NotionClient,
+        database_id: str,
+        schema: Dict[str, Any],
+        property_map: Dict[str, str],
+        max_workers: Optional[int] = None,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.n_client = n_client
+        self.database_id = database_id
+        self.schema = schema
+        self.max_workers = max_workers if max_workers else n_client.max_workers
+        if bucket is None and not isinstance(n_client.client, ThrottledClient):
+            bucket = get_bucket(n_client.token or "")
+        self.bucket = bucket
+        self.property_map: Dict[str, str] = {}
+        self.keys_by_property = {name: key for key, name in property_map.items()}
+        self._setters: Dict[str, Property] = {}
+        for key, name in property_map.items():
+            prop_type = schema[name]["type"]
+            if prop_type not in PROPERTY_SETTERS:
+                logger.warning(f"Property '{name}' of type '{prop_type}' is read-only, '{key}' is not loaded.")
+                continue
+            self.property_map[key] = name
+            self._setters[name] = PROPERTY_SETTERS[prop_type]()
+
+    def convert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the ``properties`` payload of a record. Unmapped keys and None values are left out."""
+        properties: Dict[str, Any] = {}
+        for key, value in record.items():
+            name = self.property_map.get(key)
+            if name is not None and value is not None:
+                self._setters[name].set(name, value, properties)
+        return properties
+
+    def changes(self, properties: Dict[str, Any], page: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep the properties of a payload whose value differs from the page's.
+
+        Values are compared as read back by the notion_objects descriptors, so formatting
+        that Notion adds (annotations, plain text, ...) is not a change.
+
+        Args:
+            properties (Dict[str, Any]): Payload built by ``convert``
+            page (Dict[str, Any]): Current page payload
+
+        Returns:
+            Dict[str, Any]: The changed part of the payload
+        """
+        changed: Dict[str, Any] = {}
+        for name, value in properties.items():
+            try:
+                same = self._value(name, {"properties": properties}) == self._value(name, page)
+            except (KeyError, TypeError, ValueError):
+                same = False
+            if not same:
+                changed[name] = value
+        return changed
+
+    def _value(self, name: str, obj: Dict[str, Any]) -> Any:
+        value = self._setters[name].get(name, obj)
+        if self.schema[name]["type"] == "relation":
+            return sorted(normalize_id(item) for item in value)
+        return value
+
+    def upsert(self, records: Iterable[Dict[str, Any]], index: Dict[str, Dict[str, Any]], key: str) -> UpsertReport:
+        """Create, update or skip each record by its natural key.
+
+        Every record is classified with one lookup in ``index``. Only records whose key is
+        new are created, and only the properties that differ are sent for existing pages.
+        ``index`` is updated with the written pages, so it can be reused for the next batch.
+        A key repeated within the records is written once; later repeats are failed.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Records
+            index (Dict[str, Dict[str, Any]]): Row payload by key, from ``build_index``
+            key (str): Key property name
+
+        Returns:
+            UpsertReport: Keys created, updated, unchanged and failed
+        """
+        source = self.keys_by_property.get(key)
+        if source is None:
+            raise ValueError(f"Key property '{key}' is not mapped from the records.")
+        report = UpsertReport()
+        seen = set()
+
+        def collect(future: Future, record_key: str, created: bool):
+            try:
+                index[record_key] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to write record '{record_key}': {e}")
+                report.failed.append(record_key)
+                return
+            (report.created if created else report.updated).append(record_key)
+
+        backlog = self.max_workers * 2
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, Tuple[str, bool]] = {}
+            for number, record in enumerate(records):
+                value = record.get(source)
+                if value is None:
+                    logger.error(f"Record {number} has no '{source}' value.")
+                    report.failed.append(f"record {number}")
+                    continue
+                record_key = str(value)
+                if record_key in seen:
+                    logger.warning(f"Key '{record_key}' repeats in the records, record {number} is not written.")
+                    report.failed.append(record_key)
+                    continue
+                seen.add(record_key)
+
+                properties = self.convert(record)
+                page = index.get(record_key)
+                if page is None:
+                    pending[executor.submit(self._write, None, properties)] = (record_key, True)
+                else:
+                    changed = self.changes(properties, page)
+                    if not changed:
+                        report.unchanged.append(record_key)
+                        continue
+                    pending[executor.submit(self._write, page["id"], changed)] = (record_key, False)
+                if len(pending) >= backlog:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future, *pending.pop(future))
+            for future, (record_key, created) in pending.items():
+                collect(future, record_key, created)
+
+        logger.info(f"Upserted records into {self.database_id}: {report}")
+        return report
+
+    def _write(self, page_id: Optional[str], properties: Dict[str, Any]) -> Dict[str, Any]:
+        if self.bucket is not None:
+            self.bucket.acquire()
+        if page_id is None:
+            return self.n_client.client.pages.create(parent={"database_id": self.database_id}, properties=properties)
+        return self.n_client.client.pages.update(page_id=page_id, properties=properties)
+
+    def load(self, records: Iterable[Dict[str, Any]], checkpoint: Optional[Union[str, Path]] = None, restart: bool = False) -> LoadReport:
+        """Create a page for every record.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Records, e.g. from ``iter_json``
+            checkpoint (Optional[Union[str, Path]], optional): Checkpoint file to resume from and append to. Defaults to None.
+            restart (bool, optional): Ignore and truncate an existing checkpoint. Defaults to False.
+
+        Returns:
+            LoadReport: Created page IDs and skipped and failed record numbers
+        """
+        report = LoadReport()
+        done = read_checkpoint(checkpoint) if checkpoint and not restart else {}
+        log = None
+        if checkpoint:
+            Path(checkpoint).parent.mkdir(parents=True, exist_ok=True)
+            log = Path.open(Path(checkpoint), "wb" if restart else "ab")
+
+        def collect(future: Future, number: int):
+            try:
+                page_id = future.result()
+            except Exception as e:
+                logger.error(f"Failed to load record {number}: {e}")
+                report.failed.append(number)
+                return
+            if page_id is None:
+                report.skipped.append(number)
+                return
+            report.created.append(page_id)
+            if log is not None:
+                log.write(dumps({"record": number, "id": page_id}) + b"\n")
+                log.flush()
+
+        backlog = self.max_workers * 2
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending: Dict[Future, int] = {}
+                for number, record in enumerate(records):
+                    if number in done:
+                        report.skipped.append(number)
+                        continue
+                    pending[executor.submit(self._load_one, record)] = number
+                    if len(pending) >= backlog:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            collect(future, pending.pop(future))
+                for future, number in pending.items():
+                    collect(future, number)
+        finally:
+            if log is not None:
+                log.close()
+
+        report.skipped.sort()
+        report.failed.sort()
+        logger.info(f"Loaded records into {self.database_id}: {report}")
+        return report
+
+    def _load_one(self, record: Dict[str, Any]) -> Optional[str]:
+        properties = self.convert(record)
+        if not properties:
+            return None
+        return self._write(None, properties)["id"]
+
+
+def infer_property_type(value: Any) -> str:
+    """Guess the database property type of a record value, for properties created on load."""
+    if isinstance(value, bool):
+        return "checkbox"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, list):
+        return "multi_select"
+    return "rich_text"
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+@package   notion_matcher
+Details:   Batched fuzzy matching of source columns to database properties with optimal assignment.
+Created:   Sunday, October 18th 2026, 10:02:33 pm
+-----
+Last Modified: 10/18/2026 22:02:33
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_matcher.py"
+__version__ = "0.1.0"
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz import process
+except ImportError:  # rapidfuzz is optional, fuzzywuzzy is the fallback
+    from fuzzywuzzy import fuzz
+
+    process = None
+
+try:
+    import numpy
+except ImportError:  # rapidfuzz's cdist needs numpy, scores are computed pair by pair without it
+    numpy = None
+
+# A match needs a score above this, out of 100.
+MATCH_THRESHOLD = 80
+
+
+def schema_hash(names: Iterable[str]) -> str:
+    """Hash a set of property names; the order does not matter."""
+    return hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+
+
+def score_matrix(sources: List[str], targets: List[str]) -> List[List[float]]:
+    """Score every source against every target with ``fuzz.ratio``, case-insensitively.
+
+    With rapidfuzz and numpy installed the whole matrix is computed in one ``cdist`` call.
+
+    Args:
+        sources (List[str]): Source names, one row each
+        targets (List[str]): Target names, one column each
+
+    Returns:
+        List[List[float]]: Scores from 0 to 100
+    """
+    sources = [source.lower() for source in sources]
+    targets = [target.lower() for target in targets]
+    if process is not None and numpy is not None:
+        return process.cdist(sources, targets, scorer=fuzz.ratio, workers=-1).tolist()
+    return [[fuzz.ratio(source, target) for target in targets] for source in sources]
+
+
+def assign(weights: List[List[float]]) -> List[int]:
+    """Solve the maximum weight assignment with the Hungarian algorithm.
+
+    Args:
+        weights (List[List[float]]): Weight of each row and column pair, with no more rows than columns
+
+    Returns:
+        List[int]: Column assigned to each row
+    """
+    n, m = len(weights), len(weights[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = inf
+            j1 = 0
+            row = weights[i0 - 1]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = -row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
+
+
+class PropertyMatcher:
+    """Map source column names to database property names.
+
+    Exact case-insensitive matches are taken first. The remaining pairs scoring above the
+    threshold form a bipartite graph; each connected component is solved with an optimal
+    assignment, so the mapping maximizes the total score and does not depend on the order
+    of the columns. Most components are a single pair, which keeps large spreadsheets fast.
+
+    Mappings are cached per schema hash, source columns and threshold.
+
+    Attributes:
+        threshold (int): A match needs a score above this, out of 100.
+        max_entries (int): Number of mappings kept in the cache.
+
+    Example Usage:
+    --------------
+    ```python
+    matcher = PropertyMatcher()
+    matcher.match(["name", "status"], ["Name", "Status", "Tags"])  # {"name": "Name", "status": "Status"}
+    ```
+    """
+
+    def __init__(self, threshold: int = MATCH_THRESHOLD, max_entries: int = 256):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._cache: Dict[Tuple[str, Tuple[str, ...], float], Dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(
+        self,
+        sources: Iterable[str],
+        targets: Iterable[str],
+        threshold: Optional[int] = None,
+        key: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Map each source to at most one target and each target to at most one source.
+
+        Args:
+            sources (Iterable[str]): Source column names
+            targets (Iterable[str]): Database property names
+            threshold (Optional[int], optional): Override the matcher's threshold. Defaults to None.
+            key (Optional[str], optional): Schema hash of the targets, computed when not given. Defaults to None.
+
+        Returns:
+            Dict[str, str]: Target name by source name, in source order
+        """
+        sources = list(dict.fromkeys(sources))
+        targets = list(dict.fromkeys(targets))
+        threshold = self.threshold if threshold is None else threshold
+        cache_key = (key if key else schema_hash(targets), tuple(sources), threshold)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return dict(self._cache[cache_key])
+
+        mapping = self._match(sources, targets, threshold)
+        with self._lock:
+            self._cache[cache_key] = mapping
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return dict(mapping)
+
+    def _match(self, sources: List[str], targets: List[str], threshold: float) -> Dict[str, str]:
+        matched: Dict[int, int] = {}
+        taken = set()
+        by_name = {target.lower(): j for j, target in reversed(list(enumerate(targets)))}
+        for i, source in enumerate(sources):
+            j = by_name.get(source.lower())
+            if j is not None and j not in taken:
+                matched[i] = j
+                taken.add(j)
+        rows = [i for i in range(len(sources)) if i not in matched]
+        cols = [j for j in range(len(targets)) if j not in taken]
+        if rows and cols:
+            scores = score_matrix([sources[i] for i in rows], [targets[j] for j in cols])
+            edges = [(r, c, score) for r, row in enumerate(scores) for c, score in enumerate(row) if score > threshold]
+            for component in _components(edges):
+                matched.update(_solve(component, rows, cols, sources, targets))
+        return {sources[i]: targets[matched[i]] for i in sorted(matched)}
+
+
+def _components(edges: List[Tuple[int, int, float]]) -> List[List[Tuple[int, int, float]]]:
+    """Split row/column edges into connected components."""
+    parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+    def find(node: Tuple[str, int]) -> Tuple[str, int]:
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for r, c, _ in edges:
+        parent[find(("r", r))] = find(("c", c))
+    components: Dict[Tuple[str, int], List[Tuple[int, int, float]]] = {}
+    for edge in edges:
+        components.setdefault(find(("r", edge[0])), []).append(edge)
+    return list(components.values())
+
+
+def _solve(
+    component: List[Tuple[int, int, float]], rows: List[int], cols: List[int], sources: List[str], targets: List[str]
+) -> Dict[int, int]:
+    if len(component) == 1:
+        r, c, _ = component[0]
+        return {rows[r]: cols[c]}
+    # Sort by name so ties are broken the same way whatever the input order.
+    component_rows = sorted({r for r, _, _ in component}, key=lambda r: sources[rows[r]])
+    component_cols = sorted({c for _, c, _ in component}, key=lambda c: targets[cols[c]])
+    weight = {(r, c): score for r, c, score in component}
+    transpose = len(component_rows) > len(component_cols)
+    if transpose:
+        component_rows, component_cols = component_cols, component_rows
+    weights = [[weight.get((c, r) if transpose else (r, c), 0.0) for c in component_cols] for r in component_rows]
+    result: Dict[int, int] = {}
+    for a, b in enumerate(assign(weights)):
+        r, c = (component_cols[b], component_rows[a]) if transpose else (component_rows[a], component_cols[b])
+        if (r, c) in weight:
+            result[rows[r]] = cols[c]
+    return result
+
+
+_matcher = PropertyMatcher()
+
+
+def match_properties(
+    sources: Iterable[str], targets: Iterable[str], threshold: int = MATCH_THRESHOLD, key: Optional[str] = None
+) -> Dict[str, str]:
+    """Map source columns to database properties with the process-wide, cached matcher."""
+    return _matcher.match(sources, targets, threshold=threshold, key=key)
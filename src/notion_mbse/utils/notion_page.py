@@ -15,6 +15,7 @@ __version__ = "0.1.0"
 
 import os
 from pathlib import Path
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -26,11 +27,17 @@ from notion_objects import Page
 # import matplotlib.pyplot as plt
 # G = nx.DiGraph()
 from .notion_base import BaseNotionPage
+from .notion_bulk import ArchiveResult
+from .notion_bulk import BulkArchiver
+from .notion_cache import BaseCache
 from .notion_client_extend import NotionClient
+from .notion_crawler import CrawlEntry
+from .notion_crawler import WorkspaceCrawler
 from .notion_database import NotionDatabase
 from .notion_utils import find_title_prop
 from .notion_utils import get_title_content
 from .notion_utils import logger
+from .notion_utils import normalize_id
 from .notion_utils import slugify
 
 NOTION_API_KEY = os.getenv("NOTION_API_KEY", None)
@@ -44,6 +51,10 @@ class NotionPage(BaseNotionPage):
         parent: Optional["NotionPage"] = None,
         load: bool = False,
         recursive: bool = False,
+        cache: Optional[BaseCache] = None,
+        client: Optional[NotionClient] = None,
+        title: Optional[str] = None,
+        base_url: Optional[str] = None,
     ):
         if NOTION_API_KEY:
             token = NOTION_API_KEY
@@ -51,22 +62,20 @@ class NotionPage(BaseNotionPage):
             raise ValueError("No token provided.")
 
         self.token = token
-        self.n_client = NotionClient(token)
+        self.n_client = client if client else NotionClient(token, cache=cache, base_url=base_url)
 
         self.page_id = page_id
         self.parent = parent
-        self.title = None
+        self._title = title
 
         self.blocks: List[dict] = []
         self.children: List[Union[NotionPage, NotionDatabase]] = []
         self.child_pages: List[NotionPage] = []
         self.child_databases: List[NotionDatabase] = []
 
-        self.page_results: dict = {}
-        self.page = None
-        self.parent = None
-
-        self.get_page()
+        # Metadata is fetched on first access of page, page_results or an unknown title.
+        self._page_results: dict = {}
+        self._page: Optional[Page] = None
 
         if load:
             self.get_blocks()
@@ -77,13 +86,37 @@ class NotionPage(BaseNotionPage):
         self.local_dir = Path.cwd()
         self.file_path = None
 
-        if self.title:
-            self.basename = slugify(self.title)
-
     @property
     def name(self):
         return self.title
 
+    @property
+    def title(self) -> Optional[str]:
+        """Page title, taken from the parent's ``child_page`` block when known, otherwise fetched."""
+        if self._title is None and self.page_id is not None:
+            self.get_page()
+        return self._title
+
+    @title.setter
+    def title(self, title: Optional[str]):
+        self._title = title
+
+    @property
+    def basename(self) -> Optional[str]:
+        return slugify(self.title) if self.title else None
+
+    @property
+    def page(self) -> Optional[Page]:
+        if self._page is None and self.page_id is not None:
+            self.get_page()
+        return self._page
+
+    @property
+    def page_results(self) -> dict:
+        if self._page is None and self.page_id is not None:
+            self.get_page()
+        return self._page_results
+
     def set_local_dir(self, local_dir: Union[str, Path]):
         """Set the local directory for saving files.
 
@@ -153,18 +186,18 @@ class NotionPage(BaseNotionPage):
         """Get a page."""
         if self.page_id is None:
             raise ValueError("Page ID is not provided.")
-        if force or not self.page:
-            self.page_results = self.n_client.client.pages.retrieve(page_id=self.page_id)
-            self.page = Page(self.page_results)
+        if force or not self._page:
+            self._page_results = self.n_client.client.pages.retrieve(page_id=self.page_id)
+            self._page = Page(self._page_results)
 
-            if self.page_results["parent"]["type"] != "database_id":
+            if self._page_results["parent"]["type"] != "database_id":
                 title_prop = "title"
             else:
-                title_prop = find_title_prop(self.page_results["properties"])
+                title_prop = find_title_prop(self._page_results["properties"])
             # get_title_content
-            self.title = get_title_content(self.page_results["properties"][title_prop])
+            self._title = get_title_content(self._page_results["properties"][title_prop])
 
-        return self.page, self.page_results
+        return self._page, self._page_results
 
     def get_blocks(self, force: bool = False) -> List[dict]:
         """Get all blocks in a page.
@@ -176,17 +209,21 @@ class NotionPage(BaseNotionPage):
             List[dict]: List of Blocks
         """
         if force or not self.blocks:
-            self.blocks = self.n_client.get_blocks(self.page_id)
+            self.blocks = self.n_client.get_blocks(self.page_id, last_edited_time=self._page_results.get("last_edited_time"))
         return self.blocks
 
-    def set_blocks(self, blocks: List[dict], clear: bool = False):
+    def set_blocks(self, blocks: List[dict], clear: bool = False) -> List[dict]:
         """Set all blocks in a page.
 
+        Any number of blocks and any depth of nesting is accepted; the upload is chunked to
+        the API limits by ``NotionClient.append_blocks``.
+
         Args:
             blocks (List[dict]): List of Blocks
             clear (bool, optional): Clear Existing Blocks. Defaults to False.
 
-
+        Returns:
+            List[dict]: The created top-level blocks
         """
         if clear:
             self.clear_blocks()
@@ -199,14 +236,40 @@ class NotionPage(BaseNotionPage):
         if not isinstance(blocks[0], dict):
             raise ValueError("Blocks must be a list of dictionaries.")
 
-        self.n_client.client.blocks.children.append(block_id=self.page_id, children=blocks)
+        created = self.n_client.append_blocks(self.page_id, blocks)
+        self.blocks = []
+        return created
+
+    def update_blocks(self, blocks: List[dict], archive_child_pages: bool = False) -> Dict[str, int]:
+        """Make the page content match ``blocks``, touching only what changed.
+
+        Unlike ``set_blocks(blocks, clear=True)``, which deletes and re-creates every block,
+        the current blocks are diffed against ``blocks`` by ``NotionClient.sync_blocks`` so
+        editing a few paragraphs of a long page costs a few requests.
+
+        Args:
+            blocks (List[dict]): Desired blocks
+            archive_child_pages (bool, optional): Archive subpages and databases missing from ``blocks``. Defaults to False.
+
+        Returns:
+            Dict[str, int]: Number of unchanged, updated, deleted, appended and preserved blocks
+        """
+        if not isinstance(blocks, list):
+            raise ValueError("Blocks must be a list.")
+        counts = self.n_client.sync_blocks(self.page_id, blocks, existing=self.get_blocks(), archive_child_pages=archive_child_pages)
+        self.blocks = []
+        return counts
 
-    def clear_blocks(self):
-        """Clear all blocks in a page."""
+    def clear_blocks(self) -> List[ArchiveResult]:
+        """Clear all blocks in a page.
 
+        Returns:
+            List[ArchiveResult]: One result per top-level block
+        """
         blocks = self.get_blocks(force=True)
-        for block in blocks:
-            self.n_client.client.blocks.delete(block_id=block["id"])
+        results = BulkArchiver(self.n_client).archive(block["id"] for block in blocks)
+        self.blocks = []
+        return results
 
     def add_page(self, title: str) -> "NotionPage":
         """Add a page to the current page.
@@ -221,14 +284,14 @@ class NotionPage(BaseNotionPage):
             parent={"page_id": self.page_id},
             properties={"title": [{"text": {"content": title}}]},
         )
-        return NotionPage(token=self.n_client.token, page_id=page["id"], load=False)
+        return NotionPage(token=self.n_client.token, page_id=page["id"], parent=self, client=self.n_client, title=title)
 
     def add_database(self, title: str) -> NotionDatabase:
         """Add a database to the current page."""
         database = self.n_client.client.databases.create(
             parent={"page_id": self.page_id}, title=[{"text": {"content": title}}], properties={"Name": {"title": {}}}
         )
-        return NotionDatabase(token=self.n_client.token, database_id=database["id"])
+        return NotionDatabase(token=self.n_client.token, database_id=database["id"], client=self.n_client)
 
     def get_children(self, force: bool = False, recursive: bool = False) -> List[Union["NotionPage", NotionDatabase]]:
         """Get children of a page."""
@@ -237,13 +300,39 @@ class NotionPage(BaseNotionPage):
                 blocks = self.get_blocks()
                 for block in blocks:
                     if block["type"] == "child_page":
-                        self.children.append(NotionPage(token=self.n_client.token, page_id=block["id"], load=False, recursive=recursive))
+                        self.children.append(
+                            NotionPage(
+                                token=self.n_client.token,
+                                page_id=block["id"],
+                                parent=self,
+                                recursive=recursive,
+                                client=self.n_client,
+                                title=block["child_page"]["title"],
+                            )
+                        )
                     elif block["type"] == "child_database":
-                        self.children.append(NotionDatabase(token=self.n_client.token, database_id=block["id"]))
+                        self.children.append(NotionDatabase(token=self.n_client.token, database_id=block["id"], client=self.n_client))
             except Exception as e:
                 logger.error(f"Error: {e}")
         return self.children
 
+    def crawl(self, max_depth: Optional[int] = None, max_workers: Optional[int] = None) -> List[CrawlEntry]:
+        """Crawl the page tree below this page concurrently.
+
+        Unlike ``get_children(recursive=True)``, no NotionPage objects are built; the result is
+        a flat manifest of every page and database found.
+
+        Args:
+            max_depth (Optional[int], optional): Deepest level to list. Defaults to None.
+            max_workers (Optional[int], optional): Requests in flight. Defaults to the client's max_workers.
+
+        Returns:
+            List[CrawlEntry]: This page first, then every descendant page and database
+        """
+        if self.page_id is None:
+            raise ValueError("Page ID is not provided.")
+        return WorkspaceCrawler(self.n_client, max_workers=max_workers, max_depth=max_depth).crawl(self.page_id)
+
     def get_child_pages(self, force: bool = False) -> List["NotionPage"]:
         """Get Child Pages.
 
@@ -259,7 +348,15 @@ class NotionPage(BaseNotionPage):
                 blocks = self.get_blocks()
                 for block in blocks:
                     if block["type"] == "child_page":
-                        self.child_pages.append(NotionPage(token=self.n_client.token, page_id=block["id"], load=False))
+                        self.child_pages.append(
+                            NotionPage(
+                                token=self.n_client.token,
+                                page_id=block["id"],
+                                parent=self,
+                                client=self.n_client,
+                                title=block["child_page"]["title"],
+                            )
+                        )
             except Exception as e:
                 logger.error(f"Error: {e}")
         return self.child_pages
@@ -277,14 +374,25 @@ class NotionPage(BaseNotionPage):
             blocks = self.get_blocks()
             for block in blocks:
                 if block["type"] == "child_database":
-                    self.child_databases.append(NotionDatabase(token=self.n_client.token, database_id=block["id"]))
+                    self.child_databases.append(NotionDatabase(token=self.n_client.token, database_id=block["id"], client=self.n_client))
         return self.child_databases
 
-    def delete_child_pages(self):
-        """Delete Child Pages."""
-        for page in self.child_pages:
-            self.n_client.client.blocks.delete(block_id=page.page_id)
-            self.child_pages.remove(page)
+    def delete_child_pages(self) -> List[ArchiveResult]:
+        """Delete Child Pages.
+
+        Pages that could not be deleted stay in ``child_pages``.
+
+        Returns:
+            List[ArchiveResult]: One result per child page
+        """
+        results = BulkArchiver(self.n_client).archive(page.page_id for page in self.get_child_pages())
+        archived = {result.id for result in results if result.ok}
+        self.child_pages = [page for page in self.child_pages if normalize_id(page.page_id) not in archived]
+        self.children = [
+            child for child in self.children if not isinstance(child, NotionPage) or normalize_id(child.page_id) not in archived
+        ]
+        self.blocks = []
+        return results
 
     def delete_page(self):
         """Delete Page."""
@@ -294,7 +402,7 @@ class NotionPage(BaseNotionPage):
             raise ValueError("No page ID provided.")
 
     def __repr__(self):
-        return f"NotionPage(title={self.title}, page_id={self.page_id})"
+        return f"NotionPage(title={self._title}, page_id={self.page_id})"
 
     def info(self):
         return {
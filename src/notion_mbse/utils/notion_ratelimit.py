@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+"""
+@package   notion_ratelimit
+Details:   Token-bucket throttling and 429-aware retries for Notion API calls.
+Created:   Sunday, October 18th 2026, 9:12:40 am
+-----
+Last Modified: 10/18/2026 09:12:40
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_ratelimit.py"
+__version__ = "0.1.0"
+
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from notion_client import AsyncClient
+from notion_client import Client
+from notion_client.errors import HTTPResponseError
+from notion_client.errors import RequestTimeoutError
+
+from .notion_utils import logger
+
+# Notion allows an average of three requests per second per integration token.
+NOTION_RATE_LIMIT = 3.0
+NOTION_BURST = 3.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Read-only endpoints that use POST.
+POST_QUERIES = re.compile(r"search|databases/[^/]+/query")
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. ``reserve`` never
+    blocks; it books a token and returns how long the caller has to wait for it, so the
+    same bucket paces threads (``acquire``) and coroutines (``acquire_async``).
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens held, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float = NOTION_RATE_LIMIT, capacity: float = NOTION_BURST):
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Book ``tokens`` and return the delay in seconds before they may be spent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until ``tokens`` are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        """Wait without blocking the event loop until ``tokens`` are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, delay: float):
+        """Hold every caller of this bucket back for ``delay`` seconds (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+
+_buckets: Dict[Tuple[str, float, float], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(token: str, rate: float = NOTION_RATE_LIMIT, capacity: float = NOTION_BURST) -> TokenBucket:
+    """Get the process-wide bucket for an integration token.
+
+    Every client built for the same token shares one bucket, so parallel exports stay
+    within that token's limit.
+
+    Args:
+        token (str): Integration token
+        rate (float, optional): Requests per second. Defaults to NOTION_RATE_LIMIT.
+        capacity (float, optional): Allowed burst. Defaults to NOTION_BURST.
+
+    Returns:
+        TokenBucket: Shared bucket
+    """
+    key = (token, rate, capacity)
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = TokenBucket(rate=rate, capacity=capacity)
+        return _buckets[key]
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for rate limited and failed requests.
+
+    Attributes:
+        max_retries (int): Retries before the error is raised.
+        base_delay (float): Backoff for the first retry, in seconds.
+        max_delay (float): Upper bound on a single backoff, in seconds.
+        statuses (Tuple[int, ...]): HTTP statuses worth retrying.
+    """
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    statuses: Tuple[int, ...] = RETRY_STATUSES
+
+    def delay(self, error: Exception, attempt: int, idempotent: bool = True) -> Optional[float]:
+        """Get the delay before the next attempt, or None if the error should be raised.
+
+        A ``Retry-After`` header takes precedence over the computed backoff. A request that
+        is not idempotent is only retried after a 429, which Notion never processed; after a
+        5xx or a timeout it may have been applied, and repeating it could duplicate it.
+
+        Args:
+            error (Exception): Error raised by the request
+            attempt (int): Number of retries already made
+            idempotent (bool, optional): Whether the request can safely be repeated, see ``is_idempotent``. Defaults to True.
+
+        Returns:
+            Optional[float]: Seconds to wait
+        """
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, HTTPResponseError):
+            if error.status not in self.statuses or (not idempotent and error.status != 429):
+                return None
+            retry_after = retry_after_seconds(error)
+            if retry_after is not None:
+                return retry_after
+        elif not isinstance(error, RequestTimeoutError) or not idempotent:
+            return None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # noqa: S311
+
+
+def is_idempotent(method: str, path: str) -> bool:
+    """Whether repeating a request cannot duplicate its effect: GET, DELETE and the POST queries and search."""
+    method = method.upper()
+    return method in ("GET", "DELETE") or (method == "POST" and POST_QUERIES.fullmatch(path.strip("/")) is not None)
+
+
+def retry_after_seconds(error: HTTPResponseError) -> Optional[float]:
+    """Read the ``Retry-After`` header of an error response, in seconds."""
+    value = error.headers.get("retry-after") if error.headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ThrottledClient(Client):
+    """Notion client that paces every request through a shared token bucket.
+
+    Rate limited (429) and server error (5xx) responses are retried with jittered
+    exponential backoff; requests that are not idempotent, such as page creation, are only
+    retried after a 429. A 429 holds back every client sharing the bucket.
+
+    Attributes:
+        bucket (TokenBucket): Bucket for the client's integration token.
+        retry (RetryPolicy): Retry policy.
+    """
+
+    def __init__(
+        self,
+        options: Optional[Any] = None,
+        client: Optional[Any] = None,
+        bucket: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(options=options, client=client, **kwargs)
+        self.bucket = bucket if bucket else get_bucket(self.options.auth or "")
+        self.retry = retry if retry else RetryPolicy()
+
+    def without_retries(self) -> "ThrottledClient":
+        """Get a client on the same connection pool and bucket that raises instead of retrying.
+
+        For callers that run their own retry loop, so retries do not multiply and every
+        request is counted by the caller.
+        """
+        return type(self)(options=self.options, client=self.client, bucket=self.bucket, retry=RetryPolicy(max_retries=0))
+
+    def request(
+        self,
+        path: str,
+        method: str,
+        query: Optional[Dict[Any, Any]] = None,
+        body: Optional[Dict[Any, Any]] = None,
+        form_data: Optional[Dict[Any, Any]] = None,
+        auth: Optional[str] = None,
+    ) -> Any:
+        bucket = get_bucket(auth, self.bucket.rate, self.bucket.capacity) if auth else self.bucket
+        idempotent = is_idempotent(method, path)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                return super().request(path, method, query=query, body=body, form_data=form_data, auth=auth)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                delay = self.retry.delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.warning(f"{method} {path} failed ({e}), retry {attempt}/{self.retry.max_retries} in {delay:.2f}s")
+                if isinstance(e, HTTPResponseError) and e.status == 429:
+                    bucket.penalize(delay)
+                else:
+                    time.sleep(delay)
+
+
+class AsyncThrottledClient(AsyncClient):
+    """Asynchronous counterpart of ThrottledClient.
+
+    Shares the per-token buckets with ThrottledClient, so sync and async clients for the
+    same token are paced together.
+
+    Attributes:
+        bucket (TokenBucket): Bucket for the client's integration token.
+        retry (RetryPolicy): Retry policy.
+    """
+
+    def __init__(
+        self,
+        options: Optional[Any] = None,
+        client: Optional[Any] = None,
+        bucket: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(options=options, client=client, **kwargs)
+        self.bucket = bucket if bucket else get_bucket(self.options.auth or "")
+        self.retry = retry if retry else RetryPolicy()
+
+    async def request(
+        self,
+        path: str,
+        method: str,
+        query: Optional[Dict[Any, Any]] = None,
+        body: Optional[Dict[Any, Any]] = None,
+        form_data: Optional[Dict[Any, Any]] = None,
+        auth: Optional[str] = None,
+    ) -> Any:
+        bucket = get_bucket(auth, self.bucket.rate, self.bucket.capacity) if auth else self.bucket
+        idempotent = is_idempotent(method, path)
+        attempt = 0
+        while True:
+            await bucket.acquire_async()
+            try:
+                return await super().request(path, method, query=query, body=body, form_data=form_data, auth=auth)
+            except (HTTPResponseError, RequestTimeoutError) as e:
+                delay = self.retry.delay(e, attempt, idempotent)
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.warning(f"{method} {path} failed ({e}), retry {attempt}/{self.retry.max_retries} in {delay:.2f}s")
+                if isinstance(e, HTTPResponseError) and e.status == 429:
+                    bucket.penalize(delay)
+                else:
+                    await asyncio.sleep(delay)
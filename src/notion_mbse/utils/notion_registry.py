@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+@package   notion_registry
+Details:   Process-wide Notion clients per token on shared, tunable HTTP connection pools.
+Created:   Sunday, October 18th 2026, 4:10:37 pm
+-----
+Last Modified: 10/18/2026 16:10:37
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_registry.py"
+__version__ = "0.1.0"
+
+import importlib.util
+import os
+import threading
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import httpx
+
+from .notion_ratelimit import ThrottledClient
+from .notion_utils import logger
+
+
+@dataclass
+class PoolOptions:
+    """Connection pool settings for the HTTP clients behind Notion clients.
+
+    Attributes:
+        max_connections (int): Upper bound on open connections per pool.
+        max_keepalive_connections (int): Idle connections kept open for reuse.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        http2 (bool): Negotiate HTTP/2, which needs the ``h2`` package (``httpx[http2]``).
+    """
+
+    max_connections: int = 32
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def use_http2(self) -> bool:
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, falling back to HTTP/1.1")
+            return False
+        return self.http2
+
+    def http_client(self) -> httpx.Client:
+        """Build an ``httpx.Client`` with these settings."""
+        return httpx.Client(limits=self.limits(), http2=self.use_http2())
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Build an ``httpx.AsyncClient`` with these settings."""
+        return httpx.AsyncClient(limits=self.limits(), http2=self.use_http2())
+
+
+# API root for clients built without an explicit base URL, e.g. a local fake server; None for Notion's.
+NOTION_BASE_URL = os.getenv("NOTION_BASE_URL", None)
+
+_options = PoolOptions()
+_clients: Dict[Tuple[str, Optional[str]], ThrottledClient] = {}
+_clients_lock = threading.Lock()
+
+
+def configure_pool(**kwargs: Any) -> PoolOptions:
+    """Change the pool settings used by clients created from now on.
+
+    Args:
+        **kwargs: PoolOptions fields, e.g. ``max_connections=64, http2=True``
+
+    Returns:
+        PoolOptions: The current settings
+    """
+    names = {field.name for field in fields(PoolOptions)}
+    for name, value in kwargs.items():
+        if name not in names:
+            raise ValueError(f"Unknown pool option '{name}', expected one of {sorted(names)}.")
+        setattr(_options, name, value)
+    return _options
+
+
+def pool_options() -> PoolOptions:
+    return _options
+
+
+def client_options(base_url: Optional[str] = None) -> Dict[str, Any]:
+    """Keyword arguments selecting the API root of a notion_client client.
+
+    Args:
+        base_url (Optional[str], optional): API root, e.g. ``http://127.0.0.1:8000``. Defaults to ``NOTION_BASE_URL``.
+
+    Returns:
+        Dict[str, Any]: ``{"base_url": ...}``, or nothing for Notion's own API
+    """
+    base_url = base_url if base_url else NOTION_BASE_URL
+    return {"base_url": base_url.rstrip("/")} if base_url else {}
+
+
+def get_client(token: str, base_url: Optional[str] = None) -> ThrottledClient:
+    """Get the process-wide client for an integration token.
+
+    Every NotionClient, NotionPage and NotionDatabase built for the same token shares this
+    client, and with it one keep-alive connection pool, so a page tree crawl pays for one
+    TLS handshake per connection instead of one per object.
+
+    Args:
+        token (str): Integration token
+        base_url (Optional[str], optional): API root, see ``client_options``. Defaults to None.
+
+    Returns:
+        ThrottledClient: Shared client
+    """
+    options = client_options(base_url)
+    key = (token, options.get("base_url"))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = ThrottledClient(auth=token, client=_options.http_client(), **options)
+        return _clients[key]
+
+
+def close_clients():
+    """Close every registered client and its connection pool."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
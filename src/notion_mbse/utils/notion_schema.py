@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""
+@package   notion_schema
+Details:   Typed, cached view of a Notion database schema.
+Created:   Sunday, October 18th 2026, 9:14:50 pm
+-----
+Last Modified: 10/18/2026 21:14:50
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_schema.py"
+__version__ = "0.1.0"
+
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from notion_objects import NotionObject
+from notion_objects.properties import Property
+
+from .notion_matcher import schema_hash
+
+# Property types whose values are computed by Notion and cannot be written.
+READ_ONLY_TYPES = (
+    "formula",
+    "rollup",
+    "created_time",
+    "created_by",
+    "last_edited_time",
+    "last_edited_by",
+    "unique_id",
+    "verification",
+    "button",
+)
+# Seconds a schema is trusted before it is retrieved again.
+SCHEMA_TTL = 300.0
+
+
+@dataclass(frozen=True)
+class PropertyDescriptor:
+    """One database property.
+
+    Attributes:
+        id (str): Property ID, stable across renames.
+        name (str): Property name.
+        type (str): Notion property type, e.g. "title", "select" or "relation".
+        config (Dict[str, Any]): Type specific configuration, e.g. the options of a select.
+    """
+
+    id: str
+    name: str
+    type: str
+    config: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_property(cls, name: str, prop: Dict[str, Any]) -> "PropertyDescriptor":
+        return cls(id=prop.get("id", name), name=prop.get("name", name), type=prop["type"], config=prop.get(prop["type"]) or {})
+
+    @property
+    def writable(self) -> bool:
+        return self.type not in READ_ONLY_TYPES
+
+    @property
+    def options(self) -> List[str]:
+        """Option names of a select, multi_select or status property."""
+        return [option["name"] for option in self.config.get("options", [])]
+
+
+@dataclass
+class DatabaseSchema:
+    """Properties of a database as of one ``databases.retrieve``.
+
+    Attributes:
+        database_id (str): Database ID.
+        properties (Dict[str, PropertyDescriptor]): Properties by name.
+        raw (Dict[str, Any]): The ``properties`` payload they were built from.
+        last_edited_time (Optional[str]): Last edit of the database when it was retrieved.
+        fetched_at (float): ``time.monotonic()`` of the retrieval.
+    """
+
+    database_id: str
+    properties: Dict[str, PropertyDescriptor]
+    raw: Dict[str, Any]
+    last_edited_time: Optional[str] = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_database(cls, database: Dict[str, Any]) -> "DatabaseSchema":
+        """Build the schema from a database payload, as returned by retrieve or update."""
+        raw = database["properties"]
+        properties = {name: PropertyDescriptor.from_property(name, prop) for name, prop in raw.items()}
+        return cls(database["id"], properties, raw, database.get("last_edited_time"))
+
+    def expired(self, ttl: Optional[float]) -> bool:
+        """Whether the schema is older than ``ttl`` seconds; a None TTL never expires."""
+        return ttl is not None and time.monotonic() - self.fetched_at > ttl
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the property names, e.g. to cache results that depend on them."""
+        return schema_hash(self.properties)
+
+    @property
+    def title_property(self) -> Optional[str]:
+        return next((name for name, prop in self.properties.items() if prop.type == "title"), None)
+
+    def names(self) -> List[str]:
+        return list(self.properties)
+
+    def of_type(self, prop_type: str) -> List[PropertyDescriptor]:
+        return [prop for prop in self.properties.values() if prop.type == prop_type]
+
+    def by_id(self, prop_id: str) -> Optional[PropertyDescriptor]:
+        return next((prop for prop in self.properties.values() if prop.id == prop_id), None)
+
+    def __getitem__(self, name: str) -> PropertyDescriptor:
+        return self.properties[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.properties
+
+    def __iter__(self) -> Iterator[PropertyDescriptor]:
+        return iter(self.properties.values())
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+
+def target_properties(target: Union[Type[NotionObject], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Normalize a target schema to property configurations by name.
+
+    Args:
+        target (Union[Type[NotionObject], Dict[str, Any]]): One of
+            - a notion_objects class, e.g. from ``create_db_page_from_schema``,
+            - a Pydantic-style JSON schema, converted with ``create_db_page_from_schema``,
+            - a mapping of property name to Notion type, or to a full property configuration.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: ``{"type": ..., <type>: {...}}`` by property name
+    """
+    if isinstance(target, dict) and target.get("type") == "object" and "properties" in target:
+        from ..models.notion import create_db_page_from_schema  # noqa: PLC0415 - models import optional dependencies
+
+        target = create_db_page_from_schema(target)
+    if isinstance(target, dict):
+        properties = {}
+        for name, value in target.items():
+            prop = {"type": value} if isinstance(value, str) else dict(value)
+            prop.setdefault(prop["type"], {})
+            properties[name] = prop
+        return properties
+    properties = {}
+    for prop in getattr(target, "__properties__", []):
+        if isinstance(prop, Property) and prop.type is not None:
+            properties[prop.field] = {"type": prop.type, prop.type: {}}
+    if not properties:
+        raise ValueError(f"Target schema {target!r} has no properties.")
+    return properties
+
+
+@dataclass
+class SchemaMigration:
+    """Difference between a database schema and a target schema, applied as one ``databases.update``.
+
+    Attributes:
+        database_id (str): Database ID.
+        add (Dict[str, Dict[str, Any]]): Configuration of each property to create, by name.
+        rename (Dict[str, str]): New name of each property to rename, by current name.
+        remove (List[str]): Properties to delete.
+        conflicts (Dict[str, Tuple[str, str]]): Current and target type of properties whose type differs; never applied.
+        applied (bool): Whether the migration was sent.
+    """
+
+    database_id: str
+    add: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    rename: Dict[str, str] = field(default_factory=dict)
+    remove: List[str] = field(default_factory=list)
+    conflicts: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    applied: bool = False
+
+    @classmethod
+    def diff(
+        cls,
+        schema: DatabaseSchema,
+        target: Union[Type[NotionObject], Dict[str, Any]],
+        renames: Optional[Dict[str, str]] = None,
+        remove: bool = False,
+    ) -> "SchemaMigration":
+        """Plan the changes that turn ``schema`` into ``target``.
+
+        A title property with a new name renames the current title, since a database has
+        exactly one. Other renames have to be given, as a removal and an addition cannot be
+        told apart from a rename.
+
+        Args:
+            schema (DatabaseSchema): Current schema
+            target (Union[Type[NotionObject], Dict[str, Any]]): Target schema, see ``target_properties``
+            renames (Optional[Dict[str, str]], optional): New name by current name. Defaults to None.
+            remove (bool, optional): Delete properties missing from the target. Defaults to False.
+
+        Returns:
+            SchemaMigration: The plan, not applied yet
+        """
+        wanted = target_properties(target)
+        migration = cls(schema.database_id)
+        renames = dict(renames or {})
+        title = next((name for name, prop in wanted.items() if prop["type"] == "title"), None)
+        if title is not None and title not in schema and schema.title_property and schema.title_property not in wanted:
+            renames.setdefault(schema.title_property, title)
+        for old, new in renames.items():
+            if old not in schema:
+                raise ValueError(f"Property '{old}' not found in database properties.")
+            if new in schema and new != old:
+                raise ValueError(f"Cannot rename '{old}' to '{new}', the property already exists.")
+            if new != old:
+                migration.rename[old] = new
+
+        current = {migration.rename.get(name, name): prop for name, prop in schema.properties.items()}
+        for name, prop in wanted.items():
+            if name not in current:
+                migration.add[name] = prop
+            elif current[name].type != prop["type"]:
+                migration.conflicts[name] = (current[name].type, prop["type"])
+        if remove:
+            migration.remove = [
+                name
+                for name, prop in schema.properties.items()
+                if name not in migration.rename and name not in wanted and prop.type != "title"
+            ]
+        return migration
+
+    @property
+    def empty(self) -> bool:
+        return not (self.add or self.rename or self.remove)
+
+    def payload(self) -> Dict[str, Any]:
+        """The ``properties`` argument of ``databases.update`` for the whole migration."""
+        properties: Dict[str, Any] = {name: {"name": new} for name, new in self.rename.items()}
+        properties.update(dict.fromkeys(self.remove))
+        properties.update(self.add)
+        return properties
+
+    def __str__(self):
+        lines = [f"Schema migration for {self.database_id}{'' if self.applied else ' (not applied)'}:"]
+        lines += [f"  + {name} ({prop['type']})" for name, prop in self.add.items()]
+        lines += [f"  ~ {old} -> {new}" for old, new in self.rename.items()]
+        lines += [f"  - {name}" for name in self.remove]
+        lines += [f"  ! {name}: {old} != {new}, not changed" for name, (old, new) in self.conflicts.items()]
+        return "\n".join(lines if len(lines) > 1 else [*lines, "  no changes"])
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+@package   notion_snapshot
+Details:   Compressed JSON Lines snapshots with an id index for random access.
+Created:   Sunday, October 18th 2026, 3:05:48 pm
+-----
+Last Modified: 10/18/2026 15:05:48
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_snapshot.py"
+__version__ = "0.1.0"
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+from .notion_stream import dumps
+from .notion_stream import loads
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, gzip is always available
+    zstandard = None
+
+CODECS = {".gz": "gzip", ".zst": "zstd"}
+INDEX_SUFFIX = ".idx"
+
+
+def is_snapshot(path: Union[str, Path]) -> bool:
+    return Path(path).suffix in CODECS
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def get_codec(path: Union[str, Path]) -> str:
+    """Get the codec of a snapshot from its suffix, ``.gz`` (gzip) or ``.zst`` (zstd)."""
+    suffix = Path(path).suffix
+    if suffix not in CODECS:
+        raise ValueError(f"Unknown snapshot suffix '{suffix}', expected one of {tuple(CODECS)}.")
+    if CODECS[suffix] == "zstd" and zstandard is None:
+        raise ImportError("zstandard is required for .zst snapshots, install it or use .gz")
+    return CODECS[suffix]
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, mtime=0)
+
+
+def decompress(frame: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+class SnapshotWriter:
+    """Write keyed JSON values to a compressed JSON Lines snapshot.
+
+    Every value is compressed on its own, as one gzip member or zstd frame, and appended to
+    the file. Concatenated members are still a valid ``.jsonl.gz``/``.jsonl.zst`` stream, and
+    the ``<path>.idx`` index written on ``close`` maps each key to the offset and length of
+    its frame, so a single value can be read back without decompressing the rest.
+
+    ``encode`` does no I/O, so frames can be built in worker threads and written in order.
+
+    Attributes:
+        path (Path): Snapshot file.
+        codec (str): "gzip" or "zstd".
+        entries (Dict[str, List[int]]): Offset and length of each frame, by key.
+
+    Example Usage:
+    --------------
+    ```python
+    with SnapshotWriter("snapshot.jsonl.gz", default=transformer.reverse) as writer:
+        writer.write(page_id, {"id": page_id, "children": blocks})
+    ```
+    """
+
+    def __init__(self, path: Union[str, Path], default: Optional[Callable[[Any], Any]] = None, overwrite: bool = False):
+        self.path = Path(path)
+        self.codec = get_codec(self.path)
+        if self.path.exists() and not overwrite:
+            raise FileExistsError(f"File already exists: {self.path}")
+        self.default = default
+        self.entries: Dict[str, List[int]] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = Path.open(self.path, "wb")
+        self._offset = 0
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize and compress one value into a frame."""
+        return compress(dumps(value, self.default) + b"\n", self.codec)
+
+    def write(self, key: str, value: Any):
+        self.write_frame(key, self.encode(value))
+
+    def write_frame(self, key: str, frame: bytes):
+        """Append an already compressed frame, e.g. one copied from a previous snapshot."""
+        self._file.write(frame)
+        self.entries[key] = [self._offset, len(frame)]
+        self._offset += len(frame)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        with Path.open(index_path(self.path), "w") as f:
+            json.dump({"codec": self.codec, "entries": self.entries}, f)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Snapshot:
+    """Read a snapshot written by SnapshotWriter.
+
+    Attributes:
+        path (Path): Snapshot file.
+        codec (str): "gzip" or "zstd".
+        entries (Dict[str, List[int]]): Offset and length of each frame, by key.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with Path.open(index_path(self.path)) as f:
+            index = json.load(f)
+        self.codec = index["codec"]
+        self.entries: Dict[str, List[int]] = index["entries"]
+        self._file = Path.open(self.path, "rb")
+
+    def frame(self, key: str) -> Optional[bytes]:
+        """Get the compressed frame of a key, or None if it is not in the snapshot."""
+        if key not in self.entries:
+            return None
+        offset, length = self.entries[key]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the value of a key, decompressing only its frame."""
+        frame = self.frame(key)
+        return loads(decompress(frame, self.codec)) if frame is not None else None
+
+    def keys(self) -> List[str]:
+        return list(self.entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in sorted(self.entries, key=lambda key: self.entries[key][0]):
+            yield self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
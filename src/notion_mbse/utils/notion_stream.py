@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+@package   notion_stream
+Details:   Streaming JSON / JSON Lines writer and reader for large downloads.
+Created:   Sunday, October 18th 2026, 1:40:22 pm
+-----
+Last Modified: 10/18/2026 13:40:22
+Modified By: Mathew Cosgrove
+-----
+"""
+
+__author__ = "Mathew Cosgrove"
+__file__ = "notion_stream.py"
+__version__ = "0.1.0"
+
+import json
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library is the fallback
+    orjson = None
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes, with orjson when it is installed.
+
+    Datetimes are always handed to ``default`` so both serializers produce the same text.
+
+    Args:
+        obj (Any): Value to serialize
+        default (Optional[Callable[[Any], Any]], optional): Encoder for unsupported types. Defaults to None.
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def is_json_lines(path: Union[str, Path]) -> bool:
+    return Path(path).suffix in JSON_LINES_SUFFIXES
+
+
+class JsonStreamWriter:
+    """Write JSON values to a file one at a time.
+
+    The file is JSON Lines when its suffix is ``.jsonl`` or ``.ndjson``, otherwise a JSON
+    array that is opened on the first write and closed on ``close``. Only one value is
+    held in memory at a time.
+
+    Attributes:
+        path (Path): Output file.
+        lines (bool): Whether the output is JSON Lines.
+        count (int): Number of values written so far.
+
+    Example Usage:
+    --------------
+    ```python
+    with JsonStreamWriter("pages.jsonl", default=transformer.reverse) as writer:
+        for page in client.iter_database(database_id):
+            writer.write(page)
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        default: Optional[Callable[[Any], Any]] = None,
+        lines: Optional[bool] = None,
+        overwrite: bool = False,
+    ):
+        self.path = Path(path)
+        if self.path.exists() and not overwrite:
+            raise FileExistsError(f"File already exists: {self.path}")
+        self.lines = is_json_lines(self.path) if lines is None else lines
+        self.default = default
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = Path.open(self.path, "wb")
+        if not self.lines:
+            self._file.write(b"[")
+
+    def write(self, obj: Any):
+        data = dumps(obj, self.default)
+        if self.lines:
+            self._file.write(data + b"\n")
+        else:
+            self._file.write((b",\n" if self.count else b"\n") + data)
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        if not self.lines:
+            self._file.write(b"\n]\n")
+        self._file.close()
+
+    def __enter__(self) -> "JsonStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_json(path: Union[str, Path]) -> Iterator[Any]:
+    """Iterate over the values stored in a JSON Lines file or a JSON array file.
+
+    JSON Lines files are read one line at a time. A JSON array file has to be parsed whole
+    before its items are yielded.
+
+    Args:
+        path (Union[str, Path]): Input file
+
+    Yields:
+        Any: Each stored value
+    """
+    path = Path(path)
+    if is_json_lines(path):
+        with Path.open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+    else:
+        with Path.open(path, "rb") as f:
+            yield from loads(f.read())
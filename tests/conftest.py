@@ -0,0 +1,31 @@
+import pytest
+
+from fake_notion import AUTH
+from fake_notion import FakeNotion
+from notion_mbse.utils.notion_async_client import AsyncNotionClient
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_ratelimit import RetryPolicy
+from notion_mbse.utils.notion_ratelimit import ThrottledClient
+from notion_mbse.utils.notion_ratelimit import TokenBucket
+
+
+@pytest.fixture
+def fake():
+    return FakeNotion()
+
+
+@pytest.fixture
+def fake_client(fake):
+    return NotionClient(token=AUTH, client=fake.client())
+
+
+@pytest.fixture
+def throttled_client(fake):
+    """Client that paces and retries like production, with a bucket and backoff fast enough for tests."""
+    bucket = TokenBucket(rate=10000, capacity=10000)
+    return NotionClient(token=AUTH, client=fake.client(ThrottledClient, bucket=bucket, retry=RetryPolicy(base_delay=0.001)))
+
+
+@pytest.fixture
+def async_client(fake):
+    return AsyncNotionClient(token=AUTH, client=fake.async_client())
@@ -0,0 +1,613 @@
+"""
+Recorded-fixture fake of the Notion API.
+
+The payload shapes come from ``tests/test_data/notion_fixture.json``. The fake is mounted
+on an ``httpx.MockTransport`` so the real ``notion_client.Client`` is exercised end to end
+while every request is counted per endpoint. ``FakeNotionServer`` serves the same fake over
+HTTP on a local port, for clients built through their base URL and for benchmarks.
+"""
+
+import asyncio
+import copy
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+import httpx
+from notion_client import AsyncClient
+from notion_client import Client
+
+FIXTURE_PATH = Path(__file__).parent / "test_data" / "notion_fixture.json"
+
+with Path.open(FIXTURE_PATH) as f:
+    FIXTURE: Dict[str, Any] = json.load(f)
+
+RELATION_LIMIT = 25
+# Value of an unset property, by type.
+EMPTY = {"title": [], "rich_text": [], "multi_select": [], "relation": [], "people": [], "files": [], "checkbox": False}
+AUTH = "secret_fake"
+# block types the API rejects without children
+REQUIRED_CHILDREN = ("column_list", "column", "table")
+
+
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+TIME_OPERATORS = {
+    "equals": lambda a, b: a == b,
+    "before": lambda a, b: a < b,
+    "after": lambda a, b: a > b,
+    "on_or_before": lambda a, b: a <= b,
+    "on_or_after": lambda a, b: a >= b,
+}
+
+
+VALUE_OPERATORS = {
+    "equals": lambda a, b: a == b,
+    "does_not_equal": lambda a, b: a != b,
+    "contains": lambda a, b: a is not None and b in a,
+    "greater_than": lambda a, b: a is not None and a > b,
+    "less_than": lambda a, b: a is not None and a < b,
+}
+
+
+def property_value(page: dict, name: str) -> Any:
+    """Plain value of a title, rich_text, number, select or status property."""
+    prop = page["properties"][name]
+    value = prop.get(prop["type"])
+    if prop["type"] in ("title", "rich_text"):
+        return "".join(text["plain_text"] for text in value or [])
+    if prop["type"] in ("select", "status"):
+        return value["name"] if value else None
+    return value
+
+
+def matches(page: dict, query_filter: Optional[dict]) -> bool:
+    """Evaluate the compound, timestamp and simple property parts of a query filter."""
+    if not query_filter:
+        return True
+    if "and" in query_filter:
+        return all(matches(page, f) for f in query_filter["and"])
+    if "or" in query_filter:
+        return any(matches(page, f) for f in query_filter["or"])
+    timestamp = query_filter.get("timestamp")
+    if timestamp:
+        condition = query_filter[timestamp]
+        return all(TIME_OPERATORS[op](parse_time(page[timestamp]), parse_time(value)) for op, value in condition.items())
+    name = query_filter.get("property")
+    if name:
+        condition = next(value for key, value in query_filter.items() if key != "property")
+        return all(VALUE_OPERATORS[op](property_value(page, name), value) for op, value in condition.items())
+    return True
+
+
+def sort_key(page: dict, sort: dict) -> Any:
+    value = page[sort["timestamp"]] if "timestamp" in sort else property_value(page, sort["property"])
+    return (value is None, value)
+
+
+def title_of(item: dict) -> str:
+    if item["object"] == "database":
+        return "".join(text["plain_text"] for text in item["title"])
+    prop = next(prop for prop in item["properties"].values() if prop["type"] == "title")
+    return "".join(text["plain_text"] for text in prop["title"])
+
+
+def error_response(status: int, code: str, message: str) -> httpx.Response:
+    return httpx.Response(status, json={"object": "error", "status": status, "code": code, "message": message})
+
+
+class FakeNotion:
+    """In-memory Notion workspace seeded from the recorded fixture.
+
+    Attributes:
+        pages (Dict[str, dict]): Full page payloads by id.
+        databases (Dict[str, dict]): Database payloads by id.
+        rows (Dict[str, List[str]]): Page ids in each database, in query order.
+        children (Dict[str, List[str]]): Child block ids of each block or page.
+        blocks (Dict[str, dict]): Block payloads by id.
+        requests (Counter): Number of requests served per ``"METHOD route"``.
+        latency (float): Seconds to sleep before answering each request.
+        peak (int): Highest number of requests that were in flight at once.
+        failures (List[Tuple[Optional[str], httpx.Response]]): Canned error responses served before the next
+            requests, each for any endpoint (None) or for the named one.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.pages: Dict[str, dict] = {}
+        self.databases: Dict[str, dict] = {}
+        self.rows: Dict[str, List[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.blocks: Dict[str, dict] = {}
+        self.requests: Counter = Counter()
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.failures: List[Tuple[Optional[str], httpx.Response]] = []
+        self.lock = threading.Lock()
+
+    # Seeding
+
+    def add_database(self, title: str = "OMG Specs") -> str:
+        database = copy.deepcopy(FIXTURE["database"])
+        database["id"] = new_id()
+        database["title"][0]["text"]["content"] = title
+        database["title"][0]["plain_text"] = title
+        self.databases[database["id"]] = database
+        self.rows[database["id"]] = []
+        return database["id"]
+
+    def add_page(
+        self,
+        database_id: Optional[str] = None,
+        title: str = "Row",
+        relations: int = 0,
+        last_edited_time: Optional[str] = None,
+    ) -> str:
+        """Add a page, optionally as a database row with ``relations`` related pages."""
+        page = copy.deepcopy(FIXTURE["page"])
+        page["id"] = new_id()
+        page["properties"]["Name"]["title"][0]["text"]["content"] = title
+        page["properties"]["Name"]["title"][0]["plain_text"] = title
+        page["properties"]["Related"]["relation"] = [{"id": new_id()} for _ in range(relations)]
+        if last_edited_time:
+            page["last_edited_time"] = last_edited_time
+        if database_id:
+            page["parent"] = {"type": "database_id", "database_id": database_id}
+            self.rows[database_id].append(page["id"])
+        else:
+            page["parent"] = {"type": "workspace", "workspace": True}
+            page["properties"] = {"title": page["properties"]["Name"]}
+        self.pages[page["id"]] = page
+        self.children.setdefault(page["id"], [])
+        return page["id"]
+
+    def add_block(self, parent_id: str, text: str = "Paragraph", block_type: str = "paragraph") -> str:
+        block = copy.deepcopy(FIXTURE["block"])
+        block["id"] = new_id()
+        block["type"] = block_type
+        block[block_type] = block.pop("paragraph")
+        block[block_type]["rich_text"][0]["text"]["content"] = text
+        block[block_type]["rich_text"][0]["plain_text"] = text
+        parent_type = "page_id" if parent_id in self.pages else "block_id"
+        block["parent"] = {"type": parent_type, parent_type: parent_id}
+        if parent_id in self.blocks:
+            self.blocks[parent_id]["has_children"] = True
+        self.blocks[block["id"]] = block
+        self.children.setdefault(parent_id, []).append(block["id"])
+        return block["id"]
+
+    def add_child_page(self, parent_id: str, title: str = "Subpage") -> str:
+        """Add a page under ``parent_id`` along with its ``child_page`` block, which shares the page id."""
+        page_id = self.add_page(title=title)
+        self.pages[page_id]["parent"] = {"type": "page_id", "page_id": parent_id}
+        block = copy.deepcopy(FIXTURE["block"])
+        block["id"] = page_id
+        block["type"] = "child_page"
+        block["child_page"] = {"title": title}
+        del block["paragraph"]
+        block["parent"] = {"type": "page_id", "page_id": parent_id}
+        self.blocks[page_id] = block
+        if parent_id in self.blocks:
+            self.blocks[parent_id]["has_children"] = True
+        self.children.setdefault(parent_id, []).append(page_id)
+        return page_id
+
+    def add_child_database(self, parent_id: str, title: str = "Inline") -> str:
+        """Add a database under ``parent_id`` along with its ``child_database`` block."""
+        database_id = self.add_database(title=title)
+        self.databases[database_id]["parent"] = {"type": "page_id", "page_id": parent_id}
+        block = copy.deepcopy(FIXTURE["block"])
+        block["id"] = database_id
+        block["type"] = "child_database"
+        block["child_database"] = {"title": title}
+        del block["paragraph"]
+        block["parent"] = {"type": "page_id", "page_id": parent_id}
+        self.blocks[database_id] = block
+        self.children.setdefault(parent_id, []).append(database_id)
+        return database_id
+
+    def add_tree(self, parent_id: str, depth: int, width: int) -> int:
+        """Add a ``width``-ary block tree ``depth`` levels deep. Returns the block count."""
+        count = 0
+        for i in range(width):
+            block_id = self.add_block(parent_id, text=f"{parent_id[:8]}-{i}")
+            count += 1
+            if depth > 1:
+                count += self.add_tree(block_id, depth - 1, width)
+        return count
+
+    # Views
+
+    def query_payload(self, page_id: str) -> dict:
+        """Page as returned by ``databases.query``: relations are capped at 25 items."""
+        page = copy.deepcopy(self.pages[page_id])
+        for prop in page["properties"].values():
+            if prop["type"] == "relation" and len(prop["relation"]) > RELATION_LIMIT:
+                prop["relation"] = prop["relation"][:RELATION_LIMIT]
+                prop["has_more"] = True
+        return page
+
+    def count(self, route: str) -> int:
+        return sum(n for key, n in self.requests.items() if key.endswith(route))
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+    def fail(self, status: int = 429, times: int = 1, retry_after: Optional[float] = None, endpoint: Optional[str] = None):
+        """Answer the next ``times`` requests (to ``endpoint`` only, if given) with an error response."""
+        code = "rate_limited" if status == 429 else "service_unavailable"
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        for _ in range(times):
+            response = error_response(status, code, "Injected failure.")
+            response.headers.update(headers)
+            self.failures.append((endpoint, response))
+
+    # Transport
+
+    def client(self, cls: Type[Client] = Client, **kwargs: Any) -> Client:
+        """Build a real notion_client.Client (or subclass) that talks to this fake."""
+        return cls(auth=AUTH, client=httpx.Client(transport=httpx.MockTransport(self.handle)), **kwargs)
+
+    def async_client(self, cls: Type[AsyncClient] = AsyncClient, **kwargs: Any) -> AsyncClient:
+        """Build a real notion_client.AsyncClient (or subclass) that talks to this fake."""
+        return cls(auth=AUTH, client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle_async)), **kwargs)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.enter()
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self.respond(request)
+        finally:
+            self.exit()
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        self.enter()
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self.respond(request)
+        finally:
+            self.exit()
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            name = self.endpoint(request)
+            index = next((i for i, (endpoint, _) in enumerate(self.failures) if endpoint in (None, name)), None)
+            failure = self.failures.pop(index)[1] if index is not None else None
+            if failure is not None:
+                self.requests[f"{request.method} failure"] += 1
+        if failure is not None:
+            return failure
+        return self.route(request)
+
+    def endpoint(self, request: httpx.Request) -> Optional[str]:
+        path = request.url.path[len("/v1/") :]
+        return next((name for pattern, method, name in ROUTES if re.fullmatch(pattern, path) and request.method == method), None)
+
+    def route(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path[len("/v1/") :]
+        body = json.loads(request.content) if request.content else {}
+        query = dict(request.url.params)
+        if "filter_properties" in query:
+            query["filter_properties"] = request.url.params.get_list("filter_properties")
+        for pattern, method, name in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if match and request.method == method:
+                with self.lock:
+                    self.requests[f"{method} {name}"] += 1
+                ids = [str(uuid.UUID(object_id)) for object_id in match.groups()]
+                return getattr(self, name)(*ids, body=body, query=query)
+        return error_response(400, "invalid_request_url", f"Invalid request URL: {request.method} {path}")
+
+    def paginate(self, items: List[Any], cursor: Optional[str], page_size: Optional[Any]) -> dict:
+        start = int(cursor) if cursor else 0
+        size = min(int(page_size or 100), 100)
+        end = start + size
+        return {
+            "object": "list",
+            "results": items[start:end],
+            "next_cursor": str(end) if end < len(items) else None,
+            "has_more": end < len(items),
+            "type": "page_or_database",
+        }
+
+    # Endpoints
+
+    def append_children(self, block_id: str, body: dict, query: dict) -> httpx.Response:
+        if block_id not in self.children and block_id not in self.blocks:
+            return error_response(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        children = body.get("children", [])
+        levels = [children]  # blocks of the request, then the nested blocks level by level
+        lists = [children]
+        while levels[-1]:
+            nested = [block[block["type"]].get("children", []) for block in levels[-1]]
+            lists.extend(nested)
+            levels.append([child for blocks in nested for child in blocks])
+        if any(len(blocks) > 100 for blocks in lists):
+            return error_response(400, "validation_error", "body.children.length should be ≤ `100`.")
+        if len(levels) > 4:
+            return error_response(400, "validation_error", "Only two levels of nesting are supported.")
+        empty = [
+            block["type"]
+            for level in levels
+            for block in level
+            if block["type"] in REQUIRED_CHILDREN and not block[block["type"]].get("children")
+        ]
+        if empty:
+            return error_response(400, "validation_error", f"body.children.{empty[0]}.children should be defined.")
+        siblings = self.children.setdefault(block_id, [])
+        after = str(uuid.UUID(body["after"])) if body.get("after") else None
+        if after and after not in siblings:
+            return error_response(400, "validation_error", f"Block {after} is not a child of {block_id}.")
+        index = siblings.index(after) + 1 if after else len(siblings)
+        results = [self.blocks[self.create_block(block_id, child, index + i)] for i, child in enumerate(children)]
+        return httpx.Response(200, json={"object": "list", "results": results, "next_cursor": None, "has_more": False})
+
+    def create_block(self, parent_id: str, payload: dict, index: Optional[int] = None) -> str:
+        content = dict(payload[payload["type"]])
+        children = content.pop("children", [])
+        block = copy.deepcopy(FIXTURE["block"])
+        del block["paragraph"]
+        block.update({"id": new_id(), "type": payload["type"], payload["type"]: content, "has_children": False})
+        parent_type = "page_id" if parent_id in self.pages else "block_id"
+        block["parent"] = {"type": parent_type, parent_type: parent_id}
+        if parent_id in self.blocks:
+            self.blocks[parent_id]["has_children"] = True
+        self.blocks[block["id"]] = block
+        siblings = self.children.setdefault(parent_id, [])
+        siblings.insert(len(siblings) if index is None else index, block["id"])
+        for child in children:
+            self.create_block(block["id"], child)
+        return block["id"]
+
+    def create_page(self, body: dict, query: dict) -> httpx.Response:
+        parent = body["parent"]
+        database_id = parent.get("database_id")
+        if database_id is not None:
+            database_id = str(uuid.UUID(database_id))
+            if database_id not in self.databases:
+                return error_response(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+            schema = self.databases[database_id]["properties"]
+            unknown = [name for name in body.get("properties", {}) if name not in schema]
+            if unknown:
+                return error_response(400, "validation_error", f"{unknown[0]} is not a property that exists.")
+        with self.lock:
+            page_id = self.add_page(database_id)
+        page = self.pages[page_id]
+        if database_id is not None:
+            page["properties"] = {
+                name: {"id": prop["id"], "type": prop["type"], prop["type"]: EMPTY.get(prop["type"])} for name, prop in schema.items()
+            }
+        for name, value in body.get("properties", {}).items():
+            prop_type = next(iter(value))
+            page["properties"][name] = {"id": name, "type": prop_type, **value}
+        return httpx.Response(200, json=page)
+
+    def update_page(self, page_id: str, body: dict, query: dict) -> httpx.Response:
+        if page_id not in self.pages:
+            return error_response(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        page = self.pages[page_id]
+        for name, value in body.get("properties", {}).items():
+            page["properties"][name] = {**page["properties"].get(name, {"id": name}), **value}
+        return httpx.Response(200, json=page)
+
+    def update_database(self, database_id: str, body: dict, query: dict) -> httpx.Response:
+        if database_id not in self.databases:
+            return error_response(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        schema = self.databases[database_id]["properties"]
+        for name, change in body.get("properties", {}).items():
+            if change is None:
+                schema.pop(name, None)
+                continue
+            prop = schema.pop(name, {"id": new_id()[:4], "name": name})
+            new_name = change.get("name", name)
+            prop_type = change.get("type", prop.get("type"))
+            schema[new_name] = {**prop, "name": new_name, "type": prop_type, prop_type: change.get(prop_type, prop.get(prop_type, {}))}
+        return httpx.Response(200, json=self.databases[database_id])
+
+    def update_block(self, block_id: str, body: dict, query: dict) -> httpx.Response:
+        if block_id not in self.blocks:
+            return error_response(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        block = self.blocks[block_id]
+        if block["type"] in body:
+            block[block["type"]] = {**block[block["type"]], **body[block["type"]]}
+        return httpx.Response(200, json=block)
+
+    def delete_block(self, block_id: str, body: dict, query: dict) -> httpx.Response:
+        """Archive a block, or a page and its ``child_page`` block; database rows leave their database."""
+        with self.lock:
+            block = self.blocks.pop(block_id, None)
+            page = self.pages.pop(block_id, None)
+        if block is None and page is None:
+            return error_response(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        item = block if block is not None else page
+        parent_id = item["parent"].get(item["parent"]["type"])
+        with self.lock:
+            if block_id in self.children.get(parent_id, []):
+                self.children[parent_id].remove(block_id)
+            if block_id in self.rows.get(parent_id, []):
+                self.rows[parent_id].remove(block_id)
+        item["archived"] = True
+        return httpx.Response(200, json=item)
+
+    def search(self, body: dict, query: dict) -> httpx.Response:
+        object_type = (body.get("filter") or {}).get("value")
+        items = [*self.pages.values()] if object_type in (None, "page") else []
+        items += [*self.databases.values()] if object_type in (None, "database") else []
+        text = body.get("query", "").lower()
+        items = [item for item in items if text in title_of(item).lower()]
+        sort = body.get("sort")
+        if sort:
+            items.sort(key=lambda item: item[sort["timestamp"]], reverse=sort["direction"] == "descending")
+        return httpx.Response(200, json=self.paginate(items, body.get("start_cursor"), body.get("page_size")))
+
+    def create_database(self, body: dict, query: dict) -> httpx.Response:
+        parent_id = str(uuid.UUID(body["parent"]["page_id"]))
+        if parent_id not in self.pages:
+            return error_response(404, "object_not_found", f"Could not find page with ID: {parent_id}.")
+        title = "".join(text["text"]["content"] for text in body.get("title", []))
+        with self.lock:
+            database_id = self.add_child_database(parent_id, title=title)
+        database = self.databases[database_id]
+        database["properties"] = {
+            name: {"id": new_id()[:4], "name": name, "type": next(iter(prop)), **prop} for name, prop in body.get("properties", {}).items()
+        }
+        return httpx.Response(200, json=database)
+
+    def retrieve_block(self, block_id: str, body: dict, query: dict) -> httpx.Response:
+        """Retrieve a block; a page without a ``child_page`` block, e.g. a root page, is returned as one."""
+        if block_id in self.blocks:
+            return httpx.Response(200, json=self.blocks[block_id])
+        if block_id in self.pages:
+            page = self.pages[block_id]
+            block = {key: page[key] for key in ("id", "parent", "created_time", "last_edited_time", "archived")}
+            block.update({"object": "block", "type": "child_page", "child_page": {"title": title_of(page)}})
+            block["has_children"] = bool(self.children.get(block_id))
+            return httpx.Response(200, json=block)
+        return error_response(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+
+    def retrieve_page(self, page_id: str, body: dict, query: dict) -> httpx.Response:
+        if page_id not in self.pages:
+            return error_response(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        return httpx.Response(200, json=self.pages[page_id])
+
+    def retrieve_database(self, database_id: str, body: dict, query: dict) -> httpx.Response:
+        if database_id not in self.databases:
+            return error_response(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        return httpx.Response(200, json=self.databases[database_id])
+
+    def query_database(self, database_id: str, body: dict, query: dict) -> httpx.Response:
+        if database_id not in self.databases:
+            return error_response(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        rows = [self.query_payload(page_id) for page_id in self.rows[database_id] if matches(self.pages[page_id], body.get("filter"))]
+        for sort in reversed(body.get("sorts") or []):
+            rows.sort(key=lambda row, sort=sort: sort_key(row, sort), reverse=sort.get("direction") == "descending")
+        projection = query.get("filter_properties")
+        if projection:
+            for row in rows:
+                row["properties"] = {name: prop for name, prop in row["properties"].items() if prop["id"] in projection}
+        return httpx.Response(200, json=self.paginate(rows, body.get("start_cursor"), body.get("page_size")))
+
+    def list_children(self, block_id: str, body: dict, query: dict) -> httpx.Response:
+        if block_id not in self.children and block_id not in self.blocks:
+            return error_response(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        blocks = [self.blocks[child_id] for child_id in self.children.get(block_id, [])]
+        return httpx.Response(200, json=self.paginate(blocks, query.get("start_cursor"), query.get("page_size")))
+
+
+ID = r"([0-9a-fA-F-]{32,36})"
+
+ROUTES = [
+    (rf"pages/{ID}", "GET", "retrieve_page"),
+    (rf"pages/{ID}", "PATCH", "update_page"),
+    (rf"databases/{ID}", "GET", "retrieve_database"),
+    (rf"databases/{ID}", "PATCH", "update_database"),
+    (rf"databases/{ID}/query", "POST", "query_database"),
+    (r"pages", "POST", "create_page"),
+    (r"databases", "POST", "create_database"),
+    (rf"blocks/{ID}/children", "GET", "list_children"),
+    (rf"blocks/{ID}/children", "PATCH", "append_children"),
+    (rf"blocks/{ID}", "GET", "retrieve_block"),
+    (rf"blocks/{ID}", "PATCH", "update_block"),
+    (rf"blocks/{ID}", "DELETE", "delete_block"),
+    (r"search", "POST", "search"),
+]
+
+
+class FakeNotionHandler(BaseHTTPRequestHandler):
+    """Forward each HTTP request to a FakeNotion, over keep-alive connections."""
+
+    fake: FakeNotion
+    protocol_version = "HTTP/1.1"
+
+    def forward(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = httpx.Request(
+            self.command,
+            f"http://{self.headers['Host']}{self.path}",
+            headers=dict(self.headers.items()),
+            content=self.rfile.read(length) if length else b"",
+        )
+        response = self.fake.handle(request)
+        self.send_response(response.status_code)
+        for name, value in response.headers.items():
+            if name.lower() not in ("content-length", "transfer-encoding", "connection"):
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = forward
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+class FakeNotionServer:
+    """Serve a FakeNotion over HTTP from a background thread, one thread per connection.
+
+    Latency and failures set on the fake apply to every request, so pooling, pacing and
+    retries run against a real socket. Point a client at ``url``, e.g.
+    ``NotionClient(token=AUTH, base_url=server.url)``, or set ``NOTION_BASE_URL``.
+
+    Attributes:
+        fake (FakeNotion): The workspace being served.
+        url (str): Base URL of the server.
+    """
+
+    def __init__(self, fake: Optional[FakeNotion] = None, host: str = "127.0.0.1", port: int = 0):
+        self.fake = fake if fake else FakeNotion()
+        handler = type("Handler", (FakeNotionHandler,), {"fake": self.fake})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeNotionServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __enter__(self) -> "FakeNotionServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any):
+        self.stop()
@@ -0,0 +1,92 @@
+import asyncio
+
+from fake_notion import AUTH
+from notion_mbse.utils.notion_async_client import async_paginate
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_ratelimit import AsyncThrottledClient
+from notion_mbse.utils.notion_ratelimit import TokenBucket
+from notion_mbse.utils.notion_utils import normalize_id
+
+
+def _tree(blocks):
+    return [{"id": block["id"], "children": _tree(block["children"])} for block in blocks]
+
+
+def test_async_paginate(fake):
+    database_id = fake.add_database()
+    ids = [fake.add_page(database_id) for _ in range(230)]
+    client = fake.async_client()
+
+    async def collect():
+        return [page["id"] async for page in async_paginate(client.databases.query, database_id=database_id)]
+
+    assert asyncio.run(collect()) == ids
+    assert fake.count("query_database") == 3
+
+
+def test_async_get_blocks_matches_sync(fake, async_client):
+    fake.latency = 0.005
+    page_id = fake.add_page(title="Spec")
+    fake.add_tree(page_id, depth=3, width=3)
+
+    blocks = asyncio.run(async_client.get_blocks(page_id))
+    assert fake.peak > 1
+    assert fake.count("list_children") == 1 + 3 + 9
+
+    assert _tree(blocks) == _tree(NotionClient(token=AUTH, client=fake.client()).get_blocks(page_id))
+
+
+def test_async_get_database(fake, async_client):
+    database_id = fake.add_database()
+    for i in range(120):
+        fake.add_page(database_id, title=f"Row {i}", relations=40 if i == 7 else 0)
+
+    pages = asyncio.run(async_client.get_database(database_id))
+    assert len(pages) == 120
+    assert fake.count("retrieve_page") == 1
+    assert len(pages[7]["properties"]["Related"]["relation"]) == 40
+
+
+def test_async_download_database(fake, async_client, tmp_path):
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, title=f"Row {i}") for i in range(5)]
+    for page_id in page_ids:
+        fake.add_block(page_id, text="Hello")
+
+    empty_id = fake.add_page(database_id, title="Empty")
+    fake.fail(503, endpoint="list_children")
+
+    failed = asyncio.run(async_client.download_database(database_id, tmp_path))
+    assert len(failed) == 1
+    assert (tmp_path / "database.json").exists()
+    assert len(list(tmp_path.glob("*.json"))) == 6
+
+    fake.requests.clear()
+    assert asyncio.run(async_client.download_database(database_id, tmp_path)) == []
+    assert fake.count("list_children") == 1
+    assert len(list(tmp_path.glob("*.json"))) == 7
+    assert (tmp_path / f"{normalize_id(empty_id)}.json").read_text() == "[]"
+
+    fake.requests.clear()
+    asyncio.run(async_client.download_database(database_id, tmp_path))
+    assert fake.count("list_children") == 0
+
+
+def test_async_load_snapshot(fake, async_client, tmp_path):
+    database_id = fake.add_database()
+    page_id = fake.add_page(database_id)
+    fake.add_block(page_id, text="Hello")
+    NotionClient(token=AUTH, client=fake.client()).download_database(database_id, tmp_path, snapshot="snapshot.jsonl.gz")
+
+    pages = async_client.load(tmp_path / "snapshot.jsonl.gz")
+    assert pages[0]["children"][0]["paragraph"]["rich_text"][0]["plain_text"] == "Hello"
+
+
+def test_async_throttled_client(fake):
+    client = fake.async_client(AsyncThrottledClient, bucket=TokenBucket(rate=1000, capacity=10))
+    page_id = fake.add_page()
+    fake.fail(429, times=1, retry_after=0.01)
+
+    page = asyncio.run(client.pages.retrieve(page_id=page_id))
+    assert page["id"] == page_id
+    assert fake.count("failure") == 1
@@ -0,0 +1,110 @@
+import time
+
+from fake_notion import AUTH
+from notion_mbse.utils.notion_bulk import BulkArchiver
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_database import NotionDatabase
+from notion_mbse.utils.notion_page import NotionPage
+from notion_mbse.utils.notion_ratelimit import RetryPolicy
+from notion_mbse.utils.notion_ratelimit import TokenBucket
+from notion_mbse.utils.notion_utils import normalize_id
+
+
+def test_archive_results_per_id(fake, throttled_client):
+    fake.latency = 0.002
+    page_id = fake.add_page(title="Root")
+    block_ids = [fake.add_block(page_id, text=f"Block {i}") for i in range(40)]
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    archiver = BulkArchiver(throttled_client, max_workers=4)
+    assert archiver.paced
+    assert archiver.bucket is throttled_client.client.bucket
+    results = archiver.archive([*block_ids, block_ids[0], missing])
+
+    assert [result.id for result in results] == [*map(normalize_id, block_ids), normalize_id(missing)]
+    assert all(result.ok for result in results[:-1])
+    assert not results[-1].ok
+    assert "Could not find block" in results[-1].error
+    assert fake.children[page_id] == []
+    assert fake.peak <= 4
+
+
+def test_archive_retries(fake):
+    page_id = fake.add_page(title="Root")
+    block_ids = [fake.add_block(page_id) for _ in range(3)]
+    n_client = NotionClient(token=AUTH, client=fake.client(), max_workers=1)
+    archiver = BulkArchiver(n_client, retry=RetryPolicy(max_retries=2, base_delay=0.001), bucket=TokenBucket(rate=10000, capacity=10000))
+
+    fake.fail(503, times=2)
+    results = archiver.archive(block_ids)
+    assert [result.attempts for result in results] == [3, 1, 1]
+    assert all(result.ok for result in results)
+
+    fake.fail(503, times=3)
+    result = archiver.archive([fake.add_block(page_id)])[0]
+    assert not result.ok
+    assert result.attempts == 3
+
+
+def test_archive_retries_once_through_throttled_client(fake, throttled_client):
+    page_id = fake.add_page(title="Root")
+    block_id = fake.add_block(page_id)
+    archiver = BulkArchiver(throttled_client, retry=RetryPolicy(max_retries=2, base_delay=0.001))
+
+    fake.fail(503, times=5)
+    result = archiver.archive([block_id])[0]
+    assert not result.ok
+    assert result.attempts == 3
+    assert fake.count("failure") == 3
+    assert throttled_client.client.retry.max_retries == 5
+
+
+def test_archive_rate_limit_holds_back_every_worker(fake, throttled_client):
+    fake.latency = 0.005
+    page_id = fake.add_page(title="Root")
+    block_ids = [fake.add_block(page_id) for _ in range(40)]
+    answered = []
+    respond = fake.respond
+
+    def record(request):
+        response = respond(request)
+        answered.append((time.monotonic(), response.status_code))
+        return response
+
+    fake.respond = record
+    fake.fail(429, times=1, retry_after=0.3)
+    results = BulkArchiver(throttled_client, max_workers=4).archive(block_ids)
+
+    assert all(result.ok for result in results)
+    limited = next(at for at, status in answered if status == 429)
+    during = [at for at, _ in answered if limited < at < limited + 0.25]
+    assert len(during) <= 3  # only requests that had already passed the bucket
+
+
+def test_delete_all_rows(fake, throttled_client):
+    database_id = fake.add_database(title="Teardown")
+    for i in range(250):
+        fake.add_page(database_id, title=f"Row {i}")
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=throttled_client)
+    results = database.delete_all()
+    assert len(results) == 250
+    assert all(result.ok for result in results)
+    assert database.pages == []
+    assert fake.rows[database_id] == []
+
+
+def test_clear_blocks_and_delete_child_pages(fake, throttled_client):
+    root_id = fake.add_page(title="Root")
+    for i in range(30):
+        fake.add_child_page(root_id, title=f"Sub {i}")
+    fake.add_block(root_id)
+
+    page = NotionPage(token=AUTH, page_id=root_id, client=throttled_client)
+    results = page.delete_child_pages()
+    assert len(results) == 30
+    assert page.child_pages == []
+    assert len(fake.children[root_id]) == 1
+
+    assert len(page.clear_blocks()) == 1
+    assert fake.children[root_id] == []
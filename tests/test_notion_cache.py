@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+
+from fake_notion import AUTH
+from fake_notion import FakeNotion
+from notion_mbse.utils.notion_cache import BLOCKS
+from notion_mbse.utils.notion_cache import METADATA
+from notion_mbse.utils.notion_cache import MemoryCache
+from notion_mbse.utils.notion_cache import SQLiteCache
+from notion_mbse.utils.notion_client_extend import NotionClient
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    cache = MemoryCache() if request.param == "memory" else SQLiteCache(tmp_path / "cache" / "notion.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_cache_versions(cache):
+    cache.put("a1b2c3d4-0000-4000-8000-000000000000", METADATA, "v1", {"id": "a"})
+    assert cache.get("a1b2c3d4000040008000000000000000", METADATA) == {"id": "a"}
+    assert cache.get("a1b2c3d4-0000-4000-8000-000000000000", METADATA, "v1") == {"id": "a"}
+    assert cache.get("a1b2c3d4-0000-4000-8000-000000000000", METADATA, "v2") is None
+    assert cache.get("a1b2c3d4-0000-4000-8000-000000000000", BLOCKS) is None
+
+    cache.invalidate("a1b2c3d4-0000-4000-8000-000000000000")
+    assert cache.get("a1b2c3d4-0000-4000-8000-000000000000", METADATA) is None
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = tmp_path / "notion.sqlite"
+    cache = SQLiteCache(path)
+    cache.put("page", BLOCKS, "v1", [{"id": "block"}])
+    cache.close()
+
+    cache = SQLiteCache(path)
+    assert cache.get("page", BLOCKS, "v1") == [{"id": "block"}]
+    assert len(cache) == 1
+    cache.close()
+
+
+def test_get_blocks_uses_cache(cache):
+    fake = FakeNotion()
+    page_id = fake.add_page(title="Spec")
+    fake.add_tree(page_id, depth=2, width=3)
+    n_client = NotionClient(token=AUTH, client=fake.client(), cache=cache)
+
+    blocks = n_client.get_blocks(page_id)
+    assert fake.count("list_children") == 4
+    assert fake.count("retrieve_block") == 1
+
+    fake.requests.clear()
+    cached = n_client.get_blocks(page_id)
+    assert fake.total == 1  # freshness check only
+    assert cached == blocks
+    assert isinstance(cached[0]["children"][0]["last_edited_time"], datetime)
+
+    fake.pages[page_id]["last_edited_time"] = "2024-08-01T00:00:00.000Z"
+    fake.requests.clear()
+    n_client.get_blocks(page_id)
+    assert fake.count("list_children") == 4
+
+    toggle_id = blocks[0]["id"]
+    assert n_client.get_blocks(toggle_id) == blocks[0]["children"]
+    assert fake.count("retrieve_page") == 0
+
+
+def test_get_blocks_sees_subpage_edits(cache):
+    fake = FakeNotion()
+    page_id = fake.add_page(title="Spec")
+    fake.add_block(page_id, text="Intro")
+    subpage_id = fake.add_child_page(page_id, title="Details")
+    fake.add_block(subpage_id, text="Old")
+    n_client = NotionClient(token=AUTH, client=fake.client(), cache=cache)
+    assert n_client.get_blocks(page_id)[1]["children"][0]["paragraph"]["rich_text"][0]["plain_text"] == "Old"
+
+    fake.add_block(subpage_id, text="New")
+    fake.blocks[subpage_id]["last_edited_time"] = "2024-08-01T00:00:00.000Z"
+    fake.requests.clear()
+    blocks = n_client.get_blocks(page_id)
+    assert [block["paragraph"]["rich_text"][0]["plain_text"] for block in blocks[1]["children"]] == ["Old", "New"]
+    assert fake.count("list_children") == 1  # only the edited subpage
+
+
+def test_download_database_from_cache(tmp_path):
+    fake = FakeNotion()
+    database_id = fake.add_database()
+    for i in range(10):
+        fake.add_tree(fake.add_page(database_id, title=f"Row {i}"), depth=2, width=2)
+    cache = MemoryCache()
+    n_client = NotionClient(token=AUTH, client=fake.client(), cache=cache)
+
+    n_client.download_database(database_id, tmp_path / "first")
+    assert fake.count("list_children") == 10 * 3
+
+    fake.requests.clear()
+    n_client.download_database(database_id, tmp_path / "second")
+    assert fake.total == 1  # the database query
+    assert len(list((tmp_path / "second").glob("*.json"))) == 12  # pages, database.json and manifest.json
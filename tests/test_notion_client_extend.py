@@ -1,8 +1,11 @@
 import os
 
 import pytest
+from notion_client.errors import APIResponseError
 
 # from pydantic.schema import schema
+from fake_notion import AUTH
+from notion_mbse.utils.notion_client_extend import LastEditedToDateTime
 from notion_mbse.utils.notion_client_extend import NotionClient
 from notion_mbse.utils.notion_utils import extract_id_from_notion_url
 
@@ -87,3 +90,269 @@ def test_download_database(notion_client):
     out_dir = "./json"
     notion_client.download_database(database_id, out_dir)
     # Add assertions for the downloaded files
+
+
+def test_get_database_requests_per_row(fake, fake_client):
+    database_id = fake.add_database()
+    n_rows = 250
+    for i in range(n_rows):
+        fake.add_page(database_id, title=f"Row {i}", relations=30 if i % 50 == 0 else 0)
+
+    pages = fake_client.get_database(database_id)
+    assert len(pages) == n_rows
+    assert fake.count("query_database") == 3
+    assert fake.count("retrieve_page") == 5  # only the rows with truncated relations
+    assert fake.total / n_rows == pytest.approx((3 + 5) / n_rows)
+
+    for page in pages:
+        assert not page["properties"]["Related"].get("has_more")
+    assert sum(len(page["properties"]["Related"]["relation"]) for page in pages) == 5 * 30
+
+    fake.requests.clear()
+    legacy = fake_client.get_database(database_id, refetch="all")
+    assert fake.count("retrieve_page") == n_rows
+    assert fake.total / n_rows == pytest.approx((3 + n_rows) / n_rows)
+    assert [page["id"] for page in legacy] == [page["id"] for page in pages]
+
+
+def test_get_database_invalid_refetch(fake_client):
+    with pytest.raises(ValueError, match="Invalid refetch mode"):
+        fake_client.get_database("5f2c1d3e-9a8b-4c7d-8e6f-112233445566", refetch="some")
+
+
+def _fake_tree(fake, parent_id):
+    return [{"id": block_id.replace("-", ""), "children": _fake_tree(fake, block_id)} for block_id in fake.children.get(parent_id, [])]
+
+
+def _tree(blocks):
+    return [{"id": block["id"], "children": _tree(block["children"])} for block in blocks]
+
+
+def test_get_blocks_breadth_first(fake):
+    fake.latency = 0.005
+    page_id = fake.add_page(title="Spec")
+    fake.add_tree(page_id, depth=3, width=4)
+    n_client = NotionClient(token=AUTH, client=fake.client(), max_workers=8)
+
+    blocks = n_client.get_blocks(page_id)
+    assert _tree(blocks) == _fake_tree(fake, page_id)
+    assert fake.count("list_children") == 1 + 4 + 16
+    assert fake.peak > 1
+    leaf = blocks[0]["children"][0]["children"][0]
+    assert leaf["children"] == []
+    assert leaf["last_edited_time"].year == 2024
+
+
+def test_download_database_incremental(fake, fake_client, tmp_path):
+    fake.latency = 0.002
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, title=f"Row {i}") for i in range(6)]
+    for page_id in page_ids:
+        fake.add_tree(page_id, depth=1, width=2)
+
+    report = fake_client.download_database(database_id, tmp_path)
+    assert report.counts() == {"added": 6, "changed": 0, "unchanged": 0, "deleted": 0, "failed": 0, "retried": 0}
+    assert fake.peak > 1
+    assert (tmp_path / "manifest.json").exists()
+
+    fake.pages[page_ids[0]]["last_edited_time"] = "2024-08-01T00:00:00.000Z"
+    fake.rows[database_id].remove(page_ids[1])
+    new_id = fake.add_page(database_id, title="Row 6")
+    (tmp_path / f"{page_ids[2].replace('-', '')}.json").write_text("[]")
+    fake.requests.clear()
+
+    report = fake_client.download_database(database_id, tmp_path)
+    assert report.added == [new_id.replace("-", "")]
+    assert report.changed == [page_ids[0].replace("-", ""), page_ids[2].replace("-", "")]
+    assert report.deleted == [page_ids[1].replace("-", "")]
+    assert len(report.unchanged) == 3
+    assert fake.count("list_children") == 3
+    assert not (tmp_path / f"{page_ids[1].replace('-', '')}.json").exists()
+    assert str(report) == "1 added, 2 changed, 3 unchanged, 1 deleted, 0 failed, 0 retried"
+
+    fake.requests.clear()
+    report = fake_client.download_database(database_id, tmp_path)
+    assert len(report.unchanged) == 6
+    assert fake.count("list_children") == 0
+
+
+def test_download_database_retries_failures(fake, fake_client, tmp_path):
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, title=f"Row {i}") for i in range(3)]
+    fake.fail(404, endpoint="list_children")
+
+    report = fake_client.download_database(database_id, tmp_path)
+    assert len(report.added) == 2
+    assert len(report.failed) == 1
+    manifest = fake_client.load_manifest(tmp_path)
+    assert manifest["pages"][report.failed[0]]["failed"]
+
+    report = fake_client.download_database(database_id, tmp_path)
+    assert report.counts() == {"added": 0, "changed": 0, "unchanged": 2, "deleted": 0, "failed": 0, "retried": 1}
+    assert len(list(tmp_path.glob("*.json"))) == len(page_ids) + 2
+    assert "failed" not in fake_client.load_manifest(tmp_path)["pages"][report.retried[0]]
+
+
+def test_get_database_since(fake, fake_client):
+    database_id = fake.add_database()
+    for minute in range(30):
+        fake.add_page(database_id, last_edited_time=f"2024-07-06T15:{minute:02d}:00.000Z")
+
+    pages = fake_client.get_database(database_id, since="2024-07-06T15:25:00.000Z")
+    assert [page["last_edited_time"].minute for page in pages] == [25, 26, 27, 28, 29]
+
+    fake_client.filter = {"property": "Status", "select": {"equals": "Draft"}}
+    assert len(fake_client.get_database(database_id, since=pages[-1]["last_edited_time"])) == 1
+
+
+def test_download_database_delta(fake, fake_client, tmp_path):
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, last_edited_time=f"2024-07-06T{i // 60:02d}:{i % 60:02d}:00.000Z") for i in range(250)]
+    for page_id in page_ids:
+        fake.add_block(page_id)
+
+    report = fake_client.download_database(database_id, tmp_path, delta=True)
+    assert len(report.added) == 250
+    assert fake.count("query_database") == 3
+
+    for page_id in page_ids[:5]:
+        fake.pages[page_id]["last_edited_time"] = "2024-07-07T09:00:00.000Z"
+    fake.requests.clear()
+
+    report = fake_client.download_database(database_id, tmp_path, delta=True)
+    assert len(report.changed) == 5
+    assert len(report.unchanged) == 245
+    assert fake.count("query_database") == 1
+    assert fake.count("list_children") == 5
+    assert len(fake_client.load(tmp_path / "database.json")) == 250
+
+    fake.requests.clear()
+    report = fake_client.download_database(database_id, tmp_path, delta=True)
+    assert report.changed == []
+    assert fake.count("list_children") == 0
+
+
+def test_download_database_streams_lines(fake, fake_client, tmp_path):
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, title=f"Row {i}") for i in range(150)]
+    fake.add_block(page_ids[0])
+
+    assert sum(1 for _ in fake_client.iter_database(database_id)) == 150
+    report = fake_client.download_database(database_id, tmp_path, lines=True)
+    assert len(report.added) == 150
+    assert len((tmp_path / "database.jsonl").read_text().splitlines()) == 150
+    assert not (tmp_path / "database.jsonl.part").exists()
+    assert [pg["id"] for pg in fake_client.iter_load(tmp_path / "database.jsonl")] == [page_id.replace("-", "") for page_id in page_ids]
+
+    assert fake_client.save_stream(fake_client.iter_database(database_id), tmp_path / "export.json") == 150
+    assert len(fake_client.load(tmp_path / "export.json")) == 150
+
+
+def test_download_database_snapshot(fake, fake_client, tmp_path):
+    database_id = fake.add_database()
+    page_ids = [fake.add_page(database_id, title=f"Row {i}") for i in range(6)]
+    for page_id in page_ids:
+        fake.add_tree(page_id, depth=2, width=3)
+
+    fake_client.download_database(database_id, tmp_path / "files")
+    report = fake_client.download_database(database_id, tmp_path / "snap", snapshot="snapshot.jsonl.gz")
+    assert len(report.added) == 6
+    files_size = sum((tmp_path / "files" / f"{page_id.replace('-', '')}.json").stat().st_size for page_id in page_ids)
+    assert (tmp_path / "snap" / "snapshot.jsonl.gz").stat().st_size * 10 < files_size
+    assert not list((tmp_path / "snap").glob("*.part*"))
+
+    page_id = page_ids[3].replace("-", "")
+    blocks = fake_client.load_page(tmp_path / "snap" / "snapshot.jsonl.gz", page_ids[3])
+    assert [block["id"] for block in blocks] == [block["id"] for block in fake_client.load(tmp_path / "files" / f"{page_id}.json")]
+    assert len(blocks[0]["children"]) == 3
+    assert len(fake_client.load(tmp_path / "snap" / "snapshot.jsonl.gz")) == 6
+
+    fake.pages[page_ids[0]]["last_edited_time"] = "2024-08-01T00:00:00.000Z"
+    fake.rows[database_id].remove(page_ids[1])
+    fake.requests.clear()
+    report = fake_client.download_database(database_id, tmp_path / "snap", snapshot="snapshot.jsonl.gz")
+    assert report.counts() == {"added": 0, "changed": 1, "unchanged": 4, "deleted": 1, "failed": 0, "retried": 0}
+    assert fake.count("list_children") == 4
+    assert fake_client.load_page(tmp_path / "snap" / "snapshot.jsonl.gz", page_id) == blocks
+    assert fake_client.load_page(tmp_path / "snap" / "snapshot.jsonl.gz", page_ids[1]) == []
+
+    fake.fail(400, endpoint="query_database")
+    with pytest.raises(APIResponseError):
+        fake_client.download_database(database_id, tmp_path / "snap", snapshot="snapshot.jsonl.gz")
+    assert not list((tmp_path / "snap").glob("*.part*"))
+    assert fake_client.load_page(tmp_path / "snap" / "snapshot.jsonl.gz", page_id) == blocks
+
+
+def test_transformer_in_place():
+    transformer = LastEditedToDateTime()
+    blocks = [{"id": f"a-{i}", "last_edited_time": f"2024-07-06T15:{i % 3:02d}:00.000Z"} for i in range(100000)]
+    first = blocks[0]
+    assert transformer.forward(blocks) is blocks
+    assert blocks[0] is first
+    assert blocks[0]["id"] == "a0"
+    assert blocks[4]["last_edited_time"] is blocks[1]["last_edited_time"]
+    assert len(transformer._parsed) == 3
+    assert transformer.forward(blocks)[2]["last_edited_time"].minute == 2
+
+
+def test_transformer_forward_tree():
+    leaf = {"id": "c", "last_edited_time": "2024-07-06T15:02:00.000Z"}
+    tree = [
+        {"id": "a", "last_edited_time": "2024-07-06T15:00:00.000Z", "children": [leaf]},
+        {"id": "b", "last_edited_time": "2024-07-06T15:01:00.000Z"},
+    ]
+    assert LastEditedToDateTime().forward_tree(tree) is tree
+    assert leaf["last_edited_time"].minute == 2
+    assert tree[1]["children"] == []
+
+
+class CopyingTransformer(LastEditedToDateTime):
+    def forward(self, blocks):
+        return [{**block, "copied": True} for block in blocks]
+
+
+def test_forward_tree_with_copying_transformer():
+    tree = [{"id": "a", "children": [{"id": "b", "children": [{"id": "c"}, {"id": "d"}]}, {"id": "e"}]}, {"id": "f"}]
+    result = CopyingTransformer().forward_tree(tree)
+    assert [block["id"] for block in result] == ["a", "f"]
+    assert [block["id"] for block in result[0]["children"]] == ["b", "e"]
+    assert [block["id"] for block in result[0]["children"][0]["children"]] == ["c", "d"]
+    assert all(block["copied"] for block in (result[0], result[0]["children"][0]["children"][1], result[1]))
+    assert "copied" not in tree[0]
+
+
+def test_iter_recent_pages(fake, fake_client):
+    for i in range(250):
+        fake.add_page(title=f"Note {i}", last_edited_time=f"2024-07-06T{i // 60:02d}:{i % 60:02d}:00.000Z")
+
+    assert len(fake_client.get_recent_pages()) == 250
+    assert fake.count("search") == 3
+
+    fake.requests.clear()
+    pages = list(fake_client.iter_recent_pages(since="2024-07-06T04:00:00.000Z"))
+    assert len(pages) == 10
+    assert pages[0]["last_edited_time"] > pages[-1]["last_edited_time"]
+    assert fake.count("search") == 1
+
+    fake.requests.clear()
+    recent = fake_client.iter_recent_pages(as_objects=True)
+    assert next(recent).id
+    recent.close()
+    assert fake.count("search") == 1
+
+
+def test_iter_recent_blocks(fake, fake_client):
+    old = fake.add_page(title="Old", last_edited_time="2024-07-01T00:00:00.000Z")
+    new = fake.add_page(title="New", last_edited_time="2024-07-07T00:00:00.000Z")
+    fake.add_tree(old, depth=1, width=2)
+    fake.add_tree(new, depth=2, width=2)
+
+    recent = fake_client.get_recent_blocks()
+    assert [page["id"] for page in recent] == [new, old]
+    assert fake.total == 1  # a single search, as before since/crawl existed
+    assert len(fake_client.get_recent_blocks(crawl=True)) == 8
+    fake.requests.clear()
+    assert len(list(fake_client.iter_recent_blocks(since="2024-07-02T00:00:00.000Z"))) == 6
+    assert fake.count("list_children") == 3
+    # the fixture blocks were last edited on 2024-07-06 15:35
+    assert list(fake_client.iter_recent_blocks(since="2024-07-06T16:00:00.000Z")) == []
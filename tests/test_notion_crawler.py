@@ -0,0 +1,65 @@
+import json
+
+from fake_notion import AUTH
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_crawler import WorkspaceCrawler
+from notion_mbse.utils.notion_page import NotionPage
+
+
+def _workspace(fake):
+    root_id = fake.add_page(title="Root")
+    sections = [fake.add_child_page(root_id, title=f"Section {i}") for i in range(3)]
+    for section_id in sections:
+        for j in range(4):
+            fake.add_child_page(section_id, title=f"Note {j}")
+    toggle_id = fake.add_block(root_id, text="Toggle", block_type="toggle")
+    fake.add_child_page(toggle_id, title="Hidden")
+    database_id = fake.add_child_database(sections[0], title="Tasks")
+    rows = [fake.add_page(database_id, title=f"Task {i}") for i in range(5)]
+    fake.add_child_page(rows[0], title="Task notes")
+    return root_id, database_id
+
+
+def test_crawl_workspace(fake, fake_client, tmp_path):
+    fake.latency = 0.002
+    root_id, database_id = _workspace(fake)
+    crawler = WorkspaceCrawler(fake_client)
+    entries = crawler.crawl([root_id, root_id])
+
+    assert entries[0].title == "Root"
+    assert entries[0].parent is None
+    assert len(entries) == 1 + 3 + 12 + 1 + 1 + 5 + 1
+    assert len({entry.id for entry in entries}) == len(entries)
+    assert fake.count("retrieve_page") == 1
+    assert fake.count("query_database") == 1
+    assert fake.peak > 1
+
+    by_title = {entry.title: entry for entry in entries}
+    assert by_title["Hidden"].parent == root_id.replace("-", "")
+    assert by_title["Tasks"].type == "database"
+    assert by_title["Task notes"].depth == 4
+    assert by_title["Task 3"].parent == database_id.replace("-", "")
+    assert by_title["Task 3"].last_edited_time.endswith("Z")
+
+    assert crawler.save_manifest(entries, tmp_path / "workspace.jsonl") == len(entries)
+    first = json.loads((tmp_path / "workspace.jsonl").read_text().splitlines()[0])
+    assert set(first) == {"id", "parent", "type", "title", "last_edited_time", "depth"}
+
+
+def test_crawl_ignores_client_filter(fake):
+    root_id, _ = _workspace(fake)
+    query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"after": "2100-01-01T00:00:00.000Z"}}
+    n_client = NotionClient(token=AUTH, client=fake.client(), filter=query_filter)
+    entries = WorkspaceCrawler(n_client).crawl(root_id)
+    assert {f"Task {i}" for i in range(5)} <= {entry.title for entry in entries}
+
+
+def test_crawl_depth_and_errors(fake, fake_client):
+    root_id, _ = _workspace(fake)
+    entries = NotionPage(token=AUTH, page_id=root_id, client=fake_client).crawl(max_depth=1)
+    assert sorted(entry.depth for entry in entries) == [0, 1, 1, 1, 1]
+
+    fake.fail(status=404, times=1)
+    crawler = WorkspaceCrawler(fake_client)
+    assert crawler.crawl(root_id) == []
+    assert list(crawler.errors) == [root_id.replace("-", "")]
@@ -0,0 +1,222 @@
+import json
+
+from notion_objects import MultiSelect
+from notion_objects import Number
+from notion_objects import Page
+from notion_objects import Select
+from notion_objects import TitleText
+
+from fake_notion import AUTH
+from notion_mbse.utils.notion_database import NotionDatabase
+from notion_mbse.utils.notion_page import NotionPage
+
+
+def test_database_is_lazy(fake, fake_client):
+    database_id = fake.add_database(title="Specs")
+    for i in range(250):
+        fake.add_page(database_id, title=f"Row {i}")
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=fake_client)
+    assert fake.total == 0
+
+    assert "Name" in database.properties
+    assert fake.count("retrieve_database") == 1
+    assert fake.count("query_database") == 0
+
+    rows = database.iter_pages()
+    assert next(rows).title == "Row 0"
+    rows.close()
+    assert fake.count("query_database") == 1
+
+    pages = database.get_pages()
+    assert len(pages) == 250
+    assert pages[-1].title == "Row 249"
+    assert database.check_if_exists("Row 10")
+    assert not database.check_if_exists("Row 999")
+    assert fake.count("query_database") == 4
+
+
+class Row(Page):
+    name = TitleText("Name")
+    status = Select("Status")
+
+
+def test_query_streams_rows(fake, fake_client):
+    database_id = fake.add_database(title="Specs")
+    for i in range(250):
+        page_id = fake.add_page(database_id, title=f"Row {i:03d}")
+        if i % 10 == 0:
+            fake.pages[page_id]["properties"]["Status"]["select"]["name"] = "Done"
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=fake_client, DataClass=Row)
+    rows = database.query()
+    first = [next(rows) for _ in range(10)]
+    rows.close()
+    assert isinstance(first[0], Row)
+    assert first[0].name == "Row 000"
+    assert first[0].status == "Done"
+    assert fake.count("query_database") == 1
+
+    done = database.query(
+        filter={"property": "Status", "select": {"equals": "Done"}},
+        sorts=[{"property": "Name", "direction": "descending"}],
+        filter_properties=["Name"],
+    )
+    titles = [row.name for row in done]
+    assert titles == [f"Row {i:03d}" for i in range(240, -1, -10)]
+    assert fake.count("query_database") == 2
+
+    projected = next(database.query(filter_properties=["Name"], page_size=5))
+    assert list(projected._obj["properties"]) == ["Name"]
+
+    assert len(list(database.query(limit=150))) == 150
+    assert fake.count("query_database") == 5
+    assert len(list(database)) == 250
+
+
+def test_database_prefetch(fake, fake_client):
+    root_id = fake.add_page(title="Root")
+    database_id = fake.add_child_database(root_id)
+    for i in range(3):
+        fake.add_page(database_id, title=f"Row {i}")
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=fake_client, prefetch=True)
+    assert len(database.pages) == 3
+    assert database.parent.page_id == root_id
+
+
+def test_page_tree_skips_child_database_rows(fake, fake_client):
+    root_id = fake.add_page(title="Root")
+    database_id = fake.add_child_database(root_id)
+    for i in range(150):
+        fake.add_page(database_id, title=f"Row {i}")
+
+    page = NotionPage(token=AUTH, page_id=root_id, recursive=True, client=fake_client)
+    assert isinstance(page.children[0], NotionDatabase)
+    assert fake.count("query_database") == 0
+    assert fake.count("retrieve_database") == 0
+
+
+def _write_records(path, count):
+    with path.open("w") as f:
+        for i in range(count):
+            f.write(json.dumps({"name": f"Spec {i}", "status": "Done" if i % 2 else "Draft", "pages": i}) + "\n")
+
+
+def test_load_from_json(fake, throttled_client, tmp_path):
+    database_id = fake.add_database(title="Specs")
+    records = tmp_path / "records.jsonl"
+    _write_records(records, 120)
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=throttled_client)
+    report = database.load_from_json(records, database_id, create_properties=True, max_workers=4)
+    assert report.counts() == {"created": 120, "skipped": 0, "failed": 0}
+    assert fake.count("create_page") == 120
+    assert fake.count("update_database") == 1
+    assert fake.count("retrieve_database") == 1
+    assert fake.databases[database_id]["properties"]["pages"]["type"] == "number"
+    rows = [fake.pages[page_id] for page_id in fake.rows[database_id]]
+    assert sorted(row["properties"]["pages"]["number"] for row in rows) == list(range(120))
+    assert {row["properties"]["Status"]["select"]["name"] for row in rows} == {"Draft", "Done"}
+    assert len(database.get_pages()) == 120
+
+
+def test_load_from_json_resumes(fake, throttled_client, tmp_path):
+    database_id = fake.add_database(title="Specs")
+    records = tmp_path / "records.jsonl"
+    checkpoint = tmp_path / "records.checkpoint.jsonl"
+    _write_records(records, 50)
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=throttled_client)
+
+    fake.fail(400, times=10, endpoint="create_page")
+    first = database.load_from_json(records, database_id, checkpoint=checkpoint, max_workers=1)
+    assert len(first.created) == 40
+    assert len(first.failed) == 10
+    with checkpoint.open("a") as f:
+        f.write('{"record": 4')  # a write cut short by a crash
+
+    second = database.load_from_json(records, database_id, checkpoint=checkpoint, max_workers=1)
+    assert second.failed == []
+    assert sorted([*second.skipped, *first.failed]) == list(range(50))
+    assert len(second.created) == 10
+    assert len(fake.rows[database_id]) == 50
+
+
+def test_upsert_by_title(fake, throttled_client):
+    database_id = fake.add_database(title="Specs")
+    for i in range(100):
+        fake.add_page(database_id, title=f"Spec {i}")
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=throttled_client)
+    records = [{"Name": f"Spec {i}", "Status": "Done" if i % 10 == 0 else "Draft"} for i in range(120)]
+    report = database.upsert([*records, {"Name": "Spec 3"}, {"Status": "Done"}], max_workers=4)
+    assert report.counts() == {"created": 20, "updated": 10, "unchanged": 90, "failed": 2}
+    assert report.failed == ["Spec 3", "record 121"]
+    assert fake.count("query_database") == 1
+    assert fake.count("create_page") == 20
+    assert fake.count("update_page") == 10
+    assert len(fake.rows[database_id]) == 120
+
+    fake.requests.clear()
+    report = database.upsert(records)
+    assert report.counts() == {"created": 0, "updated": 0, "unchanged": 120, "failed": 0}
+    assert database.check_if_exists("Spec 119")
+    assert not database.check_if_exists("Spec 120")
+    assert fake.total == 0
+
+
+def test_schema_is_cached(fake, fake_client):
+    database_id = fake.add_database(title="Specs")
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=fake_client)
+
+    schema = database.get_schema()
+    assert schema.title_property == "Name"
+    assert schema["Status"].options == ["Draft", "Done"]
+    assert [prop.name for prop in schema.of_type("relation")] == ["Related"]
+    assert "Name" in database.get_properties()
+    assert database.get_property_map(["name", "status"]) == {"name": "Name", "status": "Status"}
+    assert fake.count("retrieve_database") == 1
+
+    database.add_property("Pages", "number")
+    assert database.get_schema()["Pages"].type == "number"
+    database.remove_property("Related")
+    assert "Related" not in database.properties
+    assert fake.count("update_database") == 2
+    assert fake.count("retrieve_database") == 1
+
+    database.invalidate_schema()
+    database.get_properties()
+    assert fake.count("retrieve_database") == 2
+    database.schema_ttl = 0.0
+    database.get_properties()
+    assert fake.count("retrieve_database") == 3
+
+
+class Spec(Page):
+    title = TitleText("Title")
+    status = Select("Status")
+    size = Number("Size")
+    tags = MultiSelect("Tags")
+
+
+def test_migrate_schema(fake, fake_client):
+    database_id = fake.add_database(title="Specs")
+    database = NotionDatabase(token=AUTH, database_id=database_id, client=fake_client)
+
+    plan = database.migrate(Spec, remove=True, dry_run=True)
+    assert not plan.applied
+    assert plan.rename == {"Name": "Title"}
+    assert plan.add == {"Size": {"type": "number", "number": {}}, "Tags": {"type": "multi_select", "multi_select": {}}}
+    assert plan.remove == ["Related"]
+    assert "~ Name -> Title" in str(plan)
+    assert fake.count("update_database") == 0
+
+    assert database.migrate(Spec, remove=True).applied
+    assert fake.count("update_database") == 1
+    assert fake.count("retrieve_database") == 1
+    assert sorted(database.properties) == ["Size", "Status", "Tags", "Title"]
+    assert database.plan_migration(Spec, remove=True).empty
+
+    conflict = database.plan_migration({"Status": "rich_text"})
+    assert conflict.empty
+    assert conflict.conflicts == {"Status": ("select", "rich_text")}
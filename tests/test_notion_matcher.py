@@ -0,0 +1,54 @@
+import itertools
+import random
+import time
+
+from notion_mbse.utils import notion_matcher
+from notion_mbse.utils.notion_matcher import PropertyMatcher
+from notion_mbse.utils.notion_matcher import assign
+
+
+def test_assign_is_optimal():
+    rng = random.Random(7)  # noqa: S311
+    for _ in range(50):
+        n, m = rng.randint(1, 5), rng.randint(5, 6)
+        weights = [[rng.randint(0, 100) for _ in range(m)] for _ in range(n)]
+        best = max(sum(weights[i][j] for i, j in enumerate(cols)) for cols in itertools.permutations(range(m), n))
+        result = assign(weights)
+        assert len(set(result)) == n
+        assert sum(weights[i][j] for i, j in enumerate(result)) == best
+
+
+def test_match_is_optimal_and_order_independent():
+    matcher = PropertyMatcher()
+    sources = ["Stat", "Status", "Owner", "Name", "Unrelated"]
+    targets = ["Name", "Status", "Stats", "Owners"]
+    expected = {"Stat": "Stats", "Status": "Status", "Owner": "Owners", "Name": "Name"}
+    assert matcher.match(sources, targets) == expected
+    for _ in range(5):
+        shuffled = random.sample(sources, len(sources))
+        assert matcher.match(shuffled, random.sample(targets, len(targets))) == {
+            source: expected[source] for source in shuffled if source in expected
+        }
+
+
+def test_match_is_cached(monkeypatch):
+    calls = []
+    score_matrix = notion_matcher.score_matrix
+    monkeypatch.setattr(notion_matcher, "score_matrix", lambda *args: calls.append(args) or score_matrix(*args))
+    matcher = PropertyMatcher()
+    assert matcher.match(["titles"], ["Title"], key="schema-1") == {"titles": "Title"}
+    assert matcher.match(["titles"], ["Title"], key="schema-1") == {"titles": "Title"}
+    assert len(calls) == 1
+    matcher.match(["titles"], ["Title"], key="schema-2")
+    assert len(calls) == 2
+
+
+def test_match_wide_sheet():
+    targets = [f"Requirement Field {i}" for i in range(60)]
+    sources = [f"requirement field {i}" for i in range(0, 60, 2)] + [f"requirement feld {i}" for i in range(1, 60, 2)]
+    sources += [f"column {i}" for i in range(440)]
+    start = time.perf_counter()
+    mapping = PropertyMatcher().match(sources, targets)
+    assert time.perf_counter() - start < 1.0
+    assert len(mapping) == 60
+    assert mapping["requirement feld 31"] == "Requirement Field 31"
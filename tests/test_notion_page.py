@@ -0,0 +1,146 @@
+from fake_notion import AUTH
+from notion_mbse.utils.notion_page import NotionPage
+from notion_mbse.utils.notion_utils import normalize_id
+
+
+def test_page_children_are_lazy(fake, fake_client):
+    root_id = fake.add_page(title="Root")
+    child_ids = [fake.add_child_page(root_id, title=f"Sub {i}") for i in range(300)]
+
+    page = NotionPage(token=AUTH, page_id=root_id, client=fake_client)
+    assert fake.total == 0
+
+    children = page.get_children()
+    assert len(children) == 300
+    assert children[7].title == "Sub 7"
+    assert children[7].basename == "sub-7"
+    assert children[7].parent is page
+    assert children[7].n_client is fake_client
+    assert fake.count("retrieve_page") == 0
+    assert fake.count("list_children") == 3
+
+    assert children[7].page_results["id"] == child_ids[7]
+    assert page.title == "Root"
+    assert fake.count("retrieve_page") == 2
+
+
+def test_page_recursive(fake, fake_client):
+    root_id = fake.add_page(title="Root")
+    child_id = fake.add_child_page(root_id)
+    fake.add_child_page(child_id, title="Leaf")
+
+    page = NotionPage(token=AUTH, page_id=root_id, recursive=True, client=fake_client)
+    assert page.children[0].children[0].title == "Leaf"
+    assert fake.count("retrieve_page") == 0
+
+
+def _paragraph(text, children=None):
+    block = {"type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+    if children:
+        block["paragraph"]["children"] = children
+    return block
+
+
+def test_set_blocks_chunked(fake, fake_client):
+    page_id = fake.add_page(title="Generated")
+    deep = _paragraph("deep", [_paragraph("level 2", [_paragraph("level 3", [_paragraph("level 4")])])])
+    sections = [_paragraph(f"section {i}", [_paragraph(f"item {i}.{j}") for j in range(9)]) for i in range(450)]
+    blocks = [deep, *sections, _paragraph("wide", [_paragraph(f"row {j}") for j in range(250)])]
+
+    page = NotionPage(token=AUTH, page_id=page_id, client=fake_client)
+    created = page.set_blocks(blocks)
+    assert len(created) == 452
+    assert len(fake.blocks) == 1 + 450 * 10 + 1 + 250 + 3
+    # 452 top-level blocks in 100s, then deferred subtrees: deep (2 passes, leaves inline) and wide (3 chunks)
+    assert fake.count("append_children") == 5 + 2 + 3
+
+    downloaded = fake_client.get_blocks(page_id)
+    assert downloaded[0]["children"][0]["children"][0]["children"][0]["paragraph"]["rich_text"][0]["text"]["content"] == "level 4"
+    assert [block["paragraph"]["rich_text"][0]["text"]["content"] for block in downloaded[-1]["children"][-2:]] == ["row 248", "row 249"]
+
+    copy_id = fake.add_page(title="Copy")
+    NotionPage(token=AUTH, page_id=copy_id, client=fake_client).set_blocks(downloaded)
+    assert len(fake_client.get_blocks(copy_id)) == 452
+
+
+def test_set_blocks_column_list_and_table(fake, fake_client):
+    page_id = fake.add_page(title="Layout")
+    toggle = {"type": "toggle", "toggle": {"rich_text": [], "children": [_paragraph("hidden")]}}
+    columns = {
+        "type": "column_list",
+        "column_list": {
+            "children": [
+                {"type": "column", "column": {"children": [_paragraph("left"), toggle]}},
+                {"type": "column", "column": {"children": [_paragraph("right", [_paragraph("nested")])]}},
+            ]
+        },
+    }
+    rows = [{"type": "table_row", "table_row": {"cells": [[{"type": "text", "text": {"content": f"row {i}"}}]]}} for i in range(250)]
+    table = {"type": "table", "table": {"table_width": 1, "children": rows}}
+
+    page = NotionPage(token=AUTH, page_id=page_id, client=fake_client)
+    assert len(page.set_blocks([columns, table])) == 2
+    # both blocks in one request, then the toggle's and the paragraph's children and the last 150 rows in 2 chunks
+    assert fake.count("append_children") == 1 + 2 + 2
+
+    downloaded = fake_client.get_blocks(page_id)
+    left, right = downloaded[0]["children"]
+    assert _texts(left["children"][1]["children"]) == ["hidden"]
+    assert _texts(right["children"][0]["children"]) == ["nested"]
+    assert [row["table_row"]["cells"][0][0]["text"]["content"] for row in downloaded[1]["children"][-2:]] == ["row 248", "row 249"]
+
+
+def _texts(blocks):
+    return [block["paragraph"]["rich_text"][0]["text"]["content"] for block in blocks]
+
+
+def test_update_blocks_diff(fake, fake_client):
+    page_id = fake.add_page(title="Long")
+    blocks = [_paragraph(f"paragraph {i}") for i in range(2000)]
+    blocks[5] = _paragraph("paragraph 5", [_paragraph("nested a"), _paragraph("nested b")])
+    NotionPage(token=AUTH, page_id=page_id, client=fake_client).set_blocks(blocks)
+
+    page = NotionPage(token=AUTH, page_id=page_id, client=fake_client)
+    page.get_blocks()
+    fake.requests.clear()
+
+    edited = [*blocks]
+    for i in range(10, 2000, 200):
+        edited[i] = _paragraph(f"paragraph {i} (edited)")
+    counts = page.update_blocks(edited)
+    assert counts == {"unchanged": 1990, "updated": 10, "deleted": 0, "appended": 0, "preserved": 0}
+    assert fake.total == 10
+    assert _texts(fake_client.get_blocks(page_id))[:11] == [*(f"paragraph {i}" for i in range(10)), "paragraph 10 (edited)"]
+
+    fake.requests.clear()
+    edited = [*edited[:1], _paragraph("intro"), *edited[1:5], _paragraph("paragraph 5", [_paragraph("nested b")]), *edited[6:]]
+    del edited[100]
+    edited.insert(300, _paragraph("inserted"))
+    counts = page.update_blocks(edited)
+    assert counts["deleted"] == 2
+    assert counts["appended"] == 2
+    downloaded = fake_client.get_blocks(page_id)
+    assert _texts(downloaded) == _texts(edited)
+    assert _texts(downloaded[6]["children"]) == ["nested b"]
+
+
+def test_update_blocks_keeps_child_pages(fake, fake_client):
+    page_id = fake.add_page(title="Parent")
+    NotionPage(token=AUTH, page_id=page_id, client=fake_client).set_blocks([_paragraph(f"paragraph {i}") for i in range(300)])
+    sub_id = fake.add_child_page(page_id, title="Subpage")
+    page = NotionPage(token=AUTH, page_id=page_id, client=fake_client)
+    fake.requests.clear()
+
+    desired = [_paragraph(f"paragraph {i}") for i in range(300)]
+    counts = page.update_blocks([_paragraph("new start"), *desired])
+    assert counts == {"unchanged": 299, "updated": 0, "deleted": 1, "appended": 2, "preserved": 1}
+    assert fake.count("append_children") == 1
+    assert fake.count("delete_block") == 1  # the old first block, re-created behind the insert
+    downloaded = fake_client.get_blocks(page_id)
+    assert _texts(downloaded[:-1]) == ["new start", *_texts(desired)]
+    assert downloaded[-1]["id"] == normalize_id(sub_id)
+    assert sub_id in fake.pages
+
+    page.update_blocks(desired, archive_child_pages=True)
+    assert sub_id not in fake.pages
+    assert _texts(fake_client.get_blocks(page_id)) == _texts(desired)
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from notion_client.errors import APIResponseError
+
+from fake_notion import AUTH
+from fake_notion import FakeNotion
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_ratelimit import RetryPolicy
+from notion_mbse.utils.notion_ratelimit import ThrottledClient
+from notion_mbse.utils.notion_ratelimit import TokenBucket
+from notion_mbse.utils.notion_ratelimit import get_bucket
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=100, capacity=2)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.01, abs=0.005)
+    assert delays[3] == pytest.approx(0.02, abs=0.005)
+
+
+def test_token_bucket_penalize():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.penalize(0.5)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+
+def test_get_bucket_shared_per_token():
+    assert get_bucket("token-a") is get_bucket("token-a")
+    assert get_bucket("token-a") is not get_bucket("token-b")
+
+
+def test_notion_client_is_throttled():
+    n_client = NotionClient(token=AUTH)
+    assert isinstance(n_client.client, ThrottledClient)
+    assert n_client.client.bucket is get_bucket(AUTH)
+
+
+def test_retry_on_rate_limit():
+    fake = FakeNotion()
+    page_id = fake.add_page()
+    client = fake.client(ThrottledClient, bucket=TokenBucket(rate=1000, capacity=10))
+    fake.fail(429, times=2, retry_after=0.05)
+
+    start = time.monotonic()
+    page = client.pages.retrieve(page_id=page_id)
+    assert page["id"] == page_id
+    assert time.monotonic() - start >= 0.1
+    assert fake.count("failure") == 2
+    assert fake.count("retrieve_page") == 1
+
+
+def test_retry_gives_up():
+    fake = FakeNotion()
+    page_id = fake.add_page()
+    retry = RetryPolicy(max_retries=2, base_delay=0.001)
+    client = fake.client(ThrottledClient, bucket=TokenBucket(rate=1000, capacity=10), retry=retry)
+    fake.fail(503, times=3)
+
+    with pytest.raises(APIResponseError):
+        client.pages.retrieve(page_id=page_id)
+    assert fake.count("failure") == 3
+
+
+def test_no_retry_on_client_error():
+    fake = FakeNotion()
+    client = fake.client(ThrottledClient, bucket=TokenBucket(rate=1000, capacity=10))
+
+    with pytest.raises(APIResponseError):
+        client.pages.retrieve(page_id="a1b2c3d4-0000-4000-8000-000000000000")
+    assert fake.total == 1
+
+
+def test_no_retry_of_non_idempotent_on_server_error():
+    fake = FakeNotion()
+    database_id = fake.add_database()
+    retry = RetryPolicy(base_delay=0.001)
+    client = fake.client(ThrottledClient, bucket=TokenBucket(rate=1000, capacity=10), retry=retry)
+
+    fake.fail(503, times=1)
+    with pytest.raises(APIResponseError):
+        client.pages.create(parent={"database_id": database_id}, properties={})
+    assert fake.count("create_page") == 0
+
+    fake.fail(429, times=1, retry_after=0.001)
+    client.pages.create(parent={"database_id": database_id}, properties={})
+    fake.fail(503, times=1)
+    client.databases.query(database_id=database_id)
+    assert fake.count("create_page") == 1
+    assert fake.count("query_database") == 1
+    assert fake.count("failure") == 3
@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from fake_notion import AUTH
+from fake_notion import FakeNotionServer
+from notion_mbse.utils.notion_client_extend import NotionClient
+from notion_mbse.utils.notion_database import NotionDatabase
+from notion_mbse.utils.notion_ratelimit import RetryPolicy
+from notion_mbse.utils.notion_ratelimit import TokenBucket
+from notion_mbse.utils.notion_registry import client_options
+from notion_mbse.utils.notion_registry import close_clients
+from notion_mbse.utils.notion_registry import configure_pool
+from notion_mbse.utils.notion_registry import get_client
+from notion_mbse.utils.notion_registry import pool_options
+
+
+@pytest.fixture
+def registry():
+    yield
+    configure_pool(max_connections=32, http2=False)
+    close_clients()
+
+
+def test_get_client_shared_per_token(registry):
+    assert get_client("token-a") is get_client("token-a")
+    assert get_client("token-a") is not get_client("token-b")
+    assert NotionClient(token=AUTH).client is NotionClient(token=AUTH).client
+
+
+def test_configure_pool(registry):
+    configure_pool(max_connections=4)
+    client = get_client("token-pool")
+    assert client.client._transport._pool._max_connections == 4
+    assert isinstance(client.client, httpx.Client)
+    with pytest.raises(ValueError, match="Unknown pool option"):
+        configure_pool(connections=4)
+
+
+def test_http2_without_h2(registry, monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    configure_pool(http2=True)
+    assert pool_options().use_http2() is False
+
+
+def test_close_clients(registry):
+    client = get_client("token-close")
+    close_clients()
+    assert client.client.is_closed
+    assert get_client("token-close") is not client
+
+
+@pytest.fixture
+def server():
+    with FakeNotionServer() as server:
+        yield server
+
+
+def test_base_url(registry, monkeypatch):
+    assert client_options() == {}
+    assert get_client("token-url", "http://localhost:1234/") is not get_client("token-url")
+    assert get_client("token-url", "http://localhost:1234").options.base_url == "http://localhost:1234"
+    monkeypatch.setattr("notion_mbse.utils.notion_registry.NOTION_BASE_URL", "http://localhost:5678")
+    assert NotionClient("token-url").client.options.base_url == "http://localhost:5678"
+
+
+def test_fake_server(registry, server):
+    fake = server.fake
+    database_id = fake.add_database(title="Served")
+    for i in range(120):
+        fake.add_page(database_id, title=f"Row {i}")
+
+    database = NotionDatabase(token=AUTH, database_id=database_id, base_url=server.url)
+    client = database.n_client.client
+    assert client is get_client(AUTH, server.url)
+    client.bucket = TokenBucket(rate=10000, capacity=10000)
+    client.retry = RetryPolicy(base_delay=0.001)
+
+    fake.latency = 0.01
+    fake.fail(429, times=2, retry_after=0.01, endpoint="query_database")
+    assert len(list(database.query())) == 120
+    assert fake.count("failure") == 2
+    assert fake.count("query_database") == 2
+
+    assert client.blocks.retrieve(block_id=fake.add_block(database_id))["type"] == "paragraph"
+    assert client.search(query="Served")["results"][0]["id"] == database_id
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+import pytest
+
+from notion_mbse.utils.notion_snapshot import Snapshot
+from notion_mbse.utils.notion_snapshot import SnapshotWriter
+from notion_mbse.utils.notion_snapshot import index_path
+
+
+def test_snapshot_random_access(tmp_path):
+    path = tmp_path / "snapshot.jsonl.gz"
+    with SnapshotWriter(path) as writer:
+        for i in range(5):
+            writer.write(f"page-{i}", {"id": f"page-{i}", "children": [{"plain_text": "x" * i}]})
+
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 5
+        assert "page-3" in snapshot
+        assert snapshot.get("page-3")["children"] == [{"plain_text": "xxx"}]
+        assert snapshot.get("missing") is None
+        assert [page["id"] for page in snapshot] == [f"page-{i}" for i in range(5)]
+
+    with gzip.open(path, "rt") as f:  # still a plain .jsonl.gz stream
+        assert [json.loads(line)["id"] for line in f] == [f"page-{i}" for i in range(5)]
+    assert set(json.loads(index_path(path).read_text())["entries"]) == {f"page-{i}" for i in range(5)}
+
+
+def test_snapshot_copy_frame(tmp_path):
+    with SnapshotWriter(tmp_path / "a.jsonl.gz") as writer:
+        writer.write("a", [1])
+        writer.write("b", [2])
+    with Snapshot(tmp_path / "a.jsonl.gz") as old, SnapshotWriter(tmp_path / "b.jsonl.gz") as writer:
+        writer.write_frame("b", old.frame("b"))
+    with Snapshot(tmp_path / "b.jsonl.gz") as snapshot:
+        assert snapshot.keys() == ["b"]
+        assert snapshot.get("b") == [2]
+
+
+def test_snapshot_zstd(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "snapshot.jsonl.zst"
+    with SnapshotWriter(path) as writer:
+        writer.write("a", {"id": "a"})
+    with Snapshot(path) as snapshot:
+        assert snapshot.get("a") == {"id": "a"}
+
+
+def test_snapshot_unknown_suffix(tmp_path):
+    with pytest.raises(ValueError, match="Unknown snapshot suffix"):
+        SnapshotWriter(tmp_path / "snapshot.jsonl")
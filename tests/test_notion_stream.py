@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from notion_mbse.utils.notion_client_extend import LastEditedToDateTime
+from notion_mbse.utils.notion_stream import JsonStreamWriter
+from notion_mbse.utils.notion_stream import iter_json
+
+ROWS = [{"id": str(i), "last_edited_time": datetime.fromisoformat(f"2024-07-06T15:{i:02d}:00")} for i in range(3)]
+
+
+@pytest.mark.parametrize("name", ["rows.json", "rows.jsonl"])
+def test_stream_round_trip(tmp_path, name):
+    transformer = LastEditedToDateTime()
+    path = tmp_path / name
+    with JsonStreamWriter(path, default=transformer.reverse) as writer:
+        for row in ROWS:
+            writer.write(row)
+    assert writer.count == 3
+
+    rows = list(iter_json(path))
+    assert rows[0] == {"id": "0", "last_edited_time": "2024-07-06T15:00:00Z"}
+    assert transformer.forward(rows)[2]["last_edited_time"] == ROWS[2]["last_edited_time"]
+    if path.suffix == ".json":
+        assert len(json.loads(path.read_text())) == 3
+    else:
+        assert len(path.read_text().splitlines()) == 3
+
+
+def test_stream_empty_array(tmp_path):
+    path = tmp_path / "rows.json"
+    JsonStreamWriter(path).close()
+    assert json.loads(path.read_text()) == []
+
+
+def test_stream_overwrite(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("")
+    with pytest.raises(FileExistsError):
+        JsonStreamWriter(path)
+    with JsonStreamWriter(path, overwrite=True) as writer:
+        writer.write({"id": "0"})
+    assert list(iter_json(path)) == [{"id": "0"}]